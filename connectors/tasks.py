@@ -39,6 +39,56 @@ def _format_item(item: TaskItem) -> str:
     return f"{item.title} (Priority: {priority})"
 
 
+# Item fields TaskItem reads; page_id is always returned by the Worker.
+CLOSED_TASK_FIELDS = ("title", "priority")
+
+
+def parse_tasks_payload(payload: Dict[str, Any], target_date: str) -> TasksResult:
+    # Also used for /daily_log/ingest responses, which carry the same done/drop items.
+    done_items = [
+        TaskItem(
+            page_id=item.get("page_id", ""),
+            title=item.get("title", ""),
+            priority=item.get("priority"),
+        )
+        for item in payload.get("done", [])
+    ]
+    drop_items = [
+        TaskItem(
+            page_id=item.get("page_id", ""),
+            title=item.get("title", ""),
+            priority=item.get("priority"),
+        )
+        for item in payload.get("drop", [])
+    ]
+
+    return TasksResult(
+        target_date=payload.get("date", target_date),
+        done=_dedupe(done_items),
+        drop=_dedupe(drop_items),
+        raw_payload=payload,
+    )
+
+
+def render_tasks(result: TasksResult) -> Dict[str, Any]:
+    done_items = [_format_item(item) for item in result.done]
+    drop_items = [_format_item(item) for item in result.drop]
+    progress_line = f"昨日の前進：Done {len(done_items)}件 / Drop {len(drop_items)}件"
+
+    return {
+        "summary_blocks": {
+            "done_items": done_items,
+            "drop_items": drop_items,
+            "progress_line": progress_line,
+        },
+        "raw_payload": {
+            "date": result.target_date,
+            "done": [item.__dict__ for item in result.done],
+            "drop": [item.__dict__ for item in result.drop],
+        },
+    }
+
+
 class TasksConnector:
     id = "tasks"
 
@@ -47,48 +97,10 @@ class TasksConnector:
         self.bearer_token = bearer_token
 
     def fetch(self, target_date: str) -> TasksResult:
-        query = urlencode({"date": target_date})
+        query = urlencode({"date": target_date, "fields": ",".join(CLOSED_TASK_FIELDS)})
         url = f"{self.tasks_closed_url}?{query}"
         payload = fetch_json(url, self.bearer_token)
-
-        done_items = [
-            TaskItem(
-                page_id=item.get("page_id", ""),
-                title=item.get("title", ""),
-                priority=item.get("priority"),
-            )
-            for item in payload.get("done", [])
-        ]
-        drop_items = [
-            TaskItem(
-                page_id=item.get("page_id", ""),
-                title=item.get("title", ""),
-                priority=item.get("priority"),
-            )
-            for item in payload.get("drop", [])
-        ]
-
-        return TasksResult(
-            target_date=payload.get("date", target_date),
-            done=_dedupe(done_items),
-            drop=_dedupe(drop_items),
-            raw_payload=payload,
-        )
+        return parse_tasks_payload(payload, target_date)
 
     def render(self, result: TasksResult) -> Dict[str, Any]:
-        done_items = [_format_item(item) for item in result.done]
-        drop_items = [_format_item(item) for item in result.drop]
-        progress_line = f"昨日の前進：Done {len(done_items)}件 / Drop {len(drop_items)}件"
-
-        return {
-            "summary_blocks": {
-                "done_items": done_items,
-                "drop_items": drop_items,
-                "progress_line": progress_line,
-            },
-            "raw_payload": {
-                "date": result.target_date,
-                "done": [item.__dict__ for item in result.done],
-                "drop": [item.__dict__ for item in result.drop],
-            },
-        }
+        return render_tasks(result)
@@ -1,8 +1,9 @@
 import logging
 import smtplib
+from email.message import Message
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
-from typing import List
+from typing import List, Tuple
 
 
 def build_email_message(
@@ -11,13 +12,17 @@ def build_email_message(
     subject: str,
     plain_text: str,
     html_body: str,
-) -> MIMEMultipart:
-    message = MIMEMultipart("alternative")
+) -> Message:
+    # An empty html_body means a text-only recipient: send a single text/plain part.
+    if html_body:
+        message: Message = MIMEMultipart("alternative")
+        message.attach(MIMEText(plain_text, "plain", "utf-8"))
+        message.attach(MIMEText(html_body, "html", "utf-8"))
+    else:
+        message = MIMEText(plain_text, "plain", "utf-8")
     message["Subject"] = subject
     message["From"] = mail_from
     message["To"] = ", ".join(mail_to)
-    message.attach(MIMEText(plain_text, "plain", "utf-8"))
-    message.attach(MIMEText(html_body, "html", "utf-8"))
     return message
 
 
@@ -28,16 +33,46 @@ def send_email(
     subject: str,
     plain_text: str,
     html_body: str,
-) -> None:
-    logger = logging.getLogger(__name__)
+) -> List[str]:
     message = build_email_message(
         mail_from, mail_to, subject, plain_text, html_body
     )
+    return send_raw_email(mail_from, mail_to, gmail_app_password, message.as_string())
+
+
+def send_raw_email(
+    mail_from: str,
+    mail_to: List[str],
+    gmail_app_password: str,
+    raw_message: str,
+) -> List[str]:
+    return send_raw_emails(mail_from, gmail_app_password, [(mail_to, raw_message)])
+
+
+def send_raw_emails(
+    mail_from: str,
+    gmail_app_password: str,
+    messages: List[Tuple[List[str], str]],
+) -> List[str]:
+    # One SMTP session (connect + TLS + login) for every message. Failures are
+    # logged and do not stop the job; the return value lists the recipients
+    # the server accepted, so callers can tell what was actually delivered.
+    logger = logging.getLogger(__name__)
+    delivered: List[str] = []
     try:
         with smtplib.SMTP_SSL("smtp.gmail.com", 465) as server:
             server.login(mail_from, gmail_app_password)
-            server.sendmail(mail_from, mail_to, message.as_string())
+            for mail_to, raw_message in messages:
+                try:
+                    refused = server.sendmail(mail_from, mail_to, raw_message)
+                except (smtplib.SMTPRecipientsRefused, smtplib.SMTPDataError, smtplib.SMTPSenderRefused):
+                    logger.exception("SMTP refused recipients: %s", ", ".join(mail_to))
+                    continue
+                if refused:
+                    logger.error("SMTP refused recipients: %s", ", ".join(sorted(refused)))
+                delivered.extend(address for address in mail_to if address not in refused)
     except Exception:
         logger.exception(
             "Failed to send email via SMTP. The job will continue without stopping."
         )
+    return delivered
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, TypeVar
+from urllib.parse import urlparse
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class AimdPolicy:
+    initial_limit: float = 4.0
+    min_limit: float = 1.0
+    max_limit: float = 32.0
+    # +additive_increase per full window of healthy responses (about one per
+    # round trip), x decrease_factor on 429 / 5xx / errors / latency spikes.
+    additive_increase: float = 1.0
+    decrease_factor: float = 0.5
+    # A response slower than latency_spike_ratio x the healthy baseline (and at
+    # least min_spike_sec over it) counts as overload; the baseline is an EWMA
+    # of healthy latencies.
+    latency_spike_ratio: float = 2.5
+    min_spike_sec: float = 0.05
+    baseline_alpha: float = 0.1
+
+
+@dataclass(frozen=True)
+class ConcurrencyMetrics:
+    host: str
+    limit: int
+    max_limit_reached: int
+    in_flight: int
+    requests: int
+    throttled: int
+    server_errors: int
+    latency_spikes: int
+    decreases: int
+    baseline_latency_sec: float
+
+
+def _is_overload_status(status: Optional[int]) -> bool:
+    return status is None or status == 429 or status >= 500
+
+
+class AimdLimiter:
+    def __init__(self, host: str, policy: AimdPolicy = AimdPolicy()) -> None:
+        self.host = host
+        self.policy = policy
+        self._condition = threading.Condition()
+        self._limit = policy.initial_limit
+        self._max_limit_reached = policy.initial_limit
+        self._in_flight = 0
+        self._baseline: Optional[float] = None
+        self._last_decrease_at = 0.0
+        self._requests = 0
+        self._throttled = 0
+        self._server_errors = 0
+        self._latency_spikes = 0
+        self._decreases = 0
+
+    def current_limit(self) -> int:
+        with self._condition:
+            return int(self._limit)
+
+    def metrics(self) -> ConcurrencyMetrics:
+        with self._condition:
+            return ConcurrencyMetrics(
+                host=self.host,
+                limit=int(self._limit),
+                max_limit_reached=int(self._max_limit_reached),
+                in_flight=self._in_flight,
+                requests=self._requests,
+                throttled=self._throttled,
+                server_errors=self._server_errors,
+                latency_spikes=self._latency_spikes,
+                decreases=self._decreases,
+                baseline_latency_sec=round(self._baseline or 0.0, 4),
+            )
+
+    def _acquire(self) -> float:
+        with self._condition:
+            while self._in_flight >= int(self._limit):
+                self._condition.wait()
+            self._in_flight += 1
+            self._requests += 1
+        return time.monotonic()
+
+    def _release(self, started: float, status: Optional[int]) -> None:
+        elapsed = time.monotonic() - started
+        policy = self.policy
+        with self._condition:
+            self._in_flight -= 1
+            spike = (
+                self._baseline is not None
+                and elapsed > self._baseline * policy.latency_spike_ratio
+                and elapsed - self._baseline > policy.min_spike_sec
+            )
+            if status == 429:
+                self._throttled += 1
+            elif _is_overload_status(status):
+                self._server_errors += 1
+            elif spike:
+                self._latency_spikes += 1
+
+            if _is_overload_status(status) or spike:
+                # Requests already in flight when the limit was cut report the
+                # same congestion; only the first of them cuts it again.
+                if started >= self._last_decrease_at:
+                    self._limit = max(policy.min_limit, self._limit * policy.decrease_factor)
+                    self._last_decrease_at = time.monotonic()
+                    self._decreases += 1
+            else:
+                self._baseline = (
+                    elapsed
+                    if self._baseline is None
+                    else self._baseline + policy.baseline_alpha * (elapsed - self._baseline)
+                )
+                self._limit = min(
+                    policy.max_limit, self._limit + policy.additive_increase / self._limit
+                )
+                self._max_limit_reached = max(self._max_limit_reached, self._limit)
+            self._condition.notify_all()
+
+    def run(self, call: Callable[[], T]) -> T:
+        # The result's status_code (if any) classifies the response; an
+        # exception counts as overload and is re-raised.
+        started = self._acquire()
+        try:
+            result = call()
+        except BaseException:
+            self._release(started, None)
+            raise
+        self._release(started, getattr(result, "status_code", 200))
+        return result
+
+
+class AdaptiveConcurrency:
+    def __init__(self, policy: AimdPolicy = AimdPolicy()) -> None:
+        self.policy = policy
+        self._lock = threading.Lock()
+        self._limiters: Dict[str, AimdLimiter] = {}
+
+    def limiter_for(self, url: str) -> AimdLimiter:
+        host = urlparse(url).netloc
+        with self._lock:
+            limiter = self._limiters.get(host)
+            if limiter is None:
+                limiter = AimdLimiter(host, self.policy)
+                self._limiters[host] = limiter
+            return limiter
+
+    def metrics(self) -> List[ConcurrencyMetrics]:
+        with self._lock:
+            limiters = list(self._limiters.values())
+        return [limiter.metrics() for limiter in limiters]
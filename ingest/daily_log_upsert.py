@@ -1,9 +1,130 @@
-from typing import Any, Dict, Optional
+import logging
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+import requests
 
 from ingest.http_client import post_json
 
+# Matches MAX_BULK_UPSERT_ITEMS in the Worker.
+BULK_UPSERT_CHUNK_SIZE = 40
+
+
+@dataclass(frozen=True)
+class UpsertRetryPolicy:
+    # A chunk answered with 429 / 5xx is resent; upserts are keyed by
+    # target_date, so a resend never duplicates a page. The delay doubles per
+    # attempt (with jitter) unless the Worker sends Retry-After.
+    max_attempts: int = 4
+    base_delay_sec: float = 0.5
+    max_delay_sec: float = 8.0
+
+
+def _retryable_status(error: requests.HTTPError) -> Optional[int]:
+    status = error.response.status_code if error.response is not None else None
+    if status is not None and (status == 429 or status >= 500):
+        return status
+    return None
+
+
+def _retry_delay(policy: UpsertRetryPolicy, attempt: int, error: requests.HTTPError) -> float:
+    retry_after = error.response.headers.get("Retry-After") if error.response is not None else None
+    if retry_after:
+        try:
+            return min(policy.max_delay_sec, max(0.0, float(retry_after)))
+        except ValueError:
+            pass
+    delay = min(policy.max_delay_sec, policy.base_delay_sec * 2 ** (attempt - 1))
+    return delay * random.uniform(0.5, 1.0)
+
 
 def upsert_daily_log(
     url: str, payload: Dict[str, Any], bearer_token: Optional[str]
 ) -> Dict[str, Any]:
     return post_json(url, payload, bearer_token)
+
+
+def _upsert_chunk(
+    url: str,
+    chunk: List[Dict[str, Any]],
+    start: int,
+    bearer_token: Optional[str],
+    retry: UpsertRetryPolicy,
+) -> List[Dict[str, Any]]:
+    attempt = 1
+    while True:
+        # Each attempt goes back through post_json, so with adaptive
+        # concurrency it waits for a fresh slot under the reduced limit.
+        try:
+            response = post_json(url, {"items": chunk}, bearer_token)
+            break
+        except requests.HTTPError as error:
+            status = _retryable_status(error)
+            if status is None or attempt >= retry.max_attempts:
+                raise
+            delay = _retry_delay(retry, attempt, error)
+            logging.warning(
+                "Daily_Log bulk upsert: chunk=%d-%d status=%d attempt=%d retry_in=%.2fs",
+                start,
+                start + len(chunk) - 1,
+                status,
+                attempt,
+                delay,
+            )
+            time.sleep(delay)
+            attempt += 1
+    chunk_results = response.get("results", [])
+    if len(chunk_results) != len(chunk):
+        raise RuntimeError(
+            f"upsert_daily_logs: expected {len(chunk)} results, got {len(chunk_results)}"
+        )
+    logging.info(
+        "Daily_Log bulk upsert: chunk=%d-%d upserted=%s failed=%s",
+        start,
+        start + len(chunk) - 1,
+        response.get("upserted"),
+        response.get("failed"),
+    )
+    return [{**result, "index": start + result["index"]} for result in chunk_results]
+
+
+def upsert_daily_logs(
+    url: str,
+    payloads: Sequence[Dict[str, Any]],
+    bearer_token: Optional[str],
+    *,
+    chunk_size: int = BULK_UPSERT_CHUNK_SIZE,
+    max_parallel: int = 1,
+    retry: UpsertRetryPolicy = UpsertRetryPolicy(),
+) -> List[Dict[str, Any]]:
+    # url is /execute/api/daily_log/upsert_bulk. Returns one result per payload,
+    # in input order; "index" refers to the position in payloads. With
+    # max_parallel > 1 chunks are sent concurrently; enable adaptive concurrency
+    # in ingest.http_client so the in-flight count backs off on 429/5xx. Chunks
+    # answered with 429/5xx are resent up to retry.max_attempts times.
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    if max_parallel < 1:
+        raise ValueError("max_parallel must be at least 1")
+    if retry.max_attempts < 1:
+        raise ValueError("retry.max_attempts must be at least 1")
+    chunks = [
+        (start, list(payloads[start : start + chunk_size]))
+        for start in range(0, len(payloads), chunk_size)
+    ]
+    if max_parallel == 1 or len(chunks) < 2:
+        chunk_results = [
+            _upsert_chunk(url, chunk, start, bearer_token, retry) for start, chunk in chunks
+        ]
+    else:
+        with ThreadPoolExecutor(max_workers=max_parallel) as executor:
+            chunk_results = list(
+                executor.map(
+                    lambda item: _upsert_chunk(url, item[1], item[0], bearer_token, retry),
+                    chunks,
+                )
+            )
+    return [result for results in chunk_results for result in results]
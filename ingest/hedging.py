@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import logging
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, Deque, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class HedgePolicy:
+    # The hedge fires once the primary is slower than this percentile of recent
+    # latencies, clamped to [min_delay_sec, max_delay_sec].
+    percentile: float = 0.95
+    initial_delay_sec: float = 1.0
+    min_delay_sec: float = 0.05
+    max_delay_sec: float = 5.0
+    window: int = 200
+    min_samples: int = 5
+    # Extra load cap: at most max_extra_ratio hedges per request, plus a burst
+    # so a short-lived job with one or two GETs can still hedge once.
+    max_extra_ratio: float = 0.1
+    burst: int = 1
+    max_workers: int = 8
+
+
+@dataclass(frozen=True)
+class HedgeMetrics:
+    requests: int
+    hedges_fired: int
+    hedges_won: int
+    hedges_suppressed: int
+    current_delay_sec: float
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    index = max(math.ceil(fraction * len(ordered)) - 1, 0)
+    return ordered[index]
+
+
+class Hedger:
+    def __init__(self, policy: HedgePolicy = HedgePolicy()) -> None:
+        self.policy = policy
+        self._latencies: Deque[float] = deque(maxlen=policy.window)
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=policy.max_workers, thread_name_prefix="hedge"
+        )
+        self._requests = 0
+        self._hedges_fired = 0
+        self._hedges_won = 0
+        self._hedges_suppressed = 0
+
+    def current_delay(self) -> float:
+        with self._lock:
+            samples = list(self._latencies)
+        if len(samples) < self.policy.min_samples:
+            return self.policy.initial_delay_sec
+        delay = _percentile(samples, self.policy.percentile)
+        return min(max(delay, self.policy.min_delay_sec), self.policy.max_delay_sec)
+
+    def metrics(self) -> HedgeMetrics:
+        delay = self.current_delay()
+        with self._lock:
+            return HedgeMetrics(
+                requests=self._requests,
+                hedges_fired=self._hedges_fired,
+                hedges_won=self._hedges_won,
+                hedges_suppressed=self._hedges_suppressed,
+                current_delay_sec=round(delay, 4),
+            )
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _record_latency(self, elapsed: float) -> None:
+        with self._lock:
+            self._latencies.append(elapsed)
+
+    def _try_acquire_hedge(self) -> bool:
+        with self._lock:
+            allowed = self._requests * self.policy.max_extra_ratio + self.policy.burst
+            if self._hedges_fired + 1 > allowed:
+                self._hedges_suppressed += 1
+                return False
+            self._hedges_fired += 1
+            return True
+
+    def run(self, call: Callable[[], T]) -> T:
+        # Only for idempotent calls: the losing attempt is not cancelled and its
+        # result is discarded.
+        with self._lock:
+            self._requests += 1
+        started = time.perf_counter()
+        primary = self._executor.submit(call)
+        done, _ = wait([primary], timeout=self.current_delay())
+        if done or not self._try_acquire_hedge():
+            result = primary.result()
+            self._record_latency(time.perf_counter() - started)
+            return result
+
+        hedge = self._executor.submit(call)
+        logging.info("HTTP hedge fired after %.3fs", time.perf_counter() - started)
+        pending: set[Future[T]] = {primary, hedge}
+        first_error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                error = future.exception()
+                if error is not None:
+                    first_error = first_error or error
+                    continue
+                self._record_latency(time.perf_counter() - started)
+                if future is hedge:
+                    with self._lock:
+                        self._hedges_won += 1
+                return future.result()
+        assert first_error is not None
+        raise first_error
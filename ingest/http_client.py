@@ -1,26 +1,164 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+import gzip
+import json
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import requests
 
+from ingest.concurrency import AdaptiveConcurrency, AimdPolicy, ConcurrencyMetrics
+from ingest.hedging import Hedger, HedgeMetrics, HedgePolicy
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_hedger: Optional[Hedger] = None
+_concurrency: Optional[AdaptiveConcurrency] = None
+_gzip_min_bytes: Optional[int] = None
+
+# Bodies below this size are not worth a gzip round trip.
+GZIP_REQUEST_MIN_BYTES = 4096
+GZIP_COMPRESS_LEVEL = 6
+
+
+def get_session() -> requests.Session:
+    # One pooled session per process keeps TLS connections to the Worker warm
+    # across calls (and across scheduled runs in daemon mode).
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = requests.Session()
+    return _session
+
+
+def close_session() -> None:
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def enable_hedging(policy: HedgePolicy = HedgePolicy()) -> None:
+    # Opt-in: GETs through fetch_json are hedged; POSTs never are.
+    global _hedger
+    if _hedger is None:
+        _hedger = Hedger(policy)
+
+
+def disable_hedging() -> None:
+    global _hedger
+    if _hedger is not None:
+        _hedger.shutdown()
+        _hedger = None
+
+
+def get_hedge_metrics() -> Optional[HedgeMetrics]:
+    return _hedger.metrics() if _hedger else None
+
+
+def log_hedge_metrics() -> None:
+    metrics = get_hedge_metrics()
+    if metrics is None:
+        return
+    logging.info(
+        "HTTP hedging: requests=%d fired=%d won=%d suppressed=%d delay=%.3fs",
+        metrics.requests,
+        metrics.hedges_fired,
+        metrics.hedges_won,
+        metrics.hedges_suppressed,
+        metrics.current_delay_sec,
+    )
+
+
+def enable_adaptive_concurrency(policy: AimdPolicy = AimdPolicy()) -> None:
+    # Opt-in: every GET/POST waits for a per-host slot; the slot count follows AIMD.
+    global _concurrency
+    if _concurrency is None:
+        _concurrency = AdaptiveConcurrency(policy)
+
+
+def disable_adaptive_concurrency() -> None:
+    global _concurrency
+    _concurrency = None
+
+
+def get_concurrency_metrics() -> List[ConcurrencyMetrics]:
+    return _concurrency.metrics() if _concurrency else []
+
+
+def log_concurrency_metrics() -> None:
+    for metrics in get_concurrency_metrics():
+        logging.info(
+            "HTTP concurrency: host=%s limit=%d max_limit=%d requests=%d throttled=%d "
+            "server_errors=%d latency_spikes=%d decreases=%d baseline=%.3fs",
+            metrics.host,
+            metrics.limit,
+            metrics.max_limit_reached,
+            metrics.requests,
+            metrics.throttled,
+            metrics.server_errors,
+            metrics.latency_spikes,
+            metrics.decreases,
+            metrics.baseline_latency_sec,
+        )
+
+
+def enable_request_compression(min_bytes: int = GZIP_REQUEST_MIN_BYTES) -> None:
+    # Opt-in: POST bodies of at least min_bytes are sent with Content-Encoding: gzip.
+    # Requires a Worker whose parseJsonBody decodes gzip.
+    global _gzip_min_bytes
+    _gzip_min_bytes = min_bytes
+
+
+def disable_request_compression() -> None:
+    global _gzip_min_bytes
+    _gzip_min_bytes = None
+
+
+def encode_json_body(payload: Dict[str, Any]) -> Tuple[bytes, Dict[str, str]]:
+    body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    headers = {"Content-Type": "application/json; charset=utf-8"}
+    min_bytes = _gzip_min_bytes
+    if min_bytes is not None and len(body) >= min_bytes:
+        # mtime=0 keeps the compressed bytes identical for identical payloads.
+        body = gzip.compress(body, compresslevel=GZIP_COMPRESS_LEVEL, mtime=0)
+        headers["Content-Encoding"] = "gzip"
+    return body, headers
+
+
+def _send(url: str, call: Callable[[], requests.Response]) -> requests.Response:
+    concurrency = _concurrency
+    return concurrency.limiter_for(url).run(call) if concurrency else call()
+
 
 def fetch_json(url: str, bearer_token: Optional[str]) -> Dict[str, Any]:
     headers = {}
     if bearer_token:
         headers["Authorization"] = f"Bearer {bearer_token}"
-    response = requests.get(url, headers=headers, timeout=30)
-    response.raise_for_status()
-    return response.json()
+
+    def get() -> Dict[str, Any]:
+        response = _send(url, lambda: get_session().get(url, headers=headers, timeout=30))
+        response.raise_for_status()
+        return response.json()
+
+    hedger = _hedger
+    return hedger.run(get) if hedger else get()
 
 
 def post_json(
     url: str, payload: Dict[str, Any], bearer_token: Optional[str]
 ) -> Dict[str, Any]:
-    headers = {"Content-Type": "application/json; charset=utf-8"}
+    # Responses are decompressed by requests, which already sends
+    # Accept-Encoding: gzip, deflate.
+    body, headers = encode_json_body(payload)
     if bearer_token:
         headers["Authorization"] = f"Bearer {bearer_token}"
-    response = requests.post(url, headers=headers, json=payload, timeout=30)
+    response = _send(
+        url, lambda: get_session().post(url, headers=headers, data=body, timeout=30)
+    )
     response.raise_for_status()
     if not response.content:
         return {}
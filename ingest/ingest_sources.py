@@ -1,12 +1,13 @@
 from __future__ import annotations
 
-import json
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 
-from connectors.tasks import TasksConnector
+from connectors.tasks import TasksConnector, parse_tasks_payload, render_tasks
 from delivery.email_templates import build_email_html, build_email_text
+from ingest.daily_log_ingest import ingest_daily_log
 from ingest.daily_log_upsert import upsert_daily_log
+from publish.digest import payload_content_hash
 
 
 @dataclass(frozen=True)
@@ -15,6 +16,8 @@ class IngestResult:
     summary_text: str
     sources: List[str]
     raw_payload: Dict[str, Any]
+    payload_hash: str = ""
+    upserted: bool = True
 
 
 def ingest_sources(
@@ -26,6 +29,7 @@ def ingest_sources(
     bearer_token: Optional[str],
     run_id: str,
     source_label: str,
+    previous_payload_hash: Optional[str] = None,
 ) -> IngestResult:
     connectors = [TasksConnector(tasks_closed_url, bearer_token)]
 
@@ -69,25 +73,61 @@ def ingest_sources(
         "mail_id": run_id,
         "source": source_label,
         "page_id": page_id,
-        "data_json": json.dumps(
-            {
-                "sources": sources,
-                "summary": {
-                    "done_items": done_items,
-                    "drop_items": drop_items,
-                    "progress_line": progress_line,
-                },
-                "raw": raw_payload,
+        # Sent as a nested object; the Worker also accepts a JSON string.
+        "data_json": {
+            "sources": sources,
+            "summary": {
+                "done_items": done_items,
+                "drop_items": drop_items,
+                "progress_line": progress_line,
             },
-            ensure_ascii=False,
-        ),
+            "raw": raw_payload,
+        },
     }
 
-    upsert_daily_log(daily_log_upsert_url, payload, bearer_token)
+    # A resumed run whose payload is unchanged has nothing left to write.
+    payload_hash = payload_content_hash(payload)
+    upserted = payload_hash != previous_payload_hash
+    if upserted:
+        upsert_daily_log(daily_log_upsert_url, payload, bearer_token)
 
     return IngestResult(
         summary_html=summary_html,
         summary_text=summary_text,
         sources=sources,
         raw_payload=raw_payload,
+        payload_hash=payload_hash,
+        upserted=upserted,
+    )
+
+
+def ingest_sources_composite(
+    *,
+    target_date: str,
+    daily_log_ingest_url: str,
+    bearer_token: Optional[str],
+    run_id: str,
+    source_label: str,
+) -> IngestResult:
+    # The Worker renders Activity Summary itself, so only the Tasks connector is
+    # covered here. Use ingest_sources() when other connectors are involved.
+    payload = {
+        "target_date": target_date,
+        "title": f"Daily Log｜{target_date}",
+        "mail_id": run_id,
+        "source": source_label,
+    }
+    response = ingest_daily_log(daily_log_ingest_url, payload, bearer_token)
+    if not response.get("page_id"):
+        raise RuntimeError("ingest_sources_composite: missing page_id in response")
+
+    rendered = render_tasks(parse_tasks_payload(response, target_date))
+
+    # No summary_html: the Worker stores summary_text only, and publish renders
+    # the mail from the Daily_Log it reads back.
+    return IngestResult(
+        summary_html="",
+        summary_text=response.get("summary_text", ""),
+        sources=[TasksConnector.id],
+        raw_payload={TasksConnector.id: rendered.get("raw_payload", {})},
     )
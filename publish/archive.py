@@ -0,0 +1,313 @@
+from __future__ import annotations
+
+import html
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from publish.email_templates import render_daily_log_html
+from publish.read_daily_log import DailyLogSummary, read_daily_log_range
+from publish.render_mail import build_render_payload, summary_content_hash
+
+# Bump when the archive layout or the email templates change so that the next
+# run re-renders every date instead of trusting the stored hashes.
+ARCHIVE_FORMAT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+
+# Incremental runs fetch only Daily_Logs edited since the previous run. The
+# watermark is taken before fetching and moved back by a margin, since Notion
+# rounds last_edited_time to the minute and clocks may differ. Deleted pages
+# never show up in an edited-since fetch, so a full fetch (which also prunes
+# removed dates) still runs every FULL_SYNC_INTERVAL.
+WATERMARK_MARGIN = timedelta(minutes=5)
+FULL_SYNC_INTERVAL = timedelta(days=7)
+
+
+@dataclass(frozen=True)
+class ArchiveResult:
+    rendered: List[str]
+    unchanged: List[str]
+    removed: List[str]
+
+
+@dataclass(frozen=True)
+class FetchRange:
+    start_date: str
+    end_date: str
+    # None fetches every Daily_Log in the range (and allows pruning there).
+    edited_since: Optional[str] = None
+
+
+def _day_path(target_date: str) -> str:
+    year, month, day = target_date.split("-")
+    return f"{year}/{month}/{day}.html"
+
+
+def _load_manifest(output_dir: Path) -> Dict[str, Any]:
+    path = output_dir / MANIFEST_NAME
+    if not path.exists():
+        return {"version": ARCHIVE_FORMAT_VERSION, "entries": {}}
+    try:
+        manifest = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        logging.warning("Archive manifest is unreadable; rebuilding. path=%s", path)
+        return {"version": ARCHIVE_FORMAT_VERSION, "entries": {}}
+    if manifest.get("version") != ARCHIVE_FORMAT_VERSION:
+        logging.info("Archive format changed; re-rendering every date.")
+        return {"version": ARCHIVE_FORMAT_VERSION, "entries": {}}
+    manifest.setdefault("entries", {})
+    return manifest
+
+
+def _write_atomic(path: Path, content: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    tmp_path.write_text(content, encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def _render_day(payload: Mapping[str, object]) -> Tuple[str, str]:
+    return str(payload.get("target_date") or ""), render_daily_log_html(payload)
+
+
+def _render_days(
+    payloads: List[Dict[str, Any]], max_workers: Optional[int]
+) -> Iterable[Tuple[str, str]]:
+    # Spawning workers costs more than rendering a couple of pages.
+    if len(payloads) < 2 or max_workers == 1:
+        return [_render_day(payload) for payload in payloads]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_render_day, payloads, chunksize=8))
+
+
+def _render_index_page(title: str, links: List[Tuple[str, str]]) -> str:
+    items = "".join(
+        f'<li style="margin: 0 0 6px 0;"><a href="{html.escape(href)}">{html.escape(label)}</a></li>'
+        for href, label in links
+    ) or '<li style="margin: 0 0 6px 0;">—</li>'
+    return f"""\
+<!DOCTYPE html>
+<html lang="ja">
+  <head>
+    <meta charset="UTF-8" />
+    <meta name="viewport" content="width=device-width, initial-scale=1" />
+    <title>{html.escape(title)}</title>
+  </head>
+  <body style="margin: 0; padding: 24px 16px; background-color: #f6f7f9; font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Arial, sans-serif; color: #111827;">
+    <div style="max-width: 640px; margin: 0 auto;">
+      <h1 style="margin: 0 0 16px 0; font-size: 22px;">{html.escape(title)}</h1>
+      <ul style="padding-left: 20px; margin: 0;">{items}</ul>
+    </div>
+  </body>
+</html>
+"""
+
+
+def _write_indexes(output_dir: Path, entries: Mapping[str, Any], months: Iterable[str]) -> None:
+    by_month: Dict[str, List[str]] = {}
+    for target_date in sorted(entries):
+        by_month.setdefault(target_date[:7], []).append(target_date)
+
+    for month in months:
+        year, month_number = month.split("-")
+        month_index = output_dir / year / month_number / "index.html"
+        dates = by_month.get(month, [])
+        if not dates:
+            if month_index.exists():
+                month_index.unlink()
+            continue
+        links = [(f"{date[8:]}.html", date) for date in reversed(dates)]
+        _write_atomic(month_index, _render_index_page(f"Daily Log | {month}", links))
+
+    root_links = [
+        (f"{month[:4]}/{month[5:]}/index.html", f"{month} ({len(by_month[month])})")
+        for month in sorted(by_month, reverse=True)
+    ]
+    _write_atomic(output_dir / "index.html", _render_index_page("Daily Log Archive", root_links))
+
+
+def _shift_date(target_date: str, days: int) -> str:
+    shifted = datetime.strptime(target_date, "%Y-%m-%d") + timedelta(days=days)
+    return shifted.strftime("%Y-%m-%d")
+
+
+def plan_fetch_ranges(
+    sync: Mapping[str, Any],
+    *,
+    start_date: str,
+    end_date: str,
+    now: datetime,
+    force: bool = False,
+) -> List[FetchRange]:
+    # sync is the previous run's manifest["sync"]: the range it covered, its
+    # watermark and when the last full fetch ran.
+    full = [FetchRange(start_date, end_date)]
+    try:
+        synced_start = str(sync["start"])
+        synced_end = str(sync["end"])
+        watermark = str(sync["watermark"])
+        full_sync_at = datetime.fromisoformat(str(sync["full_sync_at"]))
+    except (KeyError, TypeError, ValueError):
+        return full
+    if force or now - full_sync_at >= FULL_SYNC_INTERVAL:
+        return full
+    overlap_start = max(start_date, synced_start)
+    overlap_end = min(end_date, synced_end)
+    if overlap_start > overlap_end:
+        return full
+
+    ranges: List[FetchRange] = []
+    # Dates outside the previously covered range have never been fetched.
+    if start_date < synced_start:
+        ranges.append(FetchRange(start_date, _shift_date(synced_start, -1)))
+    ranges.append(FetchRange(overlap_start, overlap_end, watermark))
+    if end_date > synced_end:
+        ranges.append(FetchRange(_shift_date(synced_end, 1), end_date))
+    return ranges
+
+
+def build_archive_from_summaries(
+    summaries: Iterable[DailyLogSummary],
+    *,
+    output_dir: Path,
+    start_date: str,
+    end_date: str,
+    max_workers: Optional[int] = None,
+    force: bool = False,
+    complete_ranges: Optional[List[Tuple[str, str]]] = None,
+    sync: Optional[Dict[str, str]] = None,
+) -> ArchiveResult:
+    # summaries may cover only part of the range (an incremental fetch); dates
+    # are pruned only inside complete_ranges, where every Daily_Log was fetched.
+    # sync is stored in the manifest for the next run's plan_fetch_ranges.
+    if complete_ranges is None:
+        complete_ranges = [(start_date, end_date)]
+    manifest = _load_manifest(output_dir)
+    entries: Dict[str, Any] = manifest["entries"]
+
+    current: Dict[str, DailyLogSummary] = {
+        summary.target_date: summary
+        for summary in summaries
+        if start_date <= summary.target_date <= end_date
+    }
+
+    to_render: List[Dict[str, Any]] = []
+    hashes: Dict[str, str] = {}
+    unchanged: List[str] = []
+    for target_date, summary in sorted(current.items()):
+        content_hash = summary_content_hash(summary)
+        entry = entries.get(target_date)
+        page_path = output_dir / _day_path(target_date)
+        if (
+            not force
+            and entry
+            and entry.get("hash") == content_hash
+            and page_path.exists()
+        ):
+            unchanged.append(target_date)
+            continue
+        hashes[target_date] = content_hash
+        to_render.append(build_render_payload(summary))
+
+    removed = sorted(
+        target_date
+        for target_date in entries
+        if any(start <= target_date <= end for start, end in complete_ranges)
+        and target_date not in current
+    )
+    for target_date in removed:
+        page_path = output_dir / entries.pop(target_date).get("path", _day_path(target_date))
+        if page_path.exists():
+            page_path.unlink()
+
+    rendered: List[str] = []
+    for target_date, html_body in _render_days(to_render, max_workers):
+        relative_path = _day_path(target_date)
+        _write_atomic(output_dir / relative_path, html_body)
+        entries[target_date] = {"hash": hashes[target_date], "path": relative_path}
+        rendered.append(target_date)
+
+    touched_months = {target_date[:7] for target_date in rendered + removed}
+    if touched_months or not (output_dir / "index.html").exists():
+        _write_indexes(output_dir, entries, touched_months)
+    if sync is not None:
+        manifest["sync"] = sync
+    _write_atomic(
+        output_dir / MANIFEST_NAME,
+        json.dumps(manifest, ensure_ascii=False, indent=2, sort_keys=True) + "\n",
+    )
+
+    logging.info(
+        "Archive built: rendered=%d unchanged=%d removed=%d output=%s",
+        len(rendered),
+        len(unchanged),
+        len(removed),
+        output_dir,
+    )
+    return ArchiveResult(rendered=rendered, unchanged=unchanged, removed=removed)
+
+
+def build_archive(
+    *,
+    daily_log_range_url: str,
+    bearer_token: Optional[str],
+    start_date: str,
+    end_date: str,
+    output_dir: Path,
+    max_workers: Optional[int] = None,
+    force: bool = False,
+    now: Optional[datetime] = None,
+) -> ArchiveResult:
+    now = now or datetime.now(timezone.utc)
+    previous_sync = _load_manifest(output_dir).get("sync") or {}
+    fetch_ranges = plan_fetch_ranges(
+        previous_sync, start_date=start_date, end_date=end_date, now=now, force=force
+    )
+    full_fetch = all(fetch_range.edited_since is None for fetch_range in fetch_ranges)
+
+    summaries: List[DailyLogSummary] = []
+    for fetch_range in fetch_ranges:
+        summaries.extend(
+            read_daily_log_range(
+                daily_log_range_url=daily_log_range_url,
+                start_date=fetch_range.start_date,
+                end_date=fetch_range.end_date,
+                bearer_token=bearer_token,
+                edited_since=fetch_range.edited_since,
+            )
+        )
+    logging.info(
+        "Archive fetch: ranges=%s fetched=%d",
+        ",".join(
+            f"{r.start_date}..{r.end_date}" + (f"@{r.edited_since}" if r.edited_since else "")
+            for r in fetch_ranges
+        ),
+        len(summaries),
+    )
+
+    return build_archive_from_summaries(
+        summaries,
+        output_dir=output_dir,
+        start_date=start_date,
+        end_date=end_date,
+        max_workers=max_workers,
+        force=force,
+        complete_ranges=[
+            (r.start_date, r.end_date) for r in fetch_ranges if r.edited_since is None
+        ],
+        sync={
+            "start": start_date,
+            "end": end_date,
+            "watermark": (now - WATERMARK_MARGIN).isoformat(timespec="seconds"),
+            "full_sync_at": (
+                now.isoformat(timespec="seconds")
+                if full_fetch
+                else str(previous_sync["full_sync_at"])
+            ),
+        },
+    )
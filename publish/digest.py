@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, List, Mapping, Optional, Tuple
+
+DIGEST_CACHE_SIZE = 64
+
+_PRIORITY_PATTERN = re.compile(
+    r"^(?P<title>.*?)(?:\s*\(Priority:\s*(?P<priority>[^)]+)\))?$"
+)
+
+
+@dataclass(frozen=True, slots=True)
+class TaskEntry:
+    title: str
+    priority: str
+
+
+@dataclass(frozen=True, slots=True)
+class DigestModel:
+    content_hash: str
+    target_date: str
+    run_id: str
+    done_items: Tuple[TaskEntry, ...]
+    drop_items: Tuple[TaskEntry, ...]
+    progress_line: str
+    # Display-ready values ("—" when empty).
+    diary: str
+    expenses_total: str
+    location_summary: str
+    mood: str
+    weight: str
+
+
+# Parsing and normalization happen once per content hash; every renderer and
+# every recipient variant reads the same model.
+_digest_cache: "OrderedDict[str, DigestModel]" = OrderedDict()
+_digest_cache_lock = threading.Lock()
+
+
+def payload_content_hash(payload: Mapping[str, Any]) -> str:
+    encoded = json.dumps(dict(payload), ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _normalize_text(value: Optional[str]) -> str:
+    if value is None:
+        return "—"
+    stripped = value.strip()
+    return stripped if stripped else "—"
+
+
+def _normalize_number(value: Optional[float]) -> str:
+    if value is None:
+        return "—"
+    if isinstance(value, bool):
+        return "—"
+    return f"{value:g}"
+
+
+def parse_task_line(item_text: str) -> TaskEntry:
+    match = _PRIORITY_PATTERN.match(item_text)
+    if not match:
+        title, priority = item_text, "-"
+    else:
+        title = (match.group("title") or "").strip()
+        priority = (match.group("priority") or "-").strip()
+    return TaskEntry(title=title or "(No title)", priority=priority or "-")
+
+
+def parse_task_items(summary_text: str) -> Tuple[List[TaskEntry], List[TaskEntry]]:
+    done_items: List[TaskEntry] = []
+    drop_items: List[TaskEntry] = []
+    current: Optional[str] = None
+    if not summary_text:
+        return done_items, drop_items
+
+    for raw_line in summary_text.splitlines():
+        line = raw_line.strip()
+        if not line:
+            continue
+        if line.startswith("🎉"):
+            current = "done"
+            continue
+        if line.startswith("🧹"):
+            current = "drop"
+            continue
+        if not line.startswith("-"):
+            continue
+
+        if current not in {"done", "drop"}:
+            continue
+
+        item_text = line[1:].strip()
+        if not item_text:
+            continue
+        entry = parse_task_line(item_text)
+        if current == "done":
+            done_items.append(entry)
+        else:
+            drop_items.append(entry)
+    return done_items, drop_items
+
+
+def default_progress_line(done_count: int, drop_count: int) -> str:
+    return f"昨日の前進：Done {done_count}件 / Drop {drop_count}件"
+
+
+def _build_digest(payload: Mapping[str, Any], content_hash: str) -> DigestModel:
+    done_items, drop_items = parse_task_items(str(payload.get("summary_text") or ""))
+    return DigestModel(
+        content_hash=content_hash,
+        target_date=str(payload.get("target_date") or ""),
+        run_id=str(payload.get("run_id") or payload.get("mail_id") or ""),
+        done_items=tuple(done_items),
+        drop_items=tuple(drop_items),
+        progress_line=default_progress_line(len(done_items), len(drop_items)),
+        diary=_normalize_text(payload.get("diary")),
+        expenses_total=_normalize_number(payload.get("expenses_total")),
+        location_summary=_normalize_text(payload.get("location_summary")),
+        mood=_normalize_text(payload.get("mood")),
+        weight=_normalize_number(payload.get("weight")),
+    )
+
+
+def build_digest(payload: Mapping[str, Any]) -> DigestModel:
+    content_hash = payload_content_hash(payload)
+    with _digest_cache_lock:
+        cached = _digest_cache.get(content_hash)
+        if cached is not None:
+            _digest_cache.move_to_end(content_hash)
+            return cached
+    digest = _build_digest(payload, content_hash)
+    with _digest_cache_lock:
+        _digest_cache[content_hash] = digest
+        while len(_digest_cache) > DIGEST_CACHE_SIZE:
+            _digest_cache.popitem(last=False)
+    return digest
+
+
+def format_task_entry(entry: TaskEntry) -> str:
+    return f"{entry.title} (Priority: {entry.priority})"
+
+
+def render_digest_subject(digest: DigestModel) -> str:
+    return f"Daily Log | {digest.target_date}"
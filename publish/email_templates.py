@@ -1,82 +1,28 @@
 from __future__ import annotations
 
 import html
-import re
-from dataclasses import dataclass
-from typing import Iterable, List, Mapping, Optional, Tuple
-
-MAX_TASK_ITEMS = 30
-
-
-@dataclass(frozen=True)
-class TaskEntry:
-    title: str
-    priority: str
-
-
-def _normalize_text(value: Optional[str]) -> str:
-    if value is None:
-        return "—"
-    stripped = value.strip()
-    return stripped if stripped else "—"
+from typing import Collection, Iterable, List, Mapping, Optional, Sequence, Tuple
 
+from publish.digest import DigestModel, TaskEntry, build_digest, format_task_entry
 
-def _normalize_number(value: Optional[float]) -> str:
-    if value is None:
-        return "—"
-    if isinstance(value, bool):
-        return "—"
-    return f"{value:g}"
-
+MAX_TASK_ITEMS = 30
 
-def _parse_task_items(summary_text: str) -> Tuple[List[TaskEntry], List[TaskEntry]]:
-    done_items: List[TaskEntry] = []
-    drop_items: List[TaskEntry] = []
-    current: Optional[str] = None
-    if not summary_text:
-        return done_items, drop_items
 
-    priority_pattern = re.compile(
-        r"^(?P<title>.*?)(?:\s*\(Priority:\s*(?P<priority>[^)]+)\))?$"
-    )
-
-    for raw_line in summary_text.splitlines():
-        line = raw_line.strip()
-        if not line:
-            continue
-        if line.startswith("🎉"):
-            current = "done"
-            continue
-        if line.startswith("🧹"):
-            current = "drop"
-            continue
-        if not line.startswith("-"):
-            continue
-
-        if current not in {"done", "drop"}:
-            continue
-
-        item_text = line[1:].strip()
-        if not item_text:
-            continue
-        match = priority_pattern.match(item_text)
-        if not match:
-            title, priority = item_text, "-"
-        else:
-            title = (match.group("title") or "").strip()
-            priority = (match.group("priority") or "-").strip()
-        entry = TaskEntry(title=title or "(No title)", priority=priority or "-")
-        if current == "done":
-            done_items.append(entry)
-        else:
-            drop_items.append(entry)
-    return done_items, drop_items
+def _filter_items(
+    items: Sequence[TaskEntry], priorities: Optional[Collection[str]]
+) -> List[TaskEntry]:
+    if priorities is None:
+        return list(items)
+    allowed = {priority.strip().lower() for priority in priorities}
+    return [item for item in items if item.priority.strip().lower() in allowed]
 
 
-def _limit_items(items: List[TaskEntry]) -> Tuple[List[TaskEntry], int]:
-    if len(items) <= MAX_TASK_ITEMS:
+def _limit_items(
+    items: List[TaskEntry], max_items: int = MAX_TASK_ITEMS
+) -> Tuple[List[TaskEntry], int]:
+    if len(items) <= max_items:
         return items, 0
-    return items[:MAX_TASK_ITEMS], len(items) - MAX_TASK_ITEMS
+    return items[:max_items], len(items) - max_items
 
 
 def _render_priority_badge(priority: str) -> str:
@@ -132,24 +78,36 @@ def _render_more_row(remaining: int) -> str:
     )
 
 
-def render_daily_log_html(payload: Mapping[str, object]) -> str:
-    target_date = str(payload.get("target_date") or "")
-    run_id = str(payload.get("run_id") or payload.get("mail_id") or "")
-    summary_text = str(payload.get("summary_text") or "")
+def render_daily_log_html(
+    payload: Mapping[str, object],
+    *,
+    max_task_items: int = MAX_TASK_ITEMS,
+    priorities: Optional[Collection[str]] = None,
+) -> str:
+    return render_digest_html(
+        build_digest(payload), max_task_items=max_task_items, priorities=priorities
+    )
 
-    done_items, drop_items = _parse_task_items(summary_text)
-    done_visible, done_more = _limit_items(done_items)
-    drop_visible, drop_more = _limit_items(drop_items)
 
-    diary = _normalize_text(payload.get("diary") if isinstance(payload, Mapping) else None)
-    expenses_total = _normalize_number(
-        payload.get("expenses_total") if isinstance(payload, Mapping) else None
-    )
-    location_summary = _normalize_text(
-        payload.get("location_summary") if isinstance(payload, Mapping) else None
-    )
-    mood = _normalize_text(payload.get("mood") if isinstance(payload, Mapping) else None)
-    weight = _normalize_number(payload.get("weight") if isinstance(payload, Mapping) else None)
+def render_digest_html(
+    digest: DigestModel,
+    *,
+    max_task_items: int = MAX_TASK_ITEMS,
+    priorities: Optional[Collection[str]] = None,
+) -> str:
+    target_date = digest.target_date
+    run_id = digest.run_id
+
+    done_items = _filter_items(digest.done_items, priorities)
+    drop_items = _filter_items(digest.drop_items, priorities)
+    done_visible, done_more = _limit_items(done_items, max_task_items)
+    drop_visible, drop_more = _limit_items(drop_items, max_task_items)
+
+    diary = digest.diary
+    expenses_total = digest.expenses_total
+    location_summary = digest.location_summary
+    mood = digest.mood
+    weight = digest.weight
 
     diary_html = html.escape(diary).replace("\n", "<br />")
     location_html = html.escape(location_summary).replace("\n", "<br />")
@@ -245,14 +203,30 @@ def render_daily_log_html(payload: Mapping[str, object]) -> str:
 """
 
 
-def render_daily_log_text(payload: Mapping[str, object]) -> str:
-    target_date = str(payload.get("target_date") or "")
-    run_id = str(payload.get("run_id") or payload.get("mail_id") or "")
-    summary_text = str(payload.get("summary_text") or "")
+def render_daily_log_text(
+    payload: Mapping[str, object],
+    *,
+    max_task_items: int = MAX_TASK_ITEMS,
+    priorities: Optional[Collection[str]] = None,
+) -> str:
+    return render_digest_text(
+        build_digest(payload), max_task_items=max_task_items, priorities=priorities
+    )
+
+
+def render_digest_text(
+    digest: DigestModel,
+    *,
+    max_task_items: int = MAX_TASK_ITEMS,
+    priorities: Optional[Collection[str]] = None,
+) -> str:
+    target_date = digest.target_date
+    run_id = digest.run_id
 
-    done_items, drop_items = _parse_task_items(summary_text)
-    done_visible, done_more = _limit_items(done_items)
-    drop_visible, drop_more = _limit_items(drop_items)
+    done_items = _filter_items(digest.done_items, priorities)
+    drop_items = _filter_items(digest.drop_items, priorities)
+    done_visible, done_more = _limit_items(done_items, max_task_items)
+    drop_visible, drop_more = _limit_items(drop_items, max_task_items)
 
     def render_items(items: Iterable[TaskEntry], remaining: int) -> List[str]:
         lines = []
@@ -260,20 +234,16 @@ def render_daily_log_text(payload: Mapping[str, object]) -> str:
             lines.append("- —")
         else:
             for item in items:
-                lines.append(f"- {item.title} (Priority: {item.priority})")
+                lines.append(f"- {format_task_entry(item)}")
         if remaining > 0:
             lines.append(f"...and {remaining} more")
         return lines
 
-    diary = _normalize_text(payload.get("diary") if isinstance(payload, Mapping) else None)
-    expenses_total = _normalize_number(
-        payload.get("expenses_total") if isinstance(payload, Mapping) else None
-    )
-    location_summary = _normalize_text(
-        payload.get("location_summary") if isinstance(payload, Mapping) else None
-    )
-    mood = _normalize_text(payload.get("mood") if isinstance(payload, Mapping) else None)
-    weight = _normalize_number(payload.get("weight") if isinstance(payload, Mapping) else None)
+    diary = digest.diary
+    expenses_total = digest.expenses_total
+    location_summary = digest.location_summary
+    mood = digest.mood
+    weight = digest.weight
 
     lines = [
         f"Daily Log | {target_date}",
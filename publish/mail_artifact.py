@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from publish.mail_variants import (
+    build_variant_messages,
+    recipient_profiles_key,
+    render_mail_variants,
+)
+from publish.read_daily_log import DailyLogSummary
+from publish.render_mail import RenderProfile, summary_content_hash
+
+# Bump when the artifact layout changes; older artifacts are then ignored and
+# Phase B falls back to a full render.
+ARTIFACT_VERSION = 2
+LATEST_NAME = "LATEST"
+
+# Lets a long-running process (daily_job --daemon) hand the Phase A artifact to
+# Phase B without re-reading it from disk.
+_memory_cache: Dict[Tuple[str, str], "MailArtifact"] = {}
+
+
+@dataclass(frozen=True)
+class MailArtifact:
+    version: int
+    target_date: str
+    page_id: str
+    last_edited_time: Optional[str]
+    content_hash: str
+    mail_from: str
+    mail_to: List[str]
+    profiles_key: str
+    # One entry per distinct render profile: {"mail_to": [...], "mime_message": "..."}.
+    messages: List[Dict[str, Any]]
+
+    def to_messages(self) -> List[Tuple[List[str], str]]:
+        return [(list(item["mail_to"]), item["mime_message"]) for item in self.messages]
+
+
+def build_mail_artifact(
+    summary: DailyLogSummary,
+    *,
+    mail_from: str,
+    mail_to: List[str],
+    recipient_profiles: Optional[Mapping[str, RenderProfile]] = None,
+) -> MailArtifact:
+    profiles = recipient_profiles or {}
+    variants = render_mail_variants(summary, mail_to, profiles)
+    return MailArtifact(
+        version=ARTIFACT_VERSION,
+        target_date=summary.target_date,
+        page_id=summary.page_id,
+        last_edited_time=summary.last_edited_time,
+        content_hash=summary_content_hash(summary),
+        mail_from=mail_from,
+        mail_to=list(mail_to),
+        profiles_key=recipient_profiles_key(mail_to, profiles),
+        messages=[
+            {"mail_to": addresses, "mime_message": raw_message}
+            for addresses, raw_message in build_variant_messages(mail_from, variants)
+        ],
+    )
+
+
+def _artifact_path(directory: Path, target_date: str, content_hash: str) -> Path:
+    return directory / target_date / f"{content_hash}.json"
+
+
+def _write_atomic(path: Path, content: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    tmp_path.write_text(content, encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def save_mail_artifact(directory: Path, artifact: MailArtifact) -> Path:
+    path = _artifact_path(directory, artifact.target_date, artifact.content_hash)
+    _write_atomic(path, json.dumps(asdict(artifact), ensure_ascii=False))
+    _write_atomic(directory / artifact.target_date / LATEST_NAME, artifact.content_hash)
+    for key in [key for key in _memory_cache if key[0] != artifact.target_date]:
+        del _memory_cache[key]
+    _memory_cache[(artifact.target_date, artifact.content_hash)] = artifact
+    return path
+
+
+def load_mail_artifact(
+    directory: Path, target_date: str, content_hash: Optional[str] = None
+) -> Optional[MailArtifact]:
+    if content_hash is None:
+        latest_path = directory / target_date / LATEST_NAME
+        if not latest_path.exists():
+            return None
+        content_hash = latest_path.read_text(encoding="utf-8").strip()
+
+    cached = _memory_cache.get((target_date, content_hash))
+    if cached:
+        return cached
+    path = _artifact_path(directory, target_date, content_hash)
+    if not path.exists():
+        return None
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        # Older layouts have different fields; check the version before constructing.
+        if data.get("version") != ARTIFACT_VERSION:
+            return None
+        artifact = MailArtifact(**data)
+    except (OSError, ValueError, TypeError, AttributeError):
+        logging.warning("Mail artifact is unreadable; ignoring. path=%s", path)
+        return None
+    return artifact
+
+
+def find_current_artifact(
+    directory: Path,
+    summary: DailyLogSummary,
+    *,
+    mail_from: str,
+    mail_to: List[str],
+    recipient_profiles: Optional[Mapping[str, RenderProfile]] = None,
+) -> Optional[MailArtifact]:
+    artifact = load_mail_artifact(
+        directory, summary.target_date, summary_content_hash(summary)
+    )
+    if not artifact:
+        return None
+    if artifact.page_id != summary.page_id:
+        return None
+    if not artifact.last_edited_time or artifact.last_edited_time != summary.last_edited_time:
+        return None
+    if artifact.mail_from != mail_from or artifact.mail_to != list(mail_to):
+        return None
+    if artifact.profiles_key != recipient_profiles_key(mail_to, recipient_profiles or {}):
+        return None
+    return artifact
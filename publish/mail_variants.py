@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Mapping, Tuple
+
+from delivery.email_sender import build_email_message
+from publish.read_daily_log import DailyLogSummary
+from publish.render_mail import (
+    DEFAULT_RENDER_PROFILE,
+    MailContent,
+    RenderProfile,
+    render_mail,
+)
+
+# Key in MAIL_RECIPIENT_PROFILES that applies to recipients without their own entry.
+DEFAULT_PROFILE_KEY = "*"
+PROFILE_FIELDS = ("max_task_items", "priorities", "text_only")
+
+
+@dataclass(frozen=True)
+class MailVariant:
+    profile: RenderProfile
+    mail_to: List[str]
+    mail: MailContent
+
+
+def build_render_profile(data: Mapping[str, Any]) -> RenderProfile:
+    unknown = sorted(set(data) - set(PROFILE_FIELDS))
+    if unknown:
+        raise ValueError(f"Unknown render profile fields: {', '.join(unknown)}")
+    max_task_items = data.get("max_task_items", DEFAULT_RENDER_PROFILE.max_task_items)
+    if not isinstance(max_task_items, int) or isinstance(max_task_items, bool) or max_task_items < 0:
+        raise ValueError("max_task_items must be a non-negative integer")
+    priorities = data.get("priorities")
+    if priorities is not None:
+        if not isinstance(priorities, list) or not all(isinstance(p, str) for p in priorities):
+            raise ValueError("priorities must be a list of strings")
+        priorities = tuple(sorted({p.strip().lower() for p in priorities}))
+    return RenderProfile(
+        max_task_items=max_task_items,
+        priorities=priorities,
+        text_only=bool(data.get("text_only", False)),
+    )
+
+
+def parse_recipient_profiles(raw: str) -> Dict[str, RenderProfile]:
+    if not raw.strip():
+        return {}
+    data = json.loads(raw)
+    if not isinstance(data, dict):
+        raise ValueError("MAIL_RECIPIENT_PROFILES must be a JSON object")
+    return {
+        address.strip().lower(): build_render_profile(profile)
+        for address, profile in data.items()
+    }
+
+
+def group_recipients(
+    mail_to: List[str], recipient_profiles: Mapping[str, RenderProfile]
+) -> List[Tuple[RenderProfile, List[str]]]:
+    default = recipient_profiles.get(DEFAULT_PROFILE_KEY, DEFAULT_RENDER_PROFILE)
+    groups: Dict[RenderProfile, List[str]] = {}
+    for address in mail_to:
+        profile = recipient_profiles.get(address.strip().lower(), default)
+        groups.setdefault(profile, []).append(address)
+    return list(groups.items())
+
+
+def recipient_profiles_key(
+    mail_to: List[str], recipient_profiles: Mapping[str, RenderProfile]
+) -> str:
+    groups = [
+        {"profile": asdict(profile), "mail_to": addresses}
+        for profile, addresses in group_recipients(mail_to, recipient_profiles)
+    ]
+    encoded = json.dumps(groups, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def render_mail_variants(
+    summary: DailyLogSummary,
+    mail_to: List[str],
+    recipient_profiles: Mapping[str, RenderProfile],
+) -> List[MailVariant]:
+    # Rendered in-process: every variant reuses the memoized DigestModel, and a
+    # variant renders far faster than a worker process starts.
+    return [
+        MailVariant(profile=profile, mail_to=addresses, mail=render_mail(summary, profile))
+        for profile, addresses in group_recipients(mail_to, recipient_profiles)
+    ]
+
+
+def build_variant_messages(
+    mail_from: str, variants: List[MailVariant]
+) -> List[Tuple[List[str], str]]:
+    return [
+        (
+            variant.mail_to,
+            build_email_message(
+                mail_from,
+                variant.mail_to,
+                variant.mail.subject,
+                variant.mail.plain_text,
+                variant.mail.html_body,
+            ).as_string(),
+        )
+        for variant in variants
+    ]
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Optional
+from typing import Any, Dict, List, Optional, Sequence
 from urllib.parse import urlencode
 
 from ingest.http_client import fetch_json
@@ -21,16 +21,66 @@ class DailyLogSummary:
     location_summary: Optional[str]
     mood: Optional[str]
     weight: Optional[float]
+    last_edited_time: Optional[str] = None
+
+
+# Fields render_mail actually reads; page_id / last_edited_time are always returned.
+# title / summary_html / source are left out and come back as defaults.
+RENDER_FIELDS = (
+    "summary_text",
+    "mail_id",
+    "diary",
+    "expenses_total",
+    "location_summary",
+    "mood",
+    "weight",
+)
+
+
+def _fields_query(fields: Optional[Sequence[str]]) -> Dict[str, str]:
+    if not fields:
+        return {}
+    return {"fields": ",".join(fields)}
 
 
 def read_daily_log(
-    *, daily_log_read_url: str, target_date: str, bearer_token: Optional[str]
+    *,
+    daily_log_read_url: str,
+    target_date: str,
+    bearer_token: Optional[str],
+    fields: Optional[Sequence[str]] = RENDER_FIELDS,
 ) -> Optional[DailyLogSummary]:
-    url = f"{daily_log_read_url}?{urlencode({'date': target_date})}"
+    query = urlencode({"date": target_date, **_fields_query(fields)})
+    url = f"{daily_log_read_url}?{query}"
     payload = fetch_json(url, bearer_token)
     if not payload.get("found"):
         return None
 
+    return _summary_from_payload(payload, target_date)
+
+
+def read_daily_log_range(
+    *,
+    daily_log_range_url: str,
+    start_date: str,
+    end_date: str,
+    bearer_token: Optional[str],
+    fields: Optional[Sequence[str]] = RENDER_FIELDS,
+    edited_since: Optional[str] = None,
+) -> List[DailyLogSummary]:
+    # edited_since (ISO timestamp) limits the result to pages edited at or after it.
+    params = {"start": start_date, "end": end_date, **_fields_query(fields)}
+    if edited_since:
+        params["edited_since"] = edited_since
+    query = urlencode(params)
+    payload = fetch_json(f"{daily_log_range_url}?{query}", bearer_token)
+    return [
+        _summary_from_payload(item, item.get("target_date", ""))
+        for item in payload.get("items", [])
+    ]
+
+
+def _summary_from_payload(payload: Dict[str, Any], target_date: str) -> DailyLogSummary:
     return DailyLogSummary(
         target_date=payload.get("target_date", target_date),
         page_id=payload.get("page_id", ""),
@@ -44,4 +94,5 @@ def read_daily_log(
         location_summary=payload.get("location_summary"),
         mood=payload.get("mood"),
         weight=payload.get("weight"),
+        last_edited_time=payload.get("last_edited_time"),
     )
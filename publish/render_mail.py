@@ -1,8 +1,19 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
 
-from publish.email_templates import render_daily_log_html, render_daily_log_text
+from publish.digest import (
+    DigestModel,
+    build_digest,
+    payload_content_hash,
+    render_digest_subject,
+)
+from publish.email_templates import (
+    MAX_TASK_ITEMS,
+    render_digest_html,
+    render_digest_text,
+)
 from publish.read_daily_log import DailyLogSummary
 
 
@@ -13,9 +24,19 @@ class MailContent:
     html_body: str
 
 
-def render_mail(summary: DailyLogSummary) -> MailContent:
-    subject = f"Daily Log | {summary.target_date}"
-    payload = {
+@dataclass(frozen=True)
+class RenderProfile:
+    max_task_items: int = MAX_TASK_ITEMS
+    # Lower-cased and sorted so that equal filters compare (and hash) equal.
+    priorities: Optional[Tuple[str, ...]] = None
+    text_only: bool = False
+
+
+DEFAULT_RENDER_PROFILE = RenderProfile()
+
+
+def build_render_payload(summary: DailyLogSummary) -> Dict[str, Any]:
+    return {
         "target_date": summary.target_date,
         "run_id": summary.mail_id,
         "summary_text": summary.summary_text,
@@ -25,7 +46,30 @@ def render_mail(summary: DailyLogSummary) -> MailContent:
         "mood": summary.mood,
         "weight": summary.weight,
     }
-    plain_text = render_daily_log_text(payload)
-    html_body = render_daily_log_html(payload)
+
+
+def summary_content_hash(summary: DailyLogSummary) -> str:
+    return payload_content_hash(build_render_payload(summary))
+
+
+def build_summary_digest(summary: DailyLogSummary) -> DigestModel:
+    return build_digest(build_render_payload(summary))
+
+
+def render_mail(
+    summary: DailyLogSummary, profile: RenderProfile = DEFAULT_RENDER_PROFILE
+) -> MailContent:
+    digest = build_summary_digest(summary)
+    subject = render_digest_subject(digest)
+    plain_text = render_digest_text(
+        digest, max_task_items=profile.max_task_items, priorities=profile.priorities
+    )
+    html_body = (
+        ""
+        if profile.text_only
+        else render_digest_html(
+            digest, max_task_items=profile.max_task_items, priorities=profile.priorities
+        )
+    )
 
     return MailContent(subject=subject, plain_text=plain_text, html_body=html_body)
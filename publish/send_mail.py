@@ -1,9 +1,12 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import List
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
 
 from delivery.email_sender import send_email as send_email_raw
+from delivery.email_sender import send_raw_email, send_raw_emails
+from publish.mail_variants import MailVariant, build_variant_messages
+from publish.render_mail import RenderProfile
 
 
 @dataclass(frozen=True)
@@ -11,12 +14,13 @@ class MailConfig:
     mail_from: str
     mail_to: List[str]
     gmail_app_password: str
+    recipient_profiles: Dict[str, RenderProfile] = field(default_factory=dict)
 
 
 def send_mail(
     config: MailConfig, subject: str, plain_text: str, html_body: str
-) -> None:
-    send_email_raw(
+) -> List[str]:
+    return send_email_raw(
         config.mail_from,
         config.mail_to,
         config.gmail_app_password,
@@ -24,3 +28,22 @@ def send_mail(
         plain_text,
         html_body,
     )
+
+
+def send_prebuilt_mail(config: MailConfig, raw_message: str) -> List[str]:
+    return send_raw_email(
+        config.mail_from,
+        config.mail_to,
+        config.gmail_app_password,
+        raw_message,
+    )
+
+
+def send_prebuilt_mails(
+    config: MailConfig, messages: List[Tuple[List[str], str]]
+) -> List[str]:
+    return send_raw_emails(config.mail_from, config.gmail_app_password, messages)
+
+
+def send_mail_variants(config: MailConfig, variants: List[MailVariant]) -> List[str]:
+    return send_prebuilt_mails(config, build_variant_messages(config.mail_from, variants))
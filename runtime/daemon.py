@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional
+from zoneinfo import ZoneInfo
+
+JST = ZoneInfo("Asia/Tokyo")
+
+
+@dataclass(frozen=True)
+class ScheduledJob:
+    name: str
+    hour: int
+    minute: int
+    run: Callable[[], None]
+
+
+@dataclass
+class JobStatus:
+    next_run: Optional[str] = None
+    last_started: Optional[str] = None
+    last_finished: Optional[str] = None
+    last_duration_sec: Optional[float] = None
+    last_success: Optional[bool] = None
+    last_error: Optional[str] = None
+    run_count: int = 0
+    failure_count: int = 0
+
+
+def next_run_time(now: datetime, hour: int, minute: int) -> datetime:
+    now_jst = now.astimezone(JST)
+    candidate = now_jst.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if candidate <= now_jst:
+        candidate += timedelta(days=1)
+    return candidate
+
+
+def _now_jst() -> datetime:
+    return datetime.now(JST)
+
+
+class DailyScheduler:
+    def __init__(
+        self,
+        jobs: List[ScheduledJob],
+        clock: Callable[[], datetime] = _now_jst,
+    ) -> None:
+        self.jobs = jobs
+        self.clock = clock
+        self.statuses: Dict[str, JobStatus] = {}
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._next_runs: Dict[str, datetime] = {}
+        now = self.clock()
+        self.started_at = now.isoformat()
+        for job in self.jobs:
+            self._next_runs[job.name] = next_run_time(now, job.hour, job.minute)
+            self.statuses[job.name] = JobStatus(
+                next_run=self._next_runs[job.name].isoformat()
+            )
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            jobs = {name: asdict(status) for name, status in self.statuses.items()}
+        healthy = all(status.get("last_success") is not False for status in jobs.values())
+        return {
+            "status": "ok" if healthy else "degraded",
+            "started_at": self.started_at,
+            "jobs": jobs,
+        }
+
+    def run_job(self, job: ScheduledJob) -> None:
+        started = self.clock()
+        with self._lock:
+            status = self.statuses[job.name]
+            status.last_started = started.isoformat()
+            status.run_count += 1
+        logging.info("Scheduler: starting job=%s", job.name)
+        error: Optional[str] = None
+        try:
+            job.run()
+        except Exception as exc:
+            logging.exception("Scheduler: job failed. job=%s", job.name)
+            error = f"{type(exc).__name__}: {exc}"
+        finished = self.clock()
+        with self._lock:
+            status.last_finished = finished.isoformat()
+            status.last_duration_sec = round((finished - started).total_seconds(), 3)
+            status.last_success = error is None
+            status.last_error = error
+            if error:
+                status.failure_count += 1
+        logging.info(
+            "Scheduler: finished job=%s success=%s duration=%.3fs",
+            job.name,
+            error is None,
+            status.last_duration_sec,
+        )
+
+    def run_forever(self) -> None:
+        while not self._stop.is_set():
+            name, due = min(self._next_runs.items(), key=lambda item: item[1])
+            wait_sec = (due - self.clock()).total_seconds()
+            # Sleep right up to the due time; the stop event interrupts the wait.
+            if wait_sec > 0 and self._stop.wait(timeout=wait_sec):
+                break
+            if self.clock() < due:
+                continue
+            job = next(job for job in self.jobs if job.name == name)
+            self.run_job(job)
+            self._next_runs[name] = next_run_time(self.clock(), job.hour, job.minute)
+            with self._lock:
+                self.statuses[name].next_run = self._next_runs[name].isoformat()
+
+
+def start_health_server(
+    scheduler: DailyScheduler, host: str, port: int
+) -> ThreadingHTTPServer:
+    class HealthHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.rstrip("/") not in ("/health", "/status"):
+                self.send_response(404)
+                self.end_headers()
+                return
+            snapshot = scheduler.snapshot()
+            body = json.dumps(snapshot, ensure_ascii=False).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: object) -> None:
+            logging.debug("Health server: " + format, *args)
+
+    server = ThreadingHTTPServer((host, port), HealthHandler)
+    thread = threading.Thread(target=server.serve_forever, name="health-server", daemon=True)
+    thread.start()
+    logging.info("Health server listening on http://%s:%d/health", host, server.server_port)
+    return server
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional, Tuple
+from zoneinfo import ZoneInfo
+
+JST_ZONE = ZoneInfo("Asia/Tokyo")
+JST_OFFSET = timedelta(hours=9)
+JST_FIXED = timezone(JST_OFFSET, "JST")
+DAY_SECONDS = 86400
+# Japan has kept a fixed +09:00 offset (no DST) since 1951; earlier instants go
+# through the tz database. Mirrors workers/src/date_utils.ts.
+JST_FIXED_OFFSET_SINCE = datetime(1952, 1, 1, tzinfo=timezone.utc).timestamp()
+_JST_OFFSET_SECONDS = int(JST_OFFSET.total_seconds())
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def jst_date_from_epoch_seconds(epoch_seconds: float) -> str:
+    if epoch_seconds < JST_FIXED_OFFSET_SINCE:
+        return datetime.fromtimestamp(epoch_seconds, JST_ZONE).strftime("%Y-%m-%d")
+    days = int((epoch_seconds + _JST_OFFSET_SECONDS) // DAY_SECONDS)
+    return date.fromordinal(_EPOCH_ORDINAL + days).isoformat()
+
+
+def jst_date_from_iso(value: Optional[str]) -> Optional[str]:
+    # Same contract as getJstDateStringFromDateTime in the Worker: a date-only
+    # value is that day, a naive datetime is UTC, unparsable input is None.
+    if not value:
+        return None
+    if len(value) == 10:
+        try:
+            return date.fromisoformat(value).isoformat()
+        except ValueError:
+            return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    offset = parsed.utcoffset()
+    if offset == JST_OFFSET:
+        return parsed.date().isoformat()
+    if offset is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return jst_date_from_epoch_seconds(parsed.timestamp())
+
+
+def add_days(target_date: str, days: int) -> str:
+    return (date.fromisoformat(target_date) + timedelta(days=days)).isoformat()
+
+
+def jst_day_range(target_date: str) -> Tuple[str, str]:
+    start = f"{target_date}T00:00:00+09:00"
+    end = f"{add_days(target_date, 1)}T00:00:00+09:00"
+    return start, end
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import contextlib
+import cProfile
+import io
+import json
+import logging
+import pstats
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Iterator, Optional
+
+TOP_FUNCTIONS = 40
+TOP_ALLOCATIONS = 25
+TRACEMALLOC_FRAMES = 10
+
+
+def _write_cpu_report(profiler: cProfile.Profile, path: Path) -> None:
+    buffer = io.StringIO()
+    for sort_key in ("cumulative", "tottime"):
+        buffer.write(f"===== sorted by {sort_key} (top {TOP_FUNCTIONS}) =====\n")
+        stats = pstats.Stats(profiler, stream=buffer)
+        stats.strip_dirs().sort_stats(sort_key).print_stats(TOP_FUNCTIONS)
+    path.write_text(buffer.getvalue(), encoding="utf-8")
+
+
+def _write_memory_report(
+    snapshot: tracemalloc.Snapshot, peak_bytes: int, path: Path
+) -> None:
+    snapshot = snapshot.filter_traces(
+        (
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        )
+    )
+    lines = [f"Peak traced memory: {peak_bytes / 1024:.1f} KiB", ""]
+    lines.append(f"===== top {TOP_ALLOCATIONS} allocation sites live at phase end (by line) =====")
+    for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]:
+        lines.append(str(stat))
+    lines.append("")
+    lines.append("===== top 5 live allocation tracebacks =====")
+    for index, stat in enumerate(snapshot.statistics("traceback")[:5], start=1):
+        lines.append(f"#{index}: {stat.count} blocks, {stat.size / 1024:.1f} KiB")
+        lines.extend(f"    {line}" for line in stat.traceback.format())
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+@contextlib.contextmanager
+def profile_phase(output_dir: Path, phase: str) -> Iterator[None]:
+    # Wall time minus CPU time is roughly the time spent waiting on the network.
+    output_dir.mkdir(parents=True, exist_ok=True)
+    started_tracemalloc = not tracemalloc.is_tracing()
+    if started_tracemalloc:
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+    tracemalloc.reset_peak()
+    profiler = cProfile.Profile()
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        wall_sec = time.perf_counter() - wall_start
+        cpu_sec = time.process_time() - cpu_start
+        snapshot = tracemalloc.take_snapshot()
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        if started_tracemalloc:
+            tracemalloc.stop()
+
+        profiler.dump_stats(str(output_dir / f"{phase}.pstats"))
+        _write_cpu_report(profiler, output_dir / f"{phase}_cpu.txt")
+        _write_memory_report(snapshot, peak_bytes, output_dir / f"{phase}_memory.txt")
+        summary = {
+            "phase": phase,
+            "wall_sec": round(wall_sec, 4),
+            "cpu_sec": round(cpu_sec, 4),
+            "wait_sec": round(max(wall_sec - cpu_sec, 0.0), 4),
+            "peak_memory_kib": round(peak_bytes / 1024, 1),
+        }
+        (output_dir / f"{phase}_summary.json").write_text(
+            json.dumps(summary, indent=2) + "\n", encoding="utf-8"
+        )
+        logging.info(
+            "Profile written: phase=%s wall=%.3fs cpu=%.3fs peak=%.1fKiB dir=%s",
+            phase,
+            wall_sec,
+            cpu_sec,
+            peak_bytes / 1024,
+            output_dir,
+        )
+
+
+def maybe_profile_phase(
+    output_dir: Optional[Path], phase: str
+) -> contextlib.AbstractContextManager[None]:
+    if output_dir is None:
+        return contextlib.nullcontext()
+    return profile_phase(output_dir, phase)
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+# Compaction rewrites the file with one line per (phase, target_date, step) once
+# superseded lines outnumber live ones, and drops dates older than the retention.
+COMPACT_MIN_LINES = 200
+RETENTION_DAYS = 30
+
+JournalKey = Tuple[str, str, str]
+
+
+@dataclass(frozen=True)
+class JournalEntry:
+    phase: str
+    target_date: str
+    step: str
+    recorded_at: str
+    data: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def key(self) -> JournalKey:
+        return (self.phase, self.target_date, self.step)
+
+
+def _encode(entry: JournalEntry) -> bytes:
+    return (json.dumps(asdict(entry), ensure_ascii=False, sort_keys=True) + "\n").encode("utf-8")
+
+
+class RunJournal:
+    def __init__(self, path: Path, *, retention_days: int = RETENTION_DAYS) -> None:
+        self.path = path
+        self.retention_days = retention_days
+        self._lock = threading.Lock()
+        self._entries: Dict[JournalKey, JournalEntry] = {}
+        self._line_count = 0
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        content = self.path.read_bytes()
+        complete_length = content.rfind(b"\n") + 1
+        if complete_length < len(content):
+            # A crash mid-append leaves a torn last line. It never recorded a
+            # completed step; cut it off so the next append starts a fresh line.
+            logging.warning("Run journal: dropping torn last line. path=%s", self.path)
+            with self.path.open("r+b") as handle:
+                handle.truncate(complete_length)
+        for line in content[:complete_length].decode("utf-8").splitlines():
+            self._line_count += 1
+            try:
+                entry = JournalEntry(**json.loads(line))
+            except (ValueError, TypeError):
+                logging.warning("Run journal: skipping unreadable line. path=%s", self.path)
+                continue
+            self._entries[entry.key] = entry
+
+    def get(self, phase: str, target_date: str, step: str) -> Optional[JournalEntry]:
+        with self._lock:
+            return self._entries.get((phase, target_date, step))
+
+    def record(self, phase: str, target_date: str, step: str, **data: Any) -> JournalEntry:
+        entry = JournalEntry(
+            phase=phase,
+            target_date=target_date,
+            step=step,
+            recorded_at=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            data=data,
+        )
+        with self._lock:
+            self._append(_encode(entry))
+            self._entries[entry.key] = entry
+            self._line_count += 1
+            if self._line_count >= COMPACT_MIN_LINES and self._line_count > 2 * len(
+                self._entries
+            ):
+                self._compact()
+        return entry
+
+    def compact(self) -> None:
+        with self._lock:
+            self._compact()
+
+    def _append(self, line: bytes) -> None:
+        # One O_APPEND write per entry, flushed before the step counts as done.
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _compact(self) -> None:
+        if self._entries:
+            newest = max(date.fromisoformat(key[1]) for key in self._entries)
+            cutoff = (newest - timedelta(days=self.retention_days)).isoformat()
+            self._entries = {
+                key: entry for key, entry in self._entries.items() if key[1] >= cutoff
+            }
+        tmp_path = self.path.with_name(f"{self.path.name}.tmp")
+        with tmp_path.open("wb") as handle:
+            for entry in sorted(self._entries.values(), key=lambda item: item.key):
+                handle.write(_encode(entry))
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_path, self.path)
+        logging.info(
+            "Run journal compacted. lines=%d->%d path=%s",
+            self._line_count,
+            len(self._entries),
+            self.path,
+        )
+        self._line_count = len(self._entries)
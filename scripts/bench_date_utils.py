@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from datetime import datetime, timezone
+
+from runtime.date_utils import JST_ZONE, jst_date_from_epoch_seconds, jst_date_from_iso
+
+
+def reference_jst_date(epoch_seconds: float) -> str:
+    return datetime.fromtimestamp(epoch_seconds, JST_ZONE).strftime("%Y-%m-%d")
+
+
+def reference_jst_date_from_iso(value: str) -> str:
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return parsed.astimezone(JST_ZONE).strftime("%Y-%m-%d")
+
+
+def timed(label: str, func, values) -> list:
+    started = time.perf_counter()
+    results = [func(value) for value in values]
+    elapsed = time.perf_counter() - started
+    print(f"{label:<28} {elapsed * 1000:8.1f} ms  ({elapsed / len(values) * 1e9:6.0f} ns/op)")
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark JST day bucketing.")
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    # 1940-2040 so the pre-1952 fallback (JST DST years) is exercised too.
+    low = datetime(1940, 1, 1, tzinfo=timezone.utc).timestamp()
+    high = datetime(2040, 1, 1, tzinfo=timezone.utc).timestamp()
+    stamps = [rng.uniform(low, high) for _ in range(args.count)]
+    iso_values = [
+        datetime.fromtimestamp(stamp, timezone.utc).isoformat(timespec="milliseconds")
+        for stamp in stamps
+    ]
+
+    print(f"timestamps={args.count}")
+    expected = timed("epoch: zoneinfo astimezone", reference_jst_date, stamps)
+    actual = timed("epoch: fixed +09:00", jst_date_from_epoch_seconds, stamps)
+    assert actual == expected, "fast path diverged from zoneinfo"
+    expected_iso = timed("iso: zoneinfo astimezone", reference_jst_date_from_iso, iso_values)
+    actual_iso = timed("iso: jst_date_from_iso", jst_date_from_iso, iso_values)
+    assert actual_iso == expected_iso, "jst_date_from_iso diverged from zoneinfo"
+    print("OK: identical JST dates")
+
+
+if __name__ == "__main__":
+    main()
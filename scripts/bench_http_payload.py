@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+import ingest.http_client as http_client
+
+
+def build_payload(items: int) -> Dict[str, Any]:
+    done_items = [
+        {"title": f"タスク {index}: 週次レビューの資料をまとめる", "priority": "High"}
+        for index in range(items)
+    ]
+    data_json = {
+        "sources": ["tasks"],
+        "summary": {
+            "done_items": done_items,
+            "drop_items": [],
+            "progress_line": f"昨日の前進：Done {items}件 / Drop 0件",
+        },
+        "raw": {"tasks": {"done": done_items, "drop": []}},
+    }
+    return {
+        "target_date": "2026-01-22",
+        "title": "Daily Log｜2026-01-22",
+        "summary_text": "\n".join(f"- {item['title']}" for item in done_items),
+        "mail_id": "bench",
+        "source": "automation",
+        "data_json": data_json,
+    }
+
+
+def timed(func: Callable[[], Any], repeat: int) -> Tuple[Any, float]:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return result, (time.perf_counter() - started) / repeat * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare bytes on the wire and encode/decode time of upsert bodies."
+    )
+    parser.add_argument("--items", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    payload = build_payload(args.items)
+
+    def encode_previous() -> Tuple[bytes, Dict[str, str]]:
+        # Before: data_json dumped to a string, then the whole body dumped
+        # again by requests' json= (ASCII escapes, default separators).
+        body = {**payload, "data_json": json.dumps(payload["data_json"], ensure_ascii=False)}
+        return json.dumps(body).encode("utf-8"), {}
+
+    rows: List[Tuple[str, int, float, float]] = []
+    variants = [
+        ("data_json string, json=", None),
+        ("data_json object", None),
+        ("data_json object + gzip", 0),
+    ]
+    for index, (label, gzip_min_bytes) in enumerate(variants):
+        if index == 0:
+            encode = encode_previous
+        else:
+            if gzip_min_bytes is None:
+                http_client.disable_request_compression()
+            else:
+                http_client.enable_request_compression(gzip_min_bytes)
+            encode = lambda: http_client.encode_json_body(payload)
+        (body, headers), encode_ms = timed(encode, args.repeat)
+
+        def decode() -> Dict[str, Any]:
+            raw = gzip.decompress(body) if headers.get("Content-Encoding") == "gzip" else body
+            decoded = json.loads(raw)
+            if isinstance(decoded["data_json"], str):
+                decoded["data_json"] = json.loads(decoded["data_json"])
+            return decoded
+
+        decoded, decode_ms = timed(decode, args.repeat)
+        assert decoded == payload
+        rows.append((label, len(body), encode_ms, decode_ms))
+    http_client.disable_request_compression()
+
+    print(f"items={args.items} repeat={args.repeat}")
+    print(f"{'variant':<26} {'bytes':>10} {'encode ms':>10} {'decode ms':>10}")
+    for label, size, encode_ms, decode_ms in rows:
+        print(f"{label:<26} {size:>10} {encode_ms:>10.2f} {decode_ms:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
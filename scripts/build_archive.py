@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from publish.archive import build_archive
+from scripts.daily_job import JST, build_worker_url, get_target_date
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Render Daily_Log pages into a static HTML archive."
+    )
+    parser.add_argument("--start", help="First date (YYYY-MM-DD, default: 30 days ago).")
+    parser.add_argument("--end", help="Last date (YYYY-MM-DD, default: JST yesterday).")
+    parser.add_argument(
+        "--output",
+        default=str(REPO_ROOT / "archive"),
+        help="Output directory (default: ./archive).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Render processes (default: number of CPUs).",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-render every date even if its content hash is unchanged.",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+
+    daily_log_upsert_url = os.getenv("DAILY_LOG_UPSERT_URL", "")
+    if not daily_log_upsert_url:
+        raise RuntimeError("Missing env var: DAILY_LOG_UPSERT_URL")
+
+    end_date = args.end or get_target_date()
+    start_date = args.start or (
+        datetime.now(JST) - timedelta(days=30)
+    ).strftime("%Y-%m-%d")
+
+    build_archive(
+        daily_log_range_url=build_worker_url(
+            daily_log_upsert_url, "/api/daily_log/range"
+        ),
+        bearer_token=os.getenv("WORKERS_BEARER_TOKEN"),
+        start_date=start_date,
+        end_date=end_date,
+        output_dir=Path(args.output),
+        max_workers=args.workers,
+        force=args.force,
+    )
+
+
+if __name__ == "__main__":
+    main()
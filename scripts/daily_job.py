@@ -3,11 +3,12 @@ from __future__ import annotations
 import argparse
 import logging
 import os
+import signal
 import sys
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from urllib.parse import urlparse
 from zoneinfo import ZoneInfo
 
@@ -16,12 +17,35 @@ if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
 from ingest.ensure_daily_log_page import ensure_daily_log_page
-from ingest.ingest_sources import ingest_sources
+from ingest.http_client import (
+    close_session,
+    enable_adaptive_concurrency,
+    enable_hedging,
+    enable_request_compression,
+    log_concurrency_metrics,
+    log_hedge_metrics,
+)
+from ingest.ingest_sources import ingest_sources, ingest_sources_composite
+from publish.mail_artifact import (
+    build_mail_artifact,
+    find_current_artifact,
+    save_mail_artifact,
+)
+from publish.mail_variants import (
+    build_variant_messages,
+    parse_recipient_profiles,
+    render_mail_variants,
+)
 from publish.read_daily_log import read_daily_log
-from publish.render_mail import render_mail
-from publish.send_mail import MailConfig, send_mail
+from publish.render_mail import RenderProfile, summary_content_hash
+from publish.send_mail import MailConfig, send_prebuilt_mails
+from runtime.daemon import DailyScheduler, ScheduledJob, start_health_server
+from runtime.profiling import maybe_profile_phase
+from runtime.run_journal import RunJournal
 
 JST = ZoneInfo("Asia/Tokyo")
+INGEST_SCHEDULE_JST = (1, 0)
+PUBLISH_SCHEDULE_JST = (7, 0)
 
 
 @dataclass(frozen=True)
@@ -32,8 +56,11 @@ class Config:
     tasks_closed_url: str
     daily_log_upsert_url: str
     daily_log_ensure_url: str
+    daily_log_ingest_url: str
     daily_log_read_url: str
     bearer_token: Optional[str]
+    mail_artifact_dir: Optional[Path]
+    recipient_profiles: Dict[str, RenderProfile]
 
 
 def build_worker_url(base_url: str, path: str) -> str:
@@ -62,8 +89,17 @@ def load_config(*, need_mail: bool, need_tasks: bool) -> Config:
         daily_log_ensure_url=build_worker_url(
             daily_log_upsert_url, "/execute/api/daily_log/ensure"
         ),
+        daily_log_ingest_url=build_worker_url(
+            daily_log_upsert_url, "/execute/api/daily_log/ingest"
+        ),
         daily_log_read_url=build_worker_url(daily_log_upsert_url, "/api/daily_log"),
         bearer_token=os.getenv("WORKERS_BEARER_TOKEN"),
+        mail_artifact_dir=(
+            Path(os.environ["MAIL_ARTIFACT_DIR"])
+            if os.getenv("MAIL_ARTIFACT_DIR")
+            else None
+        ),
+        recipient_profiles=parse_recipient_profiles(os.getenv("MAIL_RECIPIENT_PROFILES", "")),
     )
 
 
@@ -73,29 +109,113 @@ def get_target_date(now: Optional[datetime] = None) -> str:
     return target_date.strftime("%Y-%m-%d")
 
 
-def run_ingest(config: Config, target_date: str, run_id: str) -> None:
-    title = f"Daily Log｜{target_date}"
-    ensure_result = ensure_daily_log_page(
-        ensure_url=config.daily_log_ensure_url,
-        target_date=target_date,
-        title=title,
-        source="automation",
-        mail_id=run_id,
-        bearer_token=config.bearer_token,
-    )
+def run_ingest(
+    config: Config,
+    target_date: str,
+    run_id: str,
+    mode: str = "split",
+    journal: Optional[RunJournal] = None,
+) -> None:
+    if mode == "composite":
+        ingested = journal.get("ingest", target_date, "ingest") if journal else None
+        if ingested and ingested.data.get("run_id") == run_id:
+            logging.info(
+                "Run journal: ingest already done; skipping. target_date(JST)=%s run_id=%s",
+                target_date,
+                run_id,
+            )
+        else:
+            ingest_sources_composite(
+                target_date=target_date,
+                daily_log_ingest_url=config.daily_log_ingest_url,
+                bearer_token=config.bearer_token,
+                run_id=run_id,
+                source_label="automation",
+            )
+            if journal:
+                journal.record("ingest", target_date, "ingest", run_id=run_id)
+        prerender_mail(config, target_date, run_id)
+        return
 
-    ingest_sources(
+    ensured = journal.get("ingest", target_date, "ensure") if journal else None
+    if ensured:
+        page_id = ensured.data["page_id"]
+        logging.info(
+            "Run journal: reusing ensured page. target_date(JST)=%s page_id=%s",
+            target_date,
+            page_id,
+        )
+    else:
+        title = f"Daily Log｜{target_date}"
+        page_id = ensure_daily_log_page(
+            ensure_url=config.daily_log_ensure_url,
+            target_date=target_date,
+            title=title,
+            source="automation",
+            mail_id=run_id,
+            bearer_token=config.bearer_token,
+        ).page_id
+        if journal:
+            journal.record("ingest", target_date, "ensure", page_id=page_id)
+
+    upserted = journal.get("ingest", target_date, "upsert") if journal else None
+    result = ingest_sources(
         target_date=target_date,
-        page_id=ensure_result.page_id,
+        page_id=page_id,
         tasks_closed_url=config.tasks_closed_url,
         daily_log_upsert_url=config.daily_log_upsert_url,
         bearer_token=config.bearer_token,
         run_id=run_id,
         source_label="automation",
+        previous_payload_hash=upserted.data.get("payload_hash") if upserted else None,
     )
+    if not result.upserted:
+        logging.info(
+            "Run journal: Daily_Log payload unchanged; upsert skipped. target_date(JST)=%s",
+            target_date,
+        )
+    elif journal:
+        journal.record(
+            "ingest", target_date, "upsert", page_id=page_id, payload_hash=result.payload_hash
+        )
+    prerender_mail(config, target_date, run_id)
+
 
+def prerender_mail(config: Config, target_date: str, run_id: str) -> None:
+    if not config.mail_artifact_dir:
+        return
+    if not config.mail_from or not config.mail_to:
+        logging.info("MAIL_FROM/MAIL_TO not set; skipping mail pre-render.")
+        return
+    # The artifact is an optimization for Phase B; failing here must not fail ingest.
+    try:
+        summary = read_daily_log(
+            daily_log_read_url=config.daily_log_read_url,
+            target_date=target_date,
+            bearer_token=config.bearer_token,
+        )
+        if not summary:
+            return
+        artifact = build_mail_artifact(
+            summary,
+            mail_from=config.mail_from,
+            mail_to=config.mail_to,
+            recipient_profiles=config.recipient_profiles,
+        )
+        path = save_mail_artifact(config.mail_artifact_dir, artifact)
+    except Exception:
+        logging.exception(
+            "Failed to pre-render mail; Phase B will render it. target_date(JST)=%s run_id=%s",
+            target_date,
+            run_id,
+        )
+        return
+    logging.info("Pre-rendered mail artifact saved. path=%s", path)
 
-def run_publish(config: Config, target_date: str, run_id: str) -> None:
+
+def run_publish(
+    config: Config, target_date: str, run_id: str, journal: Optional[RunJournal] = None
+) -> None:
     summary = read_daily_log(
         daily_log_read_url=config.daily_log_read_url,
         target_date=target_date,
@@ -109,13 +229,140 @@ def run_publish(config: Config, target_date: str, run_id: str) -> None:
         )
         return
 
-    mail = render_mail(summary)
+    # Only recipients the SMTP server accepted are journaled, so a rerun
+    # sends to the rest. Entries without "recipients" predate that and are
+    # ignored.
+    sent = journal.get("publish", target_date, "mail_sent") if journal else None
+    already_delivered = (
+        set(sent.data.get("recipients", []))
+        if sent and sent.data.get("mail_id") == summary.mail_id
+        else set()
+    )
+    if already_delivered and already_delivered.issuperset(config.mail_to):
+        logging.info(
+            "Run journal: mail already sent; skipping. target_date(JST)=%s mail_id=%s",
+            target_date,
+            summary.mail_id,
+        )
+        return
+
     mail_config = MailConfig(
         mail_from=config.mail_from,
         mail_to=config.mail_to,
         gmail_app_password=config.gmail_app_password,
+        recipient_profiles=config.recipient_profiles,
+    )
+    artifact = None
+    if config.mail_artifact_dir:
+        artifact = find_current_artifact(
+            config.mail_artifact_dir,
+            summary,
+            mail_from=config.mail_from,
+            mail_to=config.mail_to,
+            recipient_profiles=config.recipient_profiles,
+        )
+        if not artifact:
+            logging.info(
+                "No current mail artifact; rendering mail. target_date(JST)=%s", target_date
+            )
+
+    if artifact:
+        logging.info(
+            "Sending pre-rendered mail artifact. target_date(JST)=%s hash=%s",
+            target_date,
+            artifact.content_hash,
+        )
+        messages = artifact.to_messages()
+    else:
+        variants = render_mail_variants(summary, config.mail_to, config.recipient_profiles)
+        logging.info(
+            "Rendered mail variants. recipients=%d variants=%d",
+            len(config.mail_to),
+            len(variants),
+        )
+        messages = build_variant_messages(config.mail_from, variants)
+
+    pending: List[Tuple[List[str], str]] = []
+    for mail_to, raw_message in messages:
+        remaining = [address for address in mail_to if address not in already_delivered]
+        if remaining:
+            pending.append((remaining, raw_message))
+    if already_delivered:
+        logging.info(
+            "Run journal: resending to undelivered recipients only. target_date(JST)=%s "
+            "delivered=%d",
+            target_date,
+            len(already_delivered),
+        )
+    delivered = send_prebuilt_mails(mail_config, pending)
+    undelivered = sorted(
+        {address for mail_to, _ in pending for address in mail_to} - set(delivered)
     )
-    send_mail(mail_config, mail.subject, mail.plain_text, mail.html_body)
+    if undelivered:
+        logging.error(
+            "Mail not delivered; a rerun will retry. target_date(JST)=%s recipients=%s",
+            target_date,
+            ", ".join(undelivered),
+        )
+    if journal and delivered:
+        journal.record(
+            "publish",
+            target_date,
+            "mail_sent",
+            mail_id=summary.mail_id,
+            content_hash=summary_content_hash(summary),
+            recipients=sorted(already_delivered | set(delivered)),
+        )
+
+
+def run_daemon(args: argparse.Namespace, config: Config) -> None:
+    if not config.mail_artifact_dir:
+        config = replace(config, mail_artifact_dir=REPO_ROOT / ".mail_artifacts")
+    journal = RunJournal(args.run_journal or REPO_ROOT / ".run_journal.jsonl")
+
+    def scheduled(phase: str) -> None:
+        run_id = f"daemon-{datetime.now(JST).strftime('%Y%m%dT%H%M%S')}"
+        target_date = get_target_date()
+        logging.info(
+            "Starting scheduled run. phase=%s target_date(JST)=%s run_id=%s",
+            phase,
+            target_date,
+            run_id,
+        )
+        with maybe_profile_phase(args.profile, f"{phase}-{run_id}"):
+            if phase == "ingest":
+                run_ingest(config, target_date, run_id, args.ingest_mode, journal)
+            else:
+                run_publish(config, target_date, run_id, journal)
+        log_hedge_metrics()
+        log_concurrency_metrics()
+
+    jobs = []
+    if args.phase in ("ingest", "all"):
+        jobs.append(ScheduledJob("ingest", *INGEST_SCHEDULE_JST, lambda: scheduled("ingest")))
+    if args.phase in ("publish", "all"):
+        jobs.append(
+            ScheduledJob("publish", *PUBLISH_SCHEDULE_JST, lambda: scheduled("publish"))
+        )
+
+    scheduler = DailyScheduler(jobs)
+    server = start_health_server(scheduler, args.health_host, args.health_port)
+
+    def handle_signal(signum: int, _frame: object) -> None:
+        logging.info("Received signal %s; stopping daemon.", signum)
+        scheduler.stop()
+
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, handle_signal)
+    for job in jobs:
+        logging.info(
+            "Daemon scheduled job=%s next_run=%s", job.name, scheduler.statuses[job.name].next_run
+        )
+    try:
+        scheduler.run_forever()
+    finally:
+        server.shutdown()
+        close_session()
 
 
 def parse_args() -> argparse.Namespace:
@@ -126,6 +373,83 @@ def parse_args() -> argparse.Namespace:
         default="all",
         help="Phase to run (default: all).",
     )
+    parser.add_argument(
+        "--ingest-mode",
+        choices=("split", "composite"),
+        default="split",
+        help=(
+            "split: ensure/fetch/upsert as separate Worker calls; "
+            "composite: one call to /execute/api/daily_log/ingest (default: split)."
+        ),
+    )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        default=None,
+        metavar="DIR",
+        help=(
+            "Write per-phase CPU (cProfile) and allocation (tracemalloc) reports "
+            "to DIR. Disabled by default."
+        ),
+    )
+    parser.add_argument(
+        "--run-journal",
+        type=Path,
+        default=Path(os.environ["RUN_JOURNAL_PATH"]) if os.getenv("RUN_JOURNAL_PATH") else None,
+        metavar="PATH",
+        help=(
+            "Record completed steps in a JSONL journal and skip them on reruns "
+            "(env RUN_JOURNAL_PATH). Daemon mode defaults to .run_journal.jsonl."
+        ),
+    )
+    parser.add_argument(
+        "--hedge-gets",
+        action="store_true",
+        default=os.getenv("HTTP_HEDGE_GETS", "").strip().lower() in ("1", "true", "yes", "on"),
+        help=(
+            "Send a duplicate GET when the first one is slower than the recent p95 "
+            "(env HTTP_HEDGE_GETS). Disabled by default."
+        ),
+    )
+    parser.add_argument(
+        "--adaptive-concurrency",
+        action="store_true",
+        default=os.getenv("HTTP_ADAPTIVE_CONCURRENCY", "").strip().lower()
+        in ("1", "true", "yes", "on"),
+        help=(
+            "Limit in-flight requests per host with AIMD: grow while latency is healthy, "
+            "halve on 429/5xx or latency spikes (env HTTP_ADAPTIVE_CONCURRENCY). "
+            "Disabled by default."
+        ),
+    )
+    parser.add_argument(
+        "--gzip-requests",
+        action="store_true",
+        default=os.getenv("HTTP_GZIP_REQUESTS", "").strip().lower() in ("1", "true", "yes", "on"),
+        help=(
+            "Send large POST bodies to the Worker gzip-compressed "
+            "(env HTTP_GZIP_REQUESTS). Disabled by default."
+        ),
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help=(
+            "Stay resident and run the selected phases on a JST schedule "
+            "(ingest 01:00, publish 07:00)."
+        ),
+    )
+    parser.add_argument(
+        "--health-host",
+        default=os.getenv("DAEMON_HEALTH_HOST", "127.0.0.1"),
+        help="Health endpoint bind address in daemon mode (default: 127.0.0.1).",
+    )
+    parser.add_argument(
+        "--health-port",
+        type=int,
+        default=int(os.getenv("DAEMON_HEALTH_PORT", "8787")),
+        help="Health endpoint port in daemon mode (default: 8787).",
+    )
     return parser.parse_args()
 
 
@@ -134,21 +458,40 @@ def main() -> None:
     logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
     need_ingest = args.phase in ("ingest", "all")
     need_publish = args.phase in ("publish", "all")
-    config = load_config(need_mail=need_publish, need_tasks=need_ingest)
+    config = load_config(
+        need_mail=need_publish,
+        need_tasks=need_ingest and args.ingest_mode == "split",
+    )
+    if args.hedge_gets:
+        enable_hedging()
+    if args.adaptive_concurrency:
+        enable_adaptive_concurrency()
+    if args.gzip_requests:
+        enable_request_compression()
+    if args.daemon:
+        run_daemon(args, config)
+        return
+
     run_id = os.getenv("GITHUB_RUN_ID", "local")
     target_date = get_target_date()
+    journal = RunJournal(args.run_journal) if args.run_journal else None
 
     logging.info(
-        "Starting daily job. phase=%s target_date(JST)=%s run_id=%s",
+        "Starting daily job. phase=%s ingest_mode=%s target_date(JST)=%s run_id=%s",
         args.phase,
+        args.ingest_mode,
         target_date,
         run_id,
     )
 
     if args.phase in ("ingest", "all"):
-        run_ingest(config, target_date, run_id)
+        with maybe_profile_phase(args.profile, "ingest"):
+            run_ingest(config, target_date, run_id, args.ingest_mode, journal)
     if args.phase in ("publish", "all"):
-        run_publish(config, target_date, run_id)
+        with maybe_profile_phase(args.profile, "publish"):
+            run_publish(config, target_date, run_id, journal)
+    log_hedge_metrics()
+    log_concurrency_metrics()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import json
+import tempfile
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import publish.archive as archive
+from publish.archive import build_archive_from_summaries
+from publish.read_daily_log import DailyLogSummary
+
+
+def make_summary(target_date: str, title: str, last_edited_time: str = "") -> DailyLogSummary:
+    return DailyLogSummary(
+        target_date=target_date,
+        page_id=f"page-{target_date}",
+        title=f"Daily Log｜{target_date}",
+        summary_text=f"🎉 昨日完了したこと（Done: 1）\n- {title} (Priority: High)\n",
+        summary_html="",
+        mail_id="run-1",
+        source="automation",
+        diary=None,
+        expenses_total=None,
+        location_summary=None,
+        mood=None,
+        weight=None,
+        last_edited_time=last_edited_time or None,
+    )
+
+
+def check_watermark() -> None:
+    started = datetime(2026, 2, 2, 3, 0, tzinfo=timezone.utc)
+
+    def edited_at(offset: timedelta) -> str:
+        return (started + offset).isoformat()
+
+    notion = {
+        target_date: make_summary(target_date, "Task", edited_at(timedelta(days=-1)))
+        for target_date in ("2026-01-30", "2026-01-31", "2026-02-01")
+    }
+    calls = []
+
+    def fake_read_range(*, daily_log_range_url, start_date, end_date, bearer_token, edited_since=None):
+        calls.append((start_date, end_date, edited_since))
+        return [
+            summary
+            for target_date, summary in sorted(notion.items())
+            if start_date <= target_date <= end_date
+            and (edited_since is None or summary.last_edited_time >= edited_since)
+        ]
+
+    original_read_range = archive.read_daily_log_range
+    archive.read_daily_log_range = fake_read_range
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            options = dict(
+                daily_log_range_url="https://worker.example/api/daily_log/range",
+                bearer_token=None,
+                output_dir=Path(tmp),
+                start_date="2026-01-01",
+                max_workers=1,
+            )
+            first = archive.build_archive(end_date="2026-02-01", now=started, **options)
+            assert calls == [("2026-01-01", "2026-02-01", None)]
+            assert len(first.rendered) == 3
+
+            # Only the page edited since the last run is fetched; dates missing
+            # from an incremental fetch are not pruned.
+            calls.clear()
+            notion["2026-01-31"] = replace(
+                notion["2026-01-31"], diary="Walk", last_edited_time=edited_at(timedelta(hours=1))
+            )
+            second = archive.build_archive(
+                end_date="2026-02-01", now=started + timedelta(hours=2), **options
+            )
+            watermark = (started - archive.WATERMARK_MARGIN).isoformat(timespec="seconds")
+            assert calls == [("2026-01-01", "2026-02-01", watermark)]
+            assert second.rendered == ["2026-01-31"]
+            assert second.removed == [] and second.unchanged == []
+
+            # A new day past the covered range is fetched in full.
+            calls.clear()
+            notion["2026-02-02"] = make_summary("2026-02-02", "New", edited_at(timedelta(hours=3)))
+            third = archive.build_archive(
+                end_date="2026-02-02", now=started + timedelta(days=1), **options
+            )
+            assert calls[-1] == ("2026-02-02", "2026-02-02", None)
+            assert calls[0][:2] == ("2026-01-01", "2026-02-01") and calls[0][2]
+            assert third.rendered == ["2026-02-02"]
+
+            # Deletions only show up in a full fetch, which runs periodically.
+            calls.clear()
+            del notion["2026-01-30"]
+            fourth = archive.build_archive(
+                end_date="2026-02-02",
+                now=started + archive.FULL_SYNC_INTERVAL + timedelta(hours=1),
+                **options,
+            )
+            assert calls == [("2026-01-01", "2026-02-02", None)]
+            assert fourth.removed == ["2026-01-30"]
+            assert fourth.rendered == []
+    finally:
+        archive.read_daily_log_range = original_read_range
+
+
+def main() -> None:
+    summaries = [
+        make_summary("2026-01-30", "Write report"),
+        make_summary("2026-01-31", "Review PR"),
+        make_summary("2026-02-01", "Ship release"),
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        output_dir = Path(tmp)
+        options = dict(
+            output_dir=output_dir,
+            start_date="2026-01-01",
+            end_date="2026-02-28",
+            max_workers=2,
+        )
+
+        first = build_archive_from_summaries(summaries, **options)
+        assert first.rendered == ["2026-01-30", "2026-01-31", "2026-02-01"]
+        assert (output_dir / "2026" / "01" / "31.html").exists()
+        assert "2026/02/index.html" in (output_dir / "index.html").read_text(
+            encoding="utf-8"
+        )
+
+        second = build_archive_from_summaries(summaries, **options)
+        assert second.rendered == [], "Unchanged dates must not be re-rendered."
+        assert len(second.unchanged) == 3
+
+        edited = [
+            summaries[0],
+            replace(summaries[1], diary="Went for a walk"),
+        ]
+        third = build_archive_from_summaries(edited, **options)
+        assert third.rendered == ["2026-01-31"]
+        assert third.removed == ["2026-02-01"]
+        assert not (output_dir / "2026" / "02" / "01.html").exists()
+        assert not (output_dir / "2026" / "02" / "index.html").exists()
+        assert "Went for a walk" in (output_dir / "2026" / "01" / "31.html").read_text(
+            encoding="utf-8"
+        )
+
+        manifest = json.loads((output_dir / "manifest.json").read_text(encoding="utf-8"))
+        assert sorted(manifest["entries"]) == ["2026-01-30", "2026-01-31"]
+
+    check_watermark()
+
+    print("OK: archive re-renders only changed dates and prunes removed ones")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from runtime.daemon import JST, DailyScheduler, ScheduledJob, next_run_time
+
+
+def main() -> None:
+    # 15:59 UTC is 00:59 JST: Phase A is due one minute later on the same JST day.
+    now = datetime(2026, 1, 22, 15, 59, tzinfo=timezone.utc)
+    assert next_run_time(now, 1, 0) == datetime(2026, 1, 23, 1, 0, tzinfo=JST)
+    assert next_run_time(now, 7, 0) == datetime(2026, 1, 23, 7, 0, tzinfo=JST)
+
+    # Exactly at the scheduled minute the next run is the following day.
+    at_due = datetime(2026, 1, 23, 1, 0, tzinfo=JST)
+    assert next_run_time(at_due, 1, 0) == datetime(2026, 1, 24, 1, 0, tzinfo=JST)
+
+    def failing() -> None:
+        raise RuntimeError("worker unavailable")
+
+    calls = []
+    scheduler = DailyScheduler(
+        [
+            ScheduledJob("ingest", 1, 0, lambda: calls.append("ingest")),
+            ScheduledJob("publish", 7, 0, failing),
+        ],
+        clock=lambda: now,
+    )
+    scheduler.run_job(scheduler.jobs[0])
+    scheduler.run_job(scheduler.jobs[1])
+    snapshot = scheduler.snapshot()
+    assert calls == ["ingest"]
+    assert snapshot["status"] == "degraded"
+    assert snapshot["jobs"]["ingest"]["last_success"] is True
+    assert snapshot["jobs"]["publish"]["last_error"] == "RuntimeError: worker unavailable"
+    assert snapshot["jobs"]["publish"]["failure_count"] == 1
+
+    print("OK: JST schedule and job status tracking")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import json
+import threading
+
+import requests as requests_lib
+
+import ingest.daily_log_upsert as daily_log_upsert
+import ingest.http_client as http_client
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, payload: dict, headers: dict) -> None:
+        self.status_code = status_code
+        self.content = json.dumps(payload).encode("utf-8")
+        self.headers = headers
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests_lib.HTTPError(f"{self.status_code}", response=self)
+
+    def json(self) -> dict:
+        return json.loads(self.content)
+
+
+class ThrottlingSession:
+    # Answers the first request for the chunk starting at throttled_date with
+    # 429, and every other request with per-item results.
+    def __init__(self, throttled_date: str) -> None:
+        self.throttled_date = throttled_date
+        self.lock = threading.Lock()
+        self.sent: list = []
+
+    def post(self, url, headers, data, timeout):
+        items = json.loads(data)["items"]
+        first = items[0]["target_date"]
+        with self.lock:
+            self.sent.append(first)
+            throttle = first == self.throttled_date and self.sent.count(first) == 1
+        if throttle:
+            return FakeResponse(429, {"error": "rate limited"}, {"Retry-After": "0"})
+        results = [
+            {"index": index, "target_date": item["target_date"], "ok": True}
+            for index, item in enumerate(items)
+        ]
+        return FakeResponse(200, {"results": results, "upserted": len(items), "failed": 0}, {})
+
+
+def check_throttled_chunk_is_retried() -> None:
+    session = ThrottlingSession("2026-01-05")
+    original_get_session = http_client.get_session
+    http_client.get_session = lambda: session
+    http_client.enable_adaptive_concurrency()
+    try:
+        payloads = [{"target_date": f"2026-01-{day:02d}"} for day in range(1, 13)]
+        results = daily_log_upsert.upsert_daily_logs(
+            "https://worker.example/execute/api/daily_log/upsert_bulk",
+            payloads,
+            "token",
+            chunk_size=4,
+            max_parallel=3,
+        )
+        (metrics,) = http_client.get_concurrency_metrics()
+    finally:
+        http_client.disable_adaptive_concurrency()
+        http_client.get_session = original_get_session
+
+    assert [result["target_date"] for result in results] == [p["target_date"] for p in payloads]
+    assert sorted(session.sent) == ["2026-01-01", "2026-01-05", "2026-01-05", "2026-01-09"]
+    # The resend went through the limiter again and the 429 cut its limit.
+    assert metrics.requests == 4
+    assert metrics.throttled == 1
+    assert metrics.decreases == 1
+
+    # A chunk that stays throttled fails once the attempts run out.
+    session = ThrottlingSession("2026-01-01")
+    session.post = lambda url, headers, data, timeout: FakeResponse(
+        503, {"error": "unavailable"}, {"Retry-After": "0"}
+    )
+    http_client.get_session = lambda: session
+    try:
+        daily_log_upsert.upsert_daily_logs(
+            "https://worker.example/execute/api/daily_log/upsert_bulk",
+            payloads[:2],
+            None,
+            retry=daily_log_upsert.UpsertRetryPolicy(max_attempts=2),
+        )
+    except requests_lib.HTTPError as error:
+        assert error.response.status_code == 503
+    else:
+        raise AssertionError("A chunk that keeps failing must raise.")
+    finally:
+        http_client.get_session = original_get_session
+
+
+def main() -> None:
+    requests = []
+
+    def fake_post_json(url, payload, bearer_token):
+        requests.append((url, [item["target_date"] for item in payload["items"]]))
+        results = [
+            {"index": index, "target_date": item["target_date"], "ok": item["target_date"] != "bad"}
+            for index, item in enumerate(payload["items"])
+        ]
+        failed = sum(1 for result in results if not result["ok"])
+        return {"results": results, "upserted": len(results) - failed, "failed": failed}
+
+    original_post_json = daily_log_upsert.post_json
+    daily_log_upsert.post_json = fake_post_json
+    try:
+        payloads = [{"target_date": f"2026-01-{day:02d}"} for day in range(1, 6)]
+        payloads.insert(3, {"target_date": "bad"})
+        results = daily_log_upsert.upsert_daily_logs(
+            "https://worker.example/execute/api/daily_log/upsert_bulk",
+            payloads,
+            "token",
+            chunk_size=4,
+        )
+    finally:
+        daily_log_upsert.post_json = original_post_json
+
+    # Large inputs are split; result indexes point back into the full input.
+    assert [len(dates) for _, dates in requests] == [4, 2]
+    assert [result["index"] for result in results] == list(range(6))
+    assert [result["target_date"] for result in results] == [p["target_date"] for p in payloads]
+    assert [result["index"] for result in results if not result["ok"]] == [3]
+
+    try:
+        daily_log_upsert.upsert_daily_logs("https://worker.example", payloads, None, chunk_size=0)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("chunk_size must be positive.")
+
+    check_throttled_chunk_is_retried()
+
+    print("OK: bulk Daily_Log upsert is chunked, retries throttled chunks and keeps input order")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,8 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import datetime, timedelta
-from zoneinfo import ZoneInfo
 
-JST = ZoneInfo("Asia/Tokyo")
+from runtime.date_utils import jst_date_from_epoch_seconds, jst_date_from_iso, jst_day_range
 
 
 @dataclass
@@ -14,61 +12,58 @@ class Task:
     drop_date: str | None = None
 
 
-def build_jst_range(target_date: str) -> tuple[str, str]:
-    start = f"{target_date}T00:00:00+09:00"
-    next_date = datetime.fromisoformat(start).astimezone(JST) + timedelta(days=1)
-    end = next_date.strftime("%Y-%m-%dT00:00:00+09:00")
-    return start, end
-
-
-def filter_done(tasks: list[Task], start: str, end: str) -> list[Task]:
-    start_dt = datetime.fromisoformat(start)
-    end_dt = datetime.fromisoformat(end)
-    filtered: list[Task] = []
-    for task in tasks:
-        if task.status != "Done" or not task.done_date:
-            continue
-        done_dt = datetime.fromisoformat(task.done_date)
-        if start_dt <= done_dt < end_dt:
-            filtered.append(task)
-    return filtered
+def filter_done(tasks: list[Task], target_date: str) -> list[Task]:
+    return [
+        task
+        for task in tasks
+        if task.status == "Done" and jst_date_from_iso(task.done_date) == target_date
+    ]
 
 
-def filter_drop(tasks: list[Task], start: str, end: str) -> list[Task]:
-    start_dt = datetime.fromisoformat(start)
-    end_dt = datetime.fromisoformat(end)
-    filtered: list[Task] = []
-    for task in tasks:
-        if task.status != "Drop" or not task.drop_date:
-            continue
-        drop_dt = datetime.fromisoformat(task.drop_date)
-        if start_dt <= drop_dt < end_dt:
-            filtered.append(task)
-    return filtered
+def filter_drop(tasks: list[Task], target_date: str) -> list[Task]:
+    return [
+        task
+        for task in tasks
+        if task.status == "Drop" and jst_date_from_iso(task.drop_date) == target_date
+    ]
 
 
 def main() -> None:
     target_date = "2026-01-23"
-    start_jst, end_jst = build_jst_range("2026-01-22")
+    start_jst, end_jst = jst_day_range("2026-01-22")
     assert start_jst == "2026-01-22T00:00:00+09:00"
     assert end_jst == "2026-01-23T00:00:00+09:00"
 
     tasks = [
         Task(status="Done", done_date="2026-01-22T09:00:00+09:00"),
         Task(status="Done", done_date="2026-01-16T09:00:00+09:00"),
+        Task(status="Done", done_date="2026-01-21T15:00:00.000Z"),
+        Task(status="Done", done_date="2026-01-21T14:59:59.999Z"),
         Task(status="Done", done_date=None),
         Task(status="Drop", drop_date="2026-01-22T10:00:00+09:00"),
         Task(status="Drop", drop_date=None),
     ]
 
-    done = filter_done(tasks, start_jst, end_jst)
-    drop = filter_drop(tasks, start_jst, end_jst)
+    done = filter_done(tasks, "2026-01-22")
+    drop = filter_drop(tasks, "2026-01-22")
 
-    assert len(done) == 1, "Only 2026-01-22 Done should be included."
+    assert len(done) == 2, "Only 2026-01-22 (JST) Done should be included."
     assert len(drop) == 1, "Only 2026-01-22 Drop should be included."
-    assert done[0].done_date == "2026-01-22T09:00:00+09:00"
+    assert [task.done_date for task in done] == [
+        "2026-01-22T09:00:00+09:00",
+        "2026-01-21T15:00:00.000Z",
+    ]
     assert drop[0].drop_date == "2026-01-22T10:00:00+09:00"
 
+    # Date-only, naive (UTC, as in the Worker) and pre-1952 values.
+    assert jst_date_from_iso("2026-01-22") == "2026-01-22"
+    assert jst_date_from_iso("2026-01-21T16:00:00") == "2026-01-22"
+    assert jst_date_from_iso("not a date") is None
+    assert jst_day_range("2025-12-31")[1] == "2026-01-01T00:00:00+09:00"
+    # 1950-06-15 was under DST (+10:00), so 14:30 UTC is already the 16th.
+    assert jst_date_from_iso("1950-06-15T14:30:00Z") == "1950-06-16"
+    assert jst_date_from_epoch_seconds(0) == "1970-01-01"
+
     print(
         "OK: target_date=2026-01-23 range=2026-01-22T00:00:00+09:00..2026-01-23T00:00:00+09:00"
     )
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from dataclasses import FrozenInstanceError
+
+import connectors.tasks as tasks_module
+import ingest.ingest_sources as ingest_sources_module
+import publish.digest as digest_module
+from publish.mail_variants import parse_recipient_profiles, render_mail_variants
+from publish.read_daily_log import DailyLogSummary
+from publish.render_mail import build_summary_digest
+
+
+def main() -> None:
+    summary = DailyLogSummary(
+        target_date="2026-01-22",
+        page_id="page-1",
+        title="Daily Log｜2026-01-22",
+        summary_text=(
+            "🎉 昨日完了したこと（Done: 2）\n"
+            "- Write report (Priority: High)\n"
+            "- Tidy desk\n"
+        ),
+        summary_html="",
+        mail_id="run-1",
+        source="automation",
+        diary="  ",
+        expenses_total=1200.0,
+        location_summary=None,
+        mood="Good",
+        weight=None,
+    )
+
+    builds = []
+    original_build = digest_module._build_digest
+
+    def counting_build(payload, content_hash):
+        builds.append(content_hash)
+        return original_build(payload, content_hash)
+
+    digest_module._digest_cache.clear()
+    digest_module._build_digest = counting_build
+    try:
+        digest = build_summary_digest(summary)
+        profiles = parse_recipient_profiles(
+            '{"a@example.com": {"text_only": true}, "b@example.com": {"priorities": ["High"]}}'
+        )
+        render_mail_variants(summary, ["a@example.com", "b@example.com", "c@example.com"], profiles)
+        # Three variants, HTML + text + subject each: parsed and normalized once.
+        assert len(builds) == 1
+        assert build_summary_digest(summary) is digest
+    finally:
+        digest_module._build_digest = original_build
+
+    assert [item.title for item in digest.done_items] == ["Write report", "Tidy desk"]
+    assert digest.done_items[1].priority == "-"
+    assert (digest.diary, digest.expenses_total, digest.location_summary) == ("—", "1200", "—")
+    assert not hasattr(digest, "__dict__")
+    try:
+        digest.mood = "Bad"  # type: ignore[misc]
+    except FrozenInstanceError:
+        pass
+    else:
+        raise AssertionError("DigestModel must be immutable.")
+
+    # Ingest writes connector lines verbatim; they are not re-parsed.
+    upserts = []
+    original_fetch = tasks_module.fetch_json
+    original_upsert = ingest_sources_module.upsert_daily_log
+    tasks_module.fetch_json = lambda url, token: {
+        "done": [{"page_id": "t1", "title": "Call back ", "priority": "High (urgent)"}],
+        "drop": [],
+    }
+    ingest_sources_module.upsert_daily_log = lambda url, payload, token: upserts.append(payload)
+    try:
+        ingest_sources_module.ingest_sources(
+            target_date="2026-01-22",
+            page_id="page-1",
+            tasks_closed_url="https://worker.example/api/tasks/closed",
+            daily_log_upsert_url="https://worker.example/api/daily_log/upsert",
+            bearer_token=None,
+            run_id="run-1",
+            source_label="automation",
+        )
+    finally:
+        tasks_module.fetch_json = original_fetch
+        ingest_sources_module.upsert_daily_log = original_upsert
+    assert "- Call back  (Priority: High (urgent))\n" in upserts[0]["summary_text"]
+
+    print("OK: digest model is built once per content hash and shared by renderers")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import gzip
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+import ingest.http_client as http_client
+
+
+@dataclass
+class FakeResponse:
+    content: bytes = b"{}"
+
+    def raise_for_status(self) -> None:
+        pass
+
+    def json(self) -> Dict[str, Any]:
+        return json.loads(self.content)
+
+
+@dataclass
+class FakeSession:
+    posts: List[Dict[str, Any]] = field(default_factory=list)
+
+    def post(self, url: str, **kwargs: Any) -> FakeResponse:
+        self.posts.append(kwargs)
+        return FakeResponse()
+
+
+def decode(post: Dict[str, Any]) -> Dict[str, Any]:
+    body = post["data"]
+    if post["headers"].get("Content-Encoding") == "gzip":
+        body = gzip.decompress(body)
+    return json.loads(body.decode("utf-8"))
+
+
+def main() -> None:
+    session = FakeSession()
+    original_get_session = http_client.get_session
+    http_client.get_session = lambda: session
+    small = {"target_date": "2026-01-22", "data_json": {"sources": ["tasks"]}}
+    large = {"target_date": "2026-01-22", "summary_text": "昨日の前進" * 2000, "data_json": small}
+    try:
+        # Off by default: plain UTF-8 JSON (not \u-escaped), nested data_json.
+        http_client.post_json("https://worker.example/upsert", large, "token")
+        assert "Content-Encoding" not in session.posts[0]["headers"]
+        assert "昨日の前進".encode("utf-8") in session.posts[0]["data"]
+        assert decode(session.posts[0]) == large
+
+        http_client.enable_request_compression()
+        http_client.post_json("https://worker.example/upsert", small, None)
+        http_client.post_json("https://worker.example/upsert", large, "token")
+        http_client.post_json("https://worker.example/upsert", large, "token")
+    finally:
+        http_client.disable_request_compression()
+        http_client.get_session = original_get_session
+
+    small_post, large_post, repeat_post = session.posts[1:]
+    assert "Content-Encoding" not in small_post["headers"]
+    assert large_post["headers"]["Content-Encoding"] == "gzip"
+    assert large_post["headers"]["Authorization"] == "Bearer token"
+    assert decode(large_post) == large
+    assert len(large_post["data"]) * 10 < len(session.posts[0]["data"])
+    # Identical payloads compress to identical bytes (no gzip timestamp).
+    assert large_post["data"] == repeat_post["data"]
+
+    print(
+        "OK: post_json gzips large bodies when enabled "
+        f"({len(session.posts[0]['data'])} -> {len(large_post['data'])} bytes)"
+    )
+
+
+if __name__ == "__main__":
+    main()
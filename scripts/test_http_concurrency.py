@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from ingest.concurrency import AdaptiveConcurrency, AimdLimiter, AimdPolicy
+
+
+@dataclass(frozen=True)
+class FakeResponse:
+    status_code: int
+
+
+def main() -> None:
+    # Healthy responses grow the limit by about one per full window.
+    limiter = AimdLimiter("worker.example", AimdPolicy(initial_limit=2.0, max_limit=8.0))
+    for _ in range(40):
+        limiter.run(lambda: FakeResponse(200))
+    assert limiter.current_limit() == 8
+
+    # 429 and 5xx halve it; a raised error counts as overload too.
+    limiter.run(lambda: FakeResponse(429))
+    assert limiter.current_limit() == 4
+    time.sleep(0.001)
+    limiter.run(lambda: FakeResponse(503))
+    assert limiter.current_limit() == 2
+    try:
+        limiter.run(lambda: (_ for _ in ()).throw(ConnectionError("reset")))
+    except ConnectionError:
+        pass
+    metrics = limiter.metrics()
+    assert (metrics.throttled, metrics.server_errors, metrics.decreases) == (1, 2, 3)
+    assert metrics.limit == 1 and metrics.in_flight == 0
+
+    # A response much slower than the healthy baseline is a latency spike.
+    spiky = AimdLimiter("worker.example", AimdPolicy(initial_limit=4.0))
+    for _ in range(3):
+        spiky.run(lambda: FakeResponse(200))
+    spiky.run(lambda: (time.sleep(0.1), FakeResponse(200))[1])
+    assert spiky.metrics().latency_spikes == 1
+    assert spiky.current_limit() == 2
+
+    # Against a server that throttles above 6 concurrent requests, the limit
+    # settles around that capacity and in-flight never exceeds the limit.
+    capacity = 6
+    adaptive = AdaptiveConcurrency(AimdPolicy(initial_limit=1.0, latency_spike_ratio=100.0))
+    lock = threading.Lock()
+    state = {"in_flight": 0, "peak": 0}
+
+    def server() -> FakeResponse:
+        with lock:
+            state["in_flight"] += 1
+            state["peak"] = max(state["peak"], state["in_flight"])
+            throttled = state["in_flight"] > capacity
+        time.sleep(0.002)
+        with lock:
+            state["in_flight"] -= 1
+        return FakeResponse(429 if throttled else 200)
+
+    def request(_: int) -> int:
+        return adaptive.limiter_for("https://worker.example/api/daily_log").run(server).status_code
+
+    with ThreadPoolExecutor(max_workers=24) as executor:
+        statuses = list(executor.map(request, range(1500)))
+    [metrics] = adaptive.metrics()
+    assert metrics.host == "worker.example"
+    assert capacity <= metrics.max_limit_reached <= capacity + 3
+    assert metrics.throttled > 0
+    # The AIMD sawtooth probes past capacity once per cycle; most requests pass.
+    assert statuses.count(429) < len(statuses) / 3
+    assert state["peak"] <= metrics.max_limit_reached
+
+    print(
+        "OK: AIMD limiter grows while healthy and backs off on 429/5xx/spikes "
+        f"(limit={metrics.limit} max={metrics.max_limit_reached} throttled={metrics.throttled})"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import itertools
+import threading
+import time
+
+from ingest.hedging import Hedger, HedgePolicy
+
+
+def main() -> None:
+    policy = HedgePolicy(initial_delay_sec=0.05, max_extra_ratio=0.0, burst=1)
+
+    # First attempt stalls, the duplicate answers: the hedge wins.
+    hedger = Hedger(policy)
+    attempts = itertools.count()
+    release = threading.Event()
+
+    def slow_then_fast() -> str:
+        if next(attempts) == 0:
+            release.wait(timeout=2)
+            return "primary"
+        return "hedge"
+
+    assert hedger.run(slow_then_fast) == "hedge"
+    release.set()
+    metrics = hedger.metrics()
+    assert (metrics.requests, metrics.hedges_fired, metrics.hedges_won) == (1, 1, 1)
+
+    # The burst is spent and the ratio is zero, so the next slow call is not hedged.
+    def slow() -> str:
+        time.sleep(0.1)
+        return "primary"
+
+    assert hedger.run(slow) == "primary"
+    metrics = hedger.metrics()
+    assert metrics.hedges_fired == 1
+    assert metrics.hedges_suppressed == 1
+
+    # Fast calls never hedge; the delay adapts to the observed latencies.
+    fast_hedger = Hedger(HedgePolicy(initial_delay_sec=1.0, min_samples=3, min_delay_sec=0.01))
+    for _ in range(5):
+        assert fast_hedger.run(lambda: "ok") == "ok"
+    metrics = fast_hedger.metrics()
+    assert metrics.hedges_fired == 0
+    assert metrics.current_delay_sec < 1.0
+
+    # A failed primary does not hide a successful hedge.
+    failing_hedger = Hedger(policy)
+    failing_attempts = itertools.count()
+
+    def fail_slowly_then_succeed() -> str:
+        if next(failing_attempts) == 0:
+            time.sleep(0.1)
+            raise RuntimeError("isolate timeout")
+        time.sleep(0.2)
+        return "hedge"
+
+    assert failing_hedger.run(fail_slowly_then_succeed) == "hedge"
+
+    for item in (hedger, fast_hedger, failing_hedger):
+        item.shutdown()
+    print("OK: hedged GETs fire after the adaptive delay and respect the load cap")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import tempfile
+from dataclasses import replace
+from pathlib import Path
+
+from publish.mail_artifact import (
+    build_mail_artifact,
+    find_current_artifact,
+    load_mail_artifact,
+    save_mail_artifact,
+)
+from publish.read_daily_log import DailyLogSummary
+from publish.render_mail import RenderProfile
+
+
+def main() -> None:
+    summary = DailyLogSummary(
+        target_date="2026-01-22",
+        page_id="page-1",
+        title="Daily Log｜2026-01-22",
+        summary_text="🎉 昨日完了したこと（Done: 1）\n- Write report (Priority: High)\n",
+        summary_html="",
+        mail_id="run-1",
+        source="automation",
+        diary=None,
+        expenses_total=None,
+        location_summary=None,
+        mood=None,
+        weight=None,
+        last_edited_time="2026-01-22T16:05:00.000Z",
+    )
+    mail_to = ["to@example.com"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        artifact = build_mail_artifact(summary, mail_from="from@example.com", mail_to=mail_to)
+        assert [addresses for addresses, _ in artifact.to_messages()] == [mail_to]
+        assert "multipart/alternative" in artifact.to_messages()[0][1]
+        save_mail_artifact(directory, artifact)
+
+        latest = load_mail_artifact(directory, "2026-01-22")
+        assert latest == artifact
+
+        found = find_current_artifact(
+            directory, summary, mail_from="from@example.com", mail_to=mail_to
+        )
+        assert found == artifact
+
+        edited = replace(summary, last_edited_time="2026-01-22T21:30:00.000Z")
+        assert (
+            find_current_artifact(directory, edited, mail_from="from@example.com", mail_to=mail_to)
+            is None
+        ), "An edited Daily_Log page must fall back to a full render."
+
+        changed = replace(summary, mood="Great")
+        assert (
+            find_current_artifact(directory, changed, mail_from="from@example.com", mail_to=mail_to)
+            is None
+        )
+        assert (
+            find_current_artifact(
+                directory, summary, mail_from="from@example.com", mail_to=["other@example.com"]
+            )
+            is None
+        )
+        assert (
+            find_current_artifact(
+                directory,
+                summary,
+                mail_from="from@example.com",
+                mail_to=mail_to,
+                recipient_profiles={"to@example.com": RenderProfile(text_only=True)},
+            )
+            is None
+        ), "Changing a recipient's render profile must invalidate the artifact."
+
+    print("OK: mail artifact is reused only for an unchanged Daily_Log page")
+
+
+if __name__ == "__main__":
+    main()
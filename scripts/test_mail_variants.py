@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from publish.mail_variants import (
+    build_variant_messages,
+    parse_recipient_profiles,
+    render_mail_variants,
+)
+from publish.read_daily_log import DailyLogSummary
+
+
+def main() -> None:
+    summary = DailyLogSummary(
+        target_date="2026-01-22",
+        page_id="page-1",
+        title="Daily Log｜2026-01-22",
+        summary_text=(
+            "🎉 昨日完了したこと（Done: 3）\n"
+            "- Write report (Priority: High)\n"
+            "- Tidy desk (Priority: Low)\n"
+            "- Ship release (Priority: High)\n"
+            "🧹 昨日手放したこと（Drop: 1）\n"
+            "- Old idea (Priority: Low)\n"
+        ),
+        summary_html="",
+        mail_id="run-1",
+        source="automation",
+        diary=None,
+        expenses_total=None,
+        location_summary=None,
+        mood=None,
+        weight=None,
+    )
+    profiles = parse_recipient_profiles(
+        """{
+            "boss@example.com": {"priorities": ["HIGH"], "max_task_items": 1},
+            "lead@example.com": {"priorities": ["high"], "max_task_items": 1},
+            "phone@example.com": {"text_only": true}
+        }"""
+    )
+    mail_to = [
+        "me@example.com",
+        "boss@example.com",
+        "phone@example.com",
+        "lead@example.com",
+        "team@example.com",
+    ]
+
+    variants = render_mail_variants(summary, mail_to, profiles)
+    # Identical profiles are rendered once and share a message.
+    assert [variant.mail_to for variant in variants] == [
+        ["me@example.com", "team@example.com"],
+        ["boss@example.com", "lead@example.com"],
+        ["phone@example.com"],
+    ]
+
+    full, high_only, text_only = (variant.mail for variant in variants)
+    assert "Tidy desk" in full.plain_text and "Tidy desk" in full.html_body
+    assert "Tidy desk" not in high_only.plain_text
+    assert "Write report" in high_only.plain_text
+    assert "Ship release" not in high_only.plain_text
+    assert "...and 1 more" in high_only.plain_text
+    assert text_only.html_body == ""
+
+    messages = build_variant_messages("from@example.com", variants)
+    assert "multipart/alternative" in messages[0][1]
+    assert "multipart/alternative" not in messages[2][1]
+    assert "Content-Type: text/plain" in messages[2][1]
+
+    try:
+        parse_recipient_profiles('{"me@example.com": {"max_items": 3}}')
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Unknown profile fields must be rejected.")
+
+    print("OK: per-recipient variants are deduplicated and rendered once each")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import tempfile
+from dataclasses import replace
+from pathlib import Path
+
+import runtime.run_journal as run_journal
+import scripts.daily_job as daily_job
+from ingest.ensure_daily_log_page import EnsureResult
+from ingest.ingest_sources import IngestResult
+from publish.read_daily_log import DailyLogSummary
+from runtime.run_journal import RunJournal
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "journal.jsonl"
+        journal = RunJournal(path)
+        journal.record("ingest", "2026-01-22", "ensure", page_id="page-1")
+        journal.record("ingest", "2026-01-22", "upsert", payload_hash="a")
+        journal.record("ingest", "2026-01-22", "upsert", payload_hash="b")
+
+        # A crash mid-append leaves a torn line; reloading ignores it.
+        with path.open("a", encoding="utf-8") as handle:
+            handle.write('{"phase": "publish", "target_date": "2026-')
+        reloaded = RunJournal(path)
+        assert reloaded.get("ingest", "2026-01-22", "ensure").data == {"page_id": "page-1"}
+        assert reloaded.get("ingest", "2026-01-22", "upsert").data == {"payload_hash": "b"}
+        assert reloaded.get("publish", "2026-01-22", "mail_sent") is None
+        reloaded.record("publish", "2026-01-22", "mail_sent", mail_id="run-1")
+        assert RunJournal(path).get("publish", "2026-01-22", "mail_sent").data == {
+            "mail_id": "run-1"
+        }
+
+        # Compaction keeps the latest entry per step and drops expired dates.
+        reloaded.record("ingest", "2025-11-01", "ensure", page_id="old")
+        reloaded.compact()
+        lines = path.read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 3
+        assert RunJournal(path).get("ingest", "2025-11-01", "ensure") is None
+
+        original_min_lines = run_journal.COMPACT_MIN_LINES
+        run_journal.COMPACT_MIN_LINES = 10
+        try:
+            for index in range(10):
+                reloaded.record("ingest", "2026-01-22", "upsert", payload_hash=str(index))
+        finally:
+            run_journal.COMPACT_MIN_LINES = original_min_lines
+        assert len(path.read_text(encoding="utf-8").splitlines()) <= 10
+
+        # A rerun reuses the ensured page and skips an unchanged upsert.
+        calls = []
+
+        def fake_ensure(**kwargs):
+            calls.append("ensure")
+            return EnsureResult(page_id="page-1")
+
+        def fake_ingest_sources(**kwargs):
+            calls.append(("ingest", kwargs["page_id"]))
+            upserted = kwargs["previous_payload_hash"] != "same"
+            return IngestResult("", "", ["tasks"], {}, payload_hash="same", upserted=upserted)
+
+        config = daily_job.Config(
+            mail_from="",
+            mail_to=[],
+            gmail_app_password="",
+            tasks_closed_url="",
+            daily_log_upsert_url="",
+            daily_log_ensure_url="",
+            daily_log_ingest_url="",
+            daily_log_read_url="",
+            bearer_token=None,
+            mail_artifact_dir=None,
+            recipient_profiles={},
+        )
+        originals = (daily_job.ensure_daily_log_page, daily_job.ingest_sources)
+        daily_job.ensure_daily_log_page = fake_ensure
+        daily_job.ingest_sources = fake_ingest_sources
+        try:
+            resume_journal = RunJournal(Path(tmp) / "resume.jsonl")
+            daily_job.run_ingest(config, "2026-01-23", "run-1", journal=resume_journal)
+            daily_job.run_ingest(config, "2026-01-23", "run-1", journal=resume_journal)
+        finally:
+            daily_job.ensure_daily_log_page, daily_job.ingest_sources = originals
+        assert calls == ["ensure", ("ingest", "page-1"), ("ingest", "page-1")]
+        assert resume_journal.get("ingest", "2026-01-23", "upsert").data["payload_hash"] == "same"
+
+        # Publish journals only recipients the SMTP server accepted; a rerun
+        # retries the failed one and a third run sends nothing.
+        summary = DailyLogSummary(
+            target_date="2026-01-23",
+            page_id="page-1",
+            title="Daily Log",
+            summary_text="text",
+            summary_html="",
+            mail_id="run-1",
+            source=None,
+            diary=None,
+            expenses_total=None,
+            location_summary=None,
+            mood=None,
+            weight=None,
+        )
+        sends = []
+        failing = {"b@example.com"}
+
+        def fake_send(mail_config, messages):
+            sends.append(sorted(address for mail_to, _ in messages for address in mail_to))
+            return [
+                address
+                for mail_to, _ in messages
+                for address in mail_to
+                if address not in failing
+            ]
+
+        publish_config = replace(
+            config, mail_to=["a@example.com", "b@example.com"], mail_from="me@example.com"
+        )
+        originals = (daily_job.read_daily_log, daily_job.send_prebuilt_mails)
+        daily_job.read_daily_log = lambda **kwargs: summary
+        daily_job.send_prebuilt_mails = fake_send
+        try:
+            daily_job.run_publish(publish_config, "2026-01-23", "run-1", journal=resume_journal)
+            failing.clear()
+            daily_job.run_publish(publish_config, "2026-01-23", "run-1", journal=resume_journal)
+            daily_job.run_publish(publish_config, "2026-01-23", "run-1", journal=resume_journal)
+        finally:
+            daily_job.read_daily_log, daily_job.send_prebuilt_mails = originals
+        assert sends == [["a@example.com", "b@example.com"], ["b@example.com"]]
+        assert resume_journal.get("publish", "2026-01-23", "mail_sent").data["recipients"] == [
+            "a@example.com",
+            "b@example.com",
+        ]
+
+    print("OK: run journal survives torn writes, compacts, and lets reruns skip done steps (undelivered mail is retried)")
+
+
+if __name__ == "__main__":
+    main()
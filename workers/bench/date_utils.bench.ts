@@ -0,0 +1,57 @@
+// node --experimental-strip-types bench/date_utils.bench.ts [count]
+import { getJstDateStringFromDateTime, getJstDateStringFromEpochMs } from "../src/date_utils.ts";
+
+const count = Number(process.argv[2] ?? 100_000);
+
+function referenceJstDate(epochMs: number): string {
+  // What getJstDateString did before: a fresh formatter per call.
+  return new Intl.DateTimeFormat("en-CA", {
+    timeZone: "Asia/Tokyo",
+    year: "numeric",
+    month: "2-digit",
+    day: "2-digit",
+  }).format(new Date(epochMs));
+}
+
+function timed<T, R>(label: string, fn: (value: T) => R, values: T[]): R[] {
+  const started = performance.now();
+  const results = values.map(fn);
+  const elapsed = performance.now() - started;
+  console.log(
+    `${label.padEnd(28)} ${elapsed.toFixed(1).padStart(8)} ms  (${((elapsed / values.length) * 1e6).toFixed(0).padStart(6)} ns/op)`,
+  );
+  return results;
+}
+
+function assertSame(actual: string[], expected: string[], label: string): void {
+  const index = actual.findIndex((value, i) => value !== expected[i]);
+  if (index !== -1) {
+    throw new Error(`${label}: index=${index} expected=${expected[index]} actual=${actual[index]}`);
+  }
+}
+
+// Deterministic LCG; 1940-2040 so the pre-1952 fallback is exercised too.
+let seed = 1;
+const random = () => ((seed = (seed * 1103515245 + 12345) % 2 ** 31) / 2 ** 31);
+const low = Date.UTC(1940, 0, 1);
+const high = Date.UTC(2040, 0, 1);
+const stamps = Array.from({ length: count }, () => Math.floor(low + random() * (high - low)));
+const isoValues = stamps.map((ms) => new Date(ms).toISOString());
+
+const cached = new Intl.DateTimeFormat("en-CA", {
+  timeZone: "Asia/Tokyo",
+  year: "numeric",
+  month: "2-digit",
+  day: "2-digit",
+});
+
+console.log(`timestamps=${count}`);
+const expected = timed("Intl per call", referenceJstDate, stamps);
+assertSame(timed("Intl cached", (ms: number) => cached.format(new Date(ms)), stamps), expected, "cached");
+assertSame(timed("fixed +09:00", getJstDateStringFromEpochMs, stamps), expected, "fast path");
+assertSame(
+  timed("ISO string (tasks/closed)", (value: string) => getJstDateStringFromDateTime(value) ?? "", isoValues),
+  expected,
+  "ISO",
+);
+console.log("OK: identical JST dates");
@@ -1,14 +1,17 @@
 import { getJstDateString, getJstRangeForTargetDate } from "./date_utils";
+import { getLogger, Logger, LoggerEnv } from "./logger";
+import { createPageWriteBatch, PageWriteBatch } from "./page_write_batch";
 import {
   getNotionErrorDetails,
   NotionApiError,
   notionFetch,
+  queryDatabase,
   queryDatabaseAll,
 } from "./notion_client";
 import { getTaskPropertyNames, TaskPropertyNameEnv } from "./task_property_names";
 import { TITLE_PROPERTIES } from "./title_properties";
 
-export type DailyLogTaskRelationEnv = {
+export type DailyLogTaskRelationEnv = LoggerEnv & {
   NOTION_TOKEN: string;
   TASK_DB_ID: string;
   DAILY_LOG_DB_ID: string;
@@ -28,6 +31,7 @@ export type DailyLogTaskRelationResult = {
   };
   daily_log_page_id: string;
   created: boolean;
+  updated: boolean;
   done_count: number;
   drop_count: number;
 };
@@ -35,13 +39,14 @@ export type DailyLogTaskRelationResult = {
 const DEFAULT_DONE_STATUS = "Done";
 const DEFAULT_DROP_STATUS = "Drop";
 
-function logNotionQueryPayload(context: string, filter: Record<string, any>) {
-  console.log(
-    `Notion query payload (${context}): ${JSON.stringify({
-      page_size: 100,
-      database_id: "***",
-      filter,
-    })}`,
+function logNotionQueryPayload(log: Logger, context: string, filter: Record<string, any>) {
+  log.debug(
+    () =>
+      `Notion query payload (${context}): ${JSON.stringify({
+        page_size: 100,
+        database_id: "***",
+        filter,
+      })}`,
   );
 }
 
@@ -80,11 +85,19 @@ type JstRange = {
   end_jst_iso: string;
 };
 
+// title / in-range are only needed for debug samples, so they are derived
+// from page lazily.
 type TaskRangeItem = {
   id: string;
-  title: string | null;
-  dateRaw: string | null;
-  inRange: boolean;
+  dateRaw: string;
+  page: Record<string, any>;
+};
+
+// Page IDs of the tasks closed on the target date, when the caller has
+// already queried them (e.g. ingest's fetchClosedTasks).
+export type ClosedTaskIds = {
+  done: string[];
+  drop: string[];
 };
 
 function isDateTimeInRange(dateTime: string, range: JstRange): boolean {
@@ -112,50 +125,116 @@ async function fetchTaskIdsByStatus(
       { property: dateProperty, date: { before: range.end_jst_iso } },
     ],
   };
-  logNotionQueryPayload(`tasks/${status}`, filter);
+  logNotionQueryPayload(getLogger(env), `tasks/${status}`, filter);
   const pages = await queryDatabaseAll(env, env.TASK_DB_ID, filter);
 
-  return pages
-    .map((page: Record<string, any>) => {
-      const dateRaw = page.properties?.[dateProperty]?.date?.start ?? null;
-      return {
-        id: page.id,
-        title: getTaskTitle(page),
-        dateRaw,
-        inRange: dateRaw ? isDateTimeInRange(dateRaw, range) : false,
-      };
-    })
-    .filter((item) => item.dateRaw);
+  const items: TaskRangeItem[] = [];
+  for (const page of pages) {
+    const dateRaw = page.properties?.[dateProperty]?.date?.start ?? null;
+    if (dateRaw) {
+      items.push({ id: page.id, dateRaw, page });
+    }
+  }
+  return items;
 }
 
-async function findOrCreateDailyLogPage(
+function formatTaskSample(item: TaskRangeItem, dateLabel: string, range: JstRange): string {
+  return `title="${getTaskTitle(item.page)}" ${dateLabel}=${item.dateRaw} in_range=${isDateTimeInRange(item.dateRaw, range)}`;
+}
+
+async function fetchClosedTaskIds(
   env: DailyLogTaskRelationEnv,
-  targetDate: string,
-): Promise<{ pageId: string; created: boolean }> {
-  const queryResponse = await notionFetch(
-    env,
-    `/databases/${env.DAILY_LOG_DB_ID}/query`,
-    {
-      method: "POST",
-      body: JSON.stringify({
-        page_size: 1,
-        filter: {
-          property: "Date",
-          date: { equals: targetDate },
-        },
-      }),
-    },
+  range: JstRange,
+): Promise<ClosedTaskIds> {
+  const { doneDatePropertyName, dropDatePropertyName } = getTaskPropertyNames(env);
+  const doneStatus = env.TASK_STATUS_DONE || DEFAULT_DONE_STATUS;
+  const dropStatus =
+    env.TASK_STATUS_DROPPED || env.TASK_STATUS_DROP_VALUE || DEFAULT_DROP_STATUS;
+  const [doneTasks, dropTasks] = await Promise.all([
+    fetchTaskIdsByStatus(env, doneStatus, doneDatePropertyName, range),
+    fetchTaskIdsByStatus(env, dropStatus, dropDatePropertyName, range),
+  ]);
+
+  const log = getLogger(env);
+  log.debug(() => `DailyLog relations: done=${doneTasks.length}, drop=${dropTasks.length}`);
+  log.items(
+    "DailyLog relations: done_sample",
+    doneTasks,
+    (item) => formatTaskSample(item, "done_date", range),
+    3,
   );
+  log.items(
+    "DailyLog relations: drop_sample",
+    dropTasks,
+    (item) => formatTaskSample(item, "drop_date", range),
+    3,
+  );
+  return {
+    done: doneTasks.map((item) => item.id),
+    drop: dropTasks.map((item) => item.id),
+  };
+}
+
+type DailyLogRelationPage = {
+  pageId: string;
+  created: boolean;
+  properties: Record<string, any>;
+};
+
+const RELATION_PROPERTY_NAMES = ["Done Tasks", "Drop Tasks"] as const;
+
+function normalizePageId(id: string): string {
+  return id.replace(/-/g, "").toLowerCase();
+}
+
+// Returns null when the current value cannot be trusted for a diff
+// (missing property or a relation truncated by Notion's page retrieve).
+function getRelationIds(property: Record<string, any> | undefined): string[] | null {
+  if (!property || !Array.isArray(property.relation) || property.has_more) {
+    return null;
+  }
+  return property.relation.map((item: { id: string }) => normalizePageId(item.id));
+}
+
+function hasSameIds(current: string[] | null, next: string[]): boolean {
+  if (!current || current.length !== next.length) {
+    return false;
+  }
+  const nextSet = new Set(next.map(normalizePageId));
+  return current.every((id) => nextSet.has(id));
+}
 
-  if (!queryResponse.ok) {
-    const details = await getNotionErrorDetails(queryResponse);
+async function retrieveDailyLogPage(
+  env: DailyLogTaskRelationEnv,
+  pageId: string,
+): Promise<DailyLogRelationPage> {
+  const response = await notionFetch(env, `/pages/${pageId}`);
+  if (!response.ok) {
+    const details = await getNotionErrorDetails(response);
     throw new NotionApiError(details);
   }
+  const page = await response.json();
+  return { pageId: page.id ?? pageId, created: false, properties: page.properties ?? {} };
+}
 
-  const queryData = await queryResponse.json();
+async function findOrCreateDailyLogPage(
+  env: DailyLogTaskRelationEnv,
+  targetDate: string,
+): Promise<DailyLogRelationPage> {
+  const queryData = await queryDatabase(env, env.DAILY_LOG_DB_ID, {
+    page_size: 1,
+    filter: {
+      property: "Date",
+      date: { equals: targetDate },
+    },
+  });
   const existingPage = (queryData.results ?? [])[0];
   if (existingPage) {
-    return { pageId: existingPage.id, created: false };
+    return {
+      pageId: existingPage.id,
+      created: false,
+      properties: existingPage.properties ?? {},
+    };
   }
 
   const title = `${targetDate} Daily Log`;
@@ -176,62 +255,61 @@ async function findOrCreateDailyLogPage(
   }
 
   const createdPage = await createResponse.json();
-  return { pageId: createdPage.id, created: true };
+  return {
+    pageId: createdPage.id,
+    created: true,
+    properties: createdPage.properties ?? {},
+  };
 }
 
 export async function updateDailyLogTaskRelations(
   env: DailyLogTaskRelationEnv,
   targetDate = getJstDateString(),
+  // With writeBatch the relation PATCH is queued for the caller to flush
+  // together with its own property changes to the same page.
+  // With closedTaskIds the Done/Drop task queries are skipped.
+  options: { pageId?: string; writeBatch?: PageWriteBatch; closedTaskIds?: ClosedTaskIds } = {},
 ): Promise<DailyLogTaskRelationResult> {
   const range = getJstRangeForTargetDate(targetDate);
-  const { doneDatePropertyName, dropDatePropertyName } = getTaskPropertyNames(env);
-  const doneStatus = env.TASK_STATUS_DONE || DEFAULT_DONE_STATUS;
-  const dropStatus =
-    env.TASK_STATUS_DROPPED || env.TASK_STATUS_DROP_VALUE || DEFAULT_DROP_STATUS;
 
-  console.log(
-    `DailyLog relations: target_date=${targetDate}(JST) start_jst_iso=${range.start_jst_iso} end_jst_iso=${range.end_jst_iso}`,
+  const log = getLogger(env);
+  log.debug(
+    () =>
+      `DailyLog relations: target_date=${targetDate}(JST) start_jst_iso=${range.start_jst_iso} end_jst_iso=${range.end_jst_iso}`,
   );
 
-  const [doneTasks, dropTasks] = await Promise.all([
-    fetchTaskIdsByStatus(env, doneStatus, doneDatePropertyName, range),
-    fetchTaskIdsByStatus(env, dropStatus, dropDatePropertyName, range),
+  // The page lookup does not depend on the task queries, so they run together.
+  // A caller that already resolved the page (ensure/upsert) skips the Date query.
+  const [closedTaskIds, page] = await Promise.all([
+    options.closedTaskIds ?? fetchClosedTaskIds(env, range),
+    options.pageId
+      ? retrieveDailyLogPage(env, options.pageId)
+      : findOrCreateDailyLogPage(env, targetDate),
   ]);
-  const doneTaskIds = doneTasks.map((item) => item.id);
-  const dropTaskIds = dropTasks.map((item) => item.id);
+  const doneTaskIds = closedTaskIds.done;
+  const dropTaskIds = closedTaskIds.drop;
 
-  console.log(
-    `DailyLog relations: done=${doneTaskIds.length}, drop=${dropTaskIds.length}`,
-  );
-  for (const item of doneTasks.slice(0, 3)) {
-    console.log(
-      `DailyLog relations: done_sample title="${item.title}" done_date=${item.dateRaw} in_range=${item.inRange}`,
-    );
-  }
-  for (const item of dropTasks.slice(0, 3)) {
-    console.log(
-      `DailyLog relations: drop_sample title="${item.title}" drop_date=${item.dateRaw} in_range=${item.inRange}`,
-    );
+  const { pageId, created, properties } = page;
+  const nextRelations: Record<string, string[]> = {
+    "Done Tasks": doneTaskIds,
+    "Drop Tasks": dropTaskIds,
+  };
+  const changedProperties: Record<string, any> = {};
+  for (const name of RELATION_PROPERTY_NAMES) {
+    if (!hasSameIds(getRelationIds(properties[name]), nextRelations[name])) {
+      changedProperties[name] = createRelationProperty(nextRelations[name]);
+    }
   }
 
-  const { pageId, created } = await findOrCreateDailyLogPage(env, targetDate);
-  const updateResponse = await notionFetch(env, `/pages/${pageId}`, {
-    method: "PATCH",
-    body: JSON.stringify({
-      properties: {
-        "Done Tasks": createRelationProperty(doneTaskIds),
-        "Drop Tasks": createRelationProperty(dropTaskIds),
-      },
-    }),
-  });
-
-  if (!updateResponse.ok) {
-    const details = await getNotionErrorDetails(updateResponse);
-    throw new NotionApiError(details);
+  const updated = Object.keys(changedProperties).length > 0;
+  const writeBatch = options.writeBatch ?? createPageWriteBatch(env);
+  writeBatch.update(pageId, changedProperties);
+  if (!options.writeBatch) {
+    await writeBatch.flush();
   }
 
-  console.log(
-    `DailyLog relations updated: page=${pageId} created=${created} done=${doneTaskIds.length} drop=${dropTaskIds.length}`,
+  log.info(
+    `DailyLog relations ${updated ? "updated" : "unchanged"}: page=${pageId} created=${created} done=${doneTaskIds.length} drop=${dropTaskIds.length} patched=${Object.keys(changedProperties).join(",") || "-"}`,
   );
 
   return {
@@ -242,6 +320,7 @@ export async function updateDailyLogTaskRelations(
     },
     daily_log_page_id: pageId,
     created,
+    updated,
     done_count: doneTaskIds.length,
     drop_count: dropTaskIds.length,
   };
@@ -0,0 +1,56 @@
+export type ClosedTaskSummaryItem = {
+  page_id: string;
+  title: string;
+  priority: string | null;
+};
+
+export function dedupeClosedTasks<T extends ClosedTaskSummaryItem>(items: T[]): T[] {
+  const seen = new Set<string>();
+  const deduped: T[] = [];
+  for (const item of items) {
+    const key = item.page_id || `${item.title}-${item.priority || "-"}`;
+    if (seen.has(key)) {
+      continue;
+    }
+    seen.add(key);
+    deduped.push(item);
+  }
+  return deduped;
+}
+
+export function formatClosedTaskItem(item: ClosedTaskSummaryItem): string {
+  return `${item.title} (Priority: ${item.priority || "-"})`;
+}
+
+function renderList(items: string[]): string {
+  if (!items.length) {
+    return "- None";
+  }
+  return items.map((item) => `- ${item}`).join("\n");
+}
+
+// Mirrors delivery/email_templates.py build_email_text so that Activity Summary
+// written by the composite ingest endpoint parses the same way in Phase B.
+export function buildDailySummaryText(params: {
+  dateStr: string;
+  runId: string;
+  done: ClosedTaskSummaryItem[];
+  drop: ClosedTaskSummaryItem[];
+}): string {
+  const doneItems = params.done.map(formatClosedTaskItem);
+  const dropItems = params.drop.map(formatClosedTaskItem);
+  const progressLine = `昨日の前進：Done ${doneItems.length}件 / Drop ${dropItems.length}件`;
+  const sections = [
+    `${params.dateStr} Daily Summary`,
+    `Run ID: ${params.runId}`,
+    "",
+    `🎉 昨日完了したこと（Done: ${doneItems.length}）`,
+    renderList(doneItems),
+    "",
+    `🧹 昨日手放したこと（Drop: ${dropItems.length}）`,
+    renderList(dropItems),
+    "",
+    progressLine,
+  ];
+  return `${sections.join("\n").trim()}\n`;
+}
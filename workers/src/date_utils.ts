@@ -1,11 +1,52 @@
+const DAY_MS = 24 * 60 * 60 * 1000;
+const JST_OFFSET_MS = 9 * 60 * 60 * 1000;
+// Japan has kept a fixed +09:00 offset (no DST) since 1951; earlier instants
+// go through the tz database.
+const JST_FIXED_OFFSET_SINCE_MS = Date.UTC(1952, 0, 1);
+
+let jstFormatter: Intl.DateTimeFormat | null = null;
+
+function getJstFormatter(): Intl.DateTimeFormat {
+  if (!jstFormatter) {
+    jstFormatter = new Intl.DateTimeFormat("en-CA", {
+      timeZone: "Asia/Tokyo",
+      year: "numeric",
+      month: "2-digit",
+      day: "2-digit",
+    });
+  }
+  return jstFormatter;
+}
+
+function pad2(value: number): string {
+  return value < 10 ? `0${value}` : `${value}`;
+}
+
+// Days since 1970-01-01 -> "YYYY-MM-DD" (proleptic Gregorian, integer-only).
+function formatCivilDate(days: number): string {
+  const z = days + 719468;
+  const era = Math.floor(z / 146097);
+  const doe = z - era * 146097;
+  const yoe = Math.floor(
+    (doe - Math.floor(doe / 1460) + Math.floor(doe / 36524) - Math.floor(doe / 146096)) / 365,
+  );
+  const doy = doe - (365 * yoe + Math.floor(yoe / 4) - Math.floor(yoe / 100));
+  const mp = Math.floor((5 * doy + 2) / 153);
+  const day = doy - Math.floor((153 * mp + 2) / 5) + 1;
+  const month = mp < 10 ? mp + 3 : mp - 9;
+  const year = yoe + era * 400 + (month <= 2 ? 1 : 0);
+  return `${year}-${pad2(month)}-${pad2(day)}`;
+}
+
+export function getJstDateStringFromEpochMs(epochMs: number): string {
+  if (!(epochMs >= JST_FIXED_OFFSET_SINCE_MS)) {
+    return getJstFormatter().format(new Date(epochMs));
+  }
+  return formatCivilDate(Math.floor((epochMs + JST_OFFSET_MS) / DAY_MS));
+}
+
 export function getJstDateString(date = new Date()): string {
-  const formatter = new Intl.DateTimeFormat("en-CA", {
-    timeZone: "Asia/Tokyo",
-    year: "numeric",
-    month: "2-digit",
-    day: "2-digit",
-  });
-  return formatter.format(date);
+  return getJstDateStringFromEpochMs(date.getTime());
 }
 
 export function formatJstDateTime(dateString: string, time = "00:00:00"): string {
@@ -20,16 +61,15 @@ export function getJstDateStringFromDateTime(dateTime: string): string | null {
   if (!dateTime) {
     return null;
   }
-  const date = new Date(dateTime);
-  if (Number.isNaN(date.getTime())) {
+  const epochMs = Date.parse(dateTime);
+  if (Number.isNaN(epochMs)) {
     return null;
   }
-  return getJstDateString(date);
+  return getJstDateStringFromEpochMs(epochMs);
 }
 
 export function getJstYesterdayString(): string {
-  const now = Date.now();
-  return getJstDateString(new Date(now - 24 * 60 * 60 * 1000));
+  return getJstDateStringFromEpochMs(Date.now() - DAY_MS);
 }
 
 export function isValidDateString(dateString: string): boolean {
@@ -37,9 +77,9 @@ export function isValidDateString(dateString: string): boolean {
 }
 
 export function addDaysToJstDate(dateString: string, days: number): string {
-  const date = new Date(`${dateString}T00:00:00+09:00`);
-  date.setTime(date.getTime() + days * 24 * 60 * 60 * 1000);
-  return getJstDateString(date);
+  return getJstDateStringFromEpochMs(
+    Date.parse(`${dateString}T00:00:00+09:00`) + days * DAY_MS,
+  );
 }
 
 export function getJstRangeForTargetDate(targetDate: string): {
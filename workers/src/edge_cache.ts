@@ -0,0 +1,152 @@
+import { getJstYesterdayString } from "./date_utils";
+import { getTaskPropertyNames, TaskPropertyNameEnv } from "./task_property_names";
+
+export type EdgeCacheEnv = TaskPropertyNameEnv & {
+  TASK_DB_ID: string;
+  DAILY_LOG_DB_ID: string;
+  TASK_STATUS_DO?: string;
+  TASK_STATUS_DONE?: string;
+  TASK_STATUS_DROPPED?: string;
+  TASK_STATUS_DROP_VALUE?: string;
+  TASK_STATUS_SOMEDAY?: string;
+};
+
+export type WaitUntilContext = {
+  waitUntil(promise: Promise<unknown>): void;
+};
+
+// Synthetic host: cache keys never leave the Worker, so they only need to be
+// stable URLs that do not collide with the public routes.
+const CACHE_KEY_ORIGIN = "https://edge-cache.notion-diary.internal";
+
+// Dates before JST yesterday are effectively immutable; yesterday and later can
+// still be edited (Phase A writes yesterday), so they only get a short TTL.
+export const PAST_DATE_TTL_SECONDS = 24 * 60 * 60;
+export const RECENT_DATE_TTL_SECONDS = 60;
+
+function getDefaultCache(): Cache | null {
+  const storage = (globalThis as { caches?: { default?: Cache } }).caches;
+  return storage?.default ?? null;
+}
+
+function fnv1a(value: string): string {
+  let hash = 0x811c9dc5;
+  for (let i = 0; i < value.length; i += 1) {
+    hash ^= value.charCodeAt(i);
+    hash = Math.imul(hash, 0x01000193);
+  }
+  return (hash >>> 0).toString(16).padStart(8, "0");
+}
+
+export function getConfigFingerprint(env: EdgeCacheEnv): string {
+  const { statusPropertyName, doneDatePropertyName, dropDatePropertyName } =
+    getTaskPropertyNames(env);
+  return fnv1a(
+    [
+      env.TASK_DB_ID,
+      env.DAILY_LOG_DB_ID,
+      env.TASK_STATUS_DO ?? "",
+      env.TASK_STATUS_DONE ?? "",
+      env.TASK_STATUS_DROPPED ?? "",
+      env.TASK_STATUS_DROP_VALUE ?? "",
+      env.TASK_STATUS_SOMEDAY ?? "",
+      statusPropertyName,
+      doneDatePropertyName,
+      dropDatePropertyName,
+    ].join("\u0000"),
+  );
+}
+
+export function getEdgeCacheTtlSeconds(targetDate: string): number {
+  return targetDate < getJstYesterdayString() ? PAST_DATE_TTL_SECONDS : RECENT_DATE_TTL_SECONDS;
+}
+
+// One entry per path, date and config: the cached body is always the full
+// (unprojected) JSON, and fields= projections are applied per request. Every
+// entry a write can affect therefore has a key purge can compute, with no
+// shared index to read and rewrite.
+export type EdgeCacheKey = {
+  request: Request;
+};
+
+// Turns the cached full body into the body for this request (e.g. fields=).
+export type EdgeCacheRender = (body: any) => unknown;
+
+export function buildEdgeCacheKey(
+  env: EdgeCacheEnv,
+  path: string,
+  targetDate: string,
+): EdgeCacheKey {
+  const params = new URLSearchParams({ date: targetDate, fp: getConfigFingerprint(env) });
+  return {
+    request: new Request(`${CACHE_KEY_ORIGIN}${path}?${params.toString()}`, { method: "GET" }),
+  };
+}
+
+function renderBody(body: unknown, render?: EdgeCacheRender): string {
+  return JSON.stringify(render ? render(body) : body);
+}
+
+export async function matchEdgeCache(
+  cacheKey: EdgeCacheKey,
+  render?: EdgeCacheRender,
+): Promise<Response | null> {
+  const cache = getDefaultCache();
+  if (!cache) {
+    return null;
+  }
+  const cached = await cache.match(cacheKey.request);
+  if (!cached) {
+    return null;
+  }
+  // The stored cache-control is for the Cache API only; clients get the same
+  // headers as on a MISS.
+  const headers = new Headers(cached.headers);
+  headers.delete("cache-control");
+  headers.delete("content-length");
+  headers.set("x-edge-cache", "HIT");
+  const body = render ? renderBody(await cached.json(), render) : cached.body;
+  return new Response(body, { status: cached.status, headers });
+}
+
+// body is the full JSON response; the client gets render(body).
+export function putEdgeCache(
+  ctx: WaitUntilContext,
+  cacheKey: EdgeCacheKey,
+  body: unknown,
+  headers: HeadersInit,
+  ttlSeconds: number,
+  render?: EdgeCacheRender,
+): Response {
+  const cache = getDefaultCache();
+  const response = new Response(renderBody(body, render), { headers });
+  if (!cache) {
+    return response;
+  }
+  const cacheHeaders = new Headers(headers);
+  cacheHeaders.set("cache-control", `public, max-age=${ttlSeconds}`);
+  ctx.waitUntil(
+    cache.put(cacheKey.request, new Response(JSON.stringify(body), { headers: cacheHeaders })),
+  );
+  response.headers.set("x-edge-cache", "MISS");
+  return response;
+}
+
+// Cache API purges only affect the local data center; the short TTL for
+// recent dates bounds staleness elsewhere.
+export async function purgeEdgeCache(
+  env: EdgeCacheEnv,
+  path: string,
+  targetDates: string[],
+): Promise<void> {
+  const cache = getDefaultCache();
+  if (!cache) {
+    return;
+  }
+  const uniqueDates = [...new Set(targetDates.filter(Boolean))];
+  await Promise.all(
+    uniqueDates.map((targetDate) =>
+      cache.delete(buildEdgeCacheKey(env, path, targetDate).request),
+    ),
+  );
+}
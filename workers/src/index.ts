@@ -4,15 +4,34 @@ import {
   getJstYesterdayString,
   getJstDateStringFromDateTime,
   isValidDateString,
-  formatJstDateTime,
+  getJstRangeForTargetDate,
 } from "./date_utils";
-import { updateDailyLogTaskRelations } from "./daily_log_task_relations";
+import {
+  ClosedTaskIds,
+  DailyLogTaskRelationResult,
+  updateDailyLogTaskRelations,
+} from "./daily_log_task_relations";
+import { buildDailySummaryText, dedupeClosedTasks } from "./daily_summary";
+import {
+  buildEdgeCacheKey,
+  getEdgeCacheTtlSeconds,
+  matchEdgeCache,
+  purgeEdgeCache,
+  putEdgeCache,
+  RECENT_DATE_TTL_SECONDS,
+  WaitUntilContext,
+} from "./edge_cache";
+import { createRequestLogger, formatCounters, getLogger, Logger } from "./logger";
 import {
   getNotionErrorDetails,
   NotionApiError,
+  NotionErrorDetails,
   notionFetch,
+  queryDatabase,
   queryDatabaseAll,
 } from "./notion_client";
+import { createPageWriteBatch } from "./page_write_batch";
+import { createRateLimitedScheduler, RateLimitedScheduler } from "./rate_limiter";
 import {
   getTaskPropertyNames,
   TaskPropertyNameEnv,
@@ -34,6 +53,8 @@ interface Env {
   TASK_STATUS_PROPERTY_NAME?: string;
   TASK_DONE_DATE_PROPERTY_NAME?: string;
   TASK_DROP_DATE_PROPERTY_NAME?: string;
+  LOG_LEVEL?: string;
+  logger?: Logger;
 }
 
 type NotionPropertyType =
@@ -54,6 +75,11 @@ type ExpectedProperty = {
 type SchemaCache = Record<string, boolean>;
 
 const schemaCache: SchemaCache = {};
+const schemaValidationsInFlight: Record<string, Promise<void>> = {};
+
+// Property name -> property ID per database, filled in by schema validation and
+// used to build filter_properties projections.
+const schemaPropertyIds: Record<string, Record<string, string>> = {};
 
 const DAILY_LOG_PROPERTIES: ExpectedProperty[] = [
   { name: TITLE_PROPERTIES.dailyLog, type: "title" },
@@ -204,9 +230,25 @@ function notionErrorResponseFromDetails(details: {
   );
 }
 
+// Request bodies may be gzip/deflate-compressed (Content-Encoding); see
+// ingest/http_client.py enable_request_compression.
+const DECODABLE_CONTENT_ENCODINGS = ["gzip", "deflate"];
+
 async function parseJsonBody(request: Request): Promise<Record<string, any> | null> {
+  const contentEncoding = (request.headers.get("content-encoding") ?? "").trim().toLowerCase();
   try {
-    const data = await request.json();
+    let data: unknown;
+    if (!contentEncoding || contentEncoding === "identity") {
+      data = await request.json();
+    } else if (DECODABLE_CONTENT_ENCODINGS.includes(contentEncoding) && request.body) {
+      const decoded = request.body.pipeThrough(
+        new DecompressionStream(contentEncoding as CompressionFormat),
+      );
+      data = await new Response(decoded).json();
+    } else {
+      console.error(`Unsupported request Content-Encoding: ${contentEncoding}`);
+      return null;
+    }
     if (data && typeof data === "object") {
       return data as Record<string, any>;
     }
@@ -227,7 +269,7 @@ function validateDailyLogPayload(payload: Record<string, any>): {
     source: string;
     pageId?: string;
     updateTaskRelations: boolean;
-    dataJson?: string;
+    dataJson?: string | Record<string, any>;
   };
   error?: Response;
 } {
@@ -277,10 +319,15 @@ function validateDailyLogPayload(payload: Record<string, any>): {
       ? true
       : Boolean(payload.update_task_relations);
 
-  const dataJson =
-    typeof payload.data_json === "string" ? payload.data_json : undefined;
-  if (payload.data_json !== undefined && typeof payload.data_json !== "string") {
-    return { error: badRequest("data_json must be a string") };
+  // A nested object avoids encoding the payload twice; a JSON string is
+  // still accepted from older clients.
+  const dataJson: string | Record<string, any> | undefined = payload.data_json;
+  if (
+    dataJson !== undefined &&
+    typeof dataJson !== "string" &&
+    (dataJson === null || typeof dataJson !== "object" || Array.isArray(dataJson))
+  ) {
+    return { error: badRequest("data_json must be an object or a JSON string") };
   }
 
   return {
@@ -358,7 +405,10 @@ function getSchemaCacheKey(
   return `${dbId}:${propertiesKey}:${optionsKey}`;
 }
 
-async function validateDatabaseSchema(
+// Handlers start validation without awaiting it and run their primary Notion
+// query alongside; the check gates the response or the first write instead.
+// Concurrent requests in the isolate share one retrieve-database call.
+function validateDatabaseSchema(
   env: Env,
   dbId: string,
   expectedProperties: ExpectedProperty[],
@@ -366,9 +416,51 @@ async function validateDatabaseSchema(
 ): Promise<void> {
   const cacheKey = getSchemaCacheKey(dbId, expectedProperties, selectOptionRequirements);
   if (schemaCache[cacheKey]) {
-    return;
+    return Promise.resolve();
+  }
+  let pending = schemaValidationsInFlight[cacheKey];
+  if (!pending) {
+    pending = checkDatabaseSchema(
+      env,
+      dbId,
+      expectedProperties,
+      selectOptionRequirements,
+      cacheKey,
+    ).finally(() => {
+      delete schemaValidationsInFlight[cacheKey];
+    });
+    schemaValidationsInFlight[cacheKey] = pending;
+    // A handler may return early (e.g. bad payload) without awaiting the check.
+    pending.catch(() => undefined);
   }
+  return pending;
+}
 
+// Waits for the work and every schema check. A schema failure wins over the
+// work's own error, since the work ran against an unvalidated schema.
+async function awaitWithSchemaChecks<T>(
+  work: Promise<T>,
+  ...schemaChecks: Promise<void>[]
+): Promise<T> {
+  const [workOutcome, ...checkOutcomes] = await Promise.allSettled([work, ...schemaChecks]);
+  for (const outcome of checkOutcomes) {
+    if (outcome.status === "rejected") {
+      throw outcome.reason;
+    }
+  }
+  if (workOutcome.status === "rejected") {
+    throw workOutcome.reason;
+  }
+  return workOutcome.value as T;
+}
+
+async function checkDatabaseSchema(
+  env: Env,
+  dbId: string,
+  expectedProperties: ExpectedProperty[],
+  selectOptionRequirements: Record<string, string[]>,
+  cacheKey: string,
+): Promise<void> {
   const response = await notionFetch(env, `/databases/${dbId}`);
   if (!response.ok) {
     const details = await getNotionErrorDetails(response);
@@ -376,6 +468,11 @@ async function validateDatabaseSchema(
   }
   const data = await response.json();
   const properties = data.properties ?? {};
+  schemaPropertyIds[dbId] = Object.fromEntries(
+    Object.entries(properties)
+      .filter(([, schema]) => typeof (schema as { id?: unknown })?.id === "string")
+      .map(([name, schema]) => [name, (schema as { id: string }).id]),
+  );
 
   const missing: string[] = [];
   const mismatched: string[] = [];
@@ -406,7 +503,7 @@ async function validateDatabaseSchema(
   });
 
   if (missing.length) {
-    console.warn(
+    getLogger(env).warn(
       `Database schema warning: 存在しないプロパティ名かも -> ${missing.join(", ")}`,
     );
   }
@@ -425,6 +522,45 @@ async function validateDatabaseSchema(
   schemaCache[cacheKey] = true;
 }
 
+// Until schema validation has loaded the property IDs (or if any name is not
+// in the schema), no projection is sent and Notion returns every property.
+function resolveFilterProperties(dbId: string, propertyNames: string[]): string[] {
+  const ids = schemaPropertyIds[dbId];
+  if (!ids) {
+    return [];
+  }
+  const resolved = [...new Set(propertyNames)].map((name) => ids[name]);
+  return resolved.every((id) => id !== undefined) ? resolved : [];
+}
+
+function parseFieldsParam(
+  url: URL,
+  allowedFields: string[],
+): { fields: string[] | null; error?: Response } {
+  const raw = url.searchParams.get("fields")?.trim();
+  if (!raw) {
+    return { fields: null };
+  }
+  const fields = [...new Set(raw.split(",").map((field) => field.trim()).filter(Boolean))];
+  const unknown = fields.filter((field) => !allowedFields.includes(field));
+  if (unknown.length) {
+    return { fields: null, error: badRequest(`unknown fields: ${unknown.join(", ")}`) };
+  }
+  return { fields: fields.sort() };
+}
+
+function pickFields<T extends Record<string, any>>(
+  item: T,
+  alwaysFields: string[],
+  fields: string[] | null,
+): Partial<T> {
+  if (!fields) {
+    return item;
+  }
+  const keep = new Set([...alwaysFields, ...fields]);
+  return Object.fromEntries(Object.entries(item).filter(([key]) => keep.has(key))) as Partial<T>;
+}
+
 function parseBooleanEnv(value?: string): boolean {
   if (!value) {
     return false;
@@ -452,8 +588,8 @@ function getTaskStatusOptionRequirements(env: Env): Record<string, string[]> {
   };
 }
 
-async function validateTasksDatabaseSchema(env: Env): Promise<void> {
-  await validateDatabaseSchema(
+function validateTasksDatabaseSchema(env: Env): Promise<void> {
+  return validateDatabaseSchema(
     env,
     env.TASK_DB_ID,
     buildTaskProperties(env),
@@ -539,9 +675,14 @@ function getPlainTextFromRichText(property: Record<string, any> | undefined): st
     .join("");
 }
 
+let authDisabledWarned = false;
+
 async function requireBearerToken(request: Request, env: Env): Promise<Response | null> {
   if (!env.WORKERS_BEARER_TOKEN) {
-    console.warn("WORKERS_BEARER_TOKEN is not set; auth is disabled");
+    if (!authDisabledWarned) {
+      authDisabledWarned = true;
+      getLogger(env).warn("WORKERS_BEARER_TOKEN is not set; auth is disabled");
+    }
     return null;
   }
   const authHeader = request.headers.get("authorization");
@@ -564,12 +705,15 @@ async function handleInbox(request: Request, env: Env): Promise<Response> {
     return authError;
   }
 
-  await validateDatabaseSchema(env, env.INBOX_DB_ID, INBOX_PROPERTIES);
+  const schemaCheck = validateDatabaseSchema(env, env.INBOX_DB_ID, INBOX_PROPERTIES);
 
-  const response = await notionFetch(env, `/databases/${env.INBOX_DB_ID}/query`, {
-    method: "POST",
-    body: JSON.stringify({ page_size: 50 }),
-  });
+  const response = await awaitWithSchemaChecks(
+    notionFetch(env, `/databases/${env.INBOX_DB_ID}/query`, {
+      method: "POST",
+      body: JSON.stringify({ page_size: 50 }),
+    }),
+    schemaCheck,
+  );
   if (!response.ok) {
     return notionErrorResponse(response, "handleInbox");
   }
@@ -594,21 +738,24 @@ async function handleTasks(request: Request, env: Env): Promise<Response> {
   }
 
   const { doStatus, somedayStatus } = getTaskStatusConfig(env);
-  await validateTasksDatabaseSchema(env);
+  const schemaCheck = validateTasksDatabaseSchema(env);
   const { statusPropertyName } = getTaskPropertyNames(env);
 
-  const response = await notionFetch(env, `/databases/${env.TASK_DB_ID}/query`, {
-    method: "POST",
-    body: JSON.stringify({
-      page_size: 100,
-      filter: {
-        or: [
-          { property: statusPropertyName, select: { equals: doStatus } },
-          { property: statusPropertyName, select: { equals: somedayStatus } },
-        ],
-      },
+  const response = await awaitWithSchemaChecks(
+    notionFetch(env, `/databases/${env.TASK_DB_ID}/query`, {
+      method: "POST",
+      body: JSON.stringify({
+        page_size: 100,
+        filter: {
+          or: [
+            { property: statusPropertyName, select: { equals: doStatus } },
+            { property: statusPropertyName, select: { equals: somedayStatus } },
+          ],
+        },
+      }),
     }),
-  });
+    schemaCheck,
+  );
 
   if (!response.ok) {
     return notionErrorResponse(response, "handleTasks");
@@ -638,38 +785,41 @@ async function handleTasks(request: Request, env: Env): Promise<Response> {
   });
 }
 
-async function handleTasksClosed(request: Request, env: Env): Promise<Response> {
-  if (request.method !== "GET") {
-    return methodNotAllowed();
-  }
-  const authError = await requireBearerToken(request, env);
-  if (authError) {
-    return authError;
-  }
+type ClosedTask = {
+  page_id: string;
+  title: string;
+  priority: string | null;
+  done_date?: string | null;
+  drop_date?: string | null;
+};
+
+const CLOSED_TASK_FIELDS = ["title", "priority", "done_date", "drop_date"];
+
+type ClosedTasksResult = {
+  targetDate: string;
+  startJst: string;
+  endJst: string;
+  done: ClosedTask[];
+  drop: ClosedTask[];
+};
 
-  await validateTasksDatabaseSchema(env);
+// Every caller (tasks/closed, ingest, upsert) sends identical query bodies and
+// filter_properties for a date, so concurrent requests share one Notion query.
+async function fetchClosedTasks(env: Env, targetDate: string): Promise<ClosedTasksResult> {
   const { doneStatus, droppedStatus } = getTaskStatusConfig(env);
   const { statusPropertyName, doneDatePropertyName, dropDatePropertyName } =
     getTaskPropertyNames(env);
 
-  const url = new URL(request.url);
-  const dateParam = url.searchParams.get("date");
-  let targetDate = dateParam?.trim();
-  if (!targetDate) {
-    targetDate = getJstYesterdayString();
-  } else if (!isValidDateString(targetDate)) {
-    return badRequest("invalid date format");
-  }
-
-  const startJst = formatJstDateTime(targetDate, "00:00:00");
-  const endJst = formatJstDateTime(targetDate, "23:59:59");
+  // Half-open [start, next day 00:00) range, the same filter the Daily_Log
+  // relation step uses.
+  const { start_jst_iso: startJst, end_jst_iso: endJst } = getJstRangeForTargetDate(targetDate);
 
   const doneFilter = {
     and: [
       { property: statusPropertyName, select: { equals: doneStatus } },
       { property: doneDatePropertyName, date: { is_not_empty: true } },
       { property: doneDatePropertyName, date: { on_or_after: startJst } },
-      { property: doneDatePropertyName, date: { on_or_before: endJst } },
+      { property: doneDatePropertyName, date: { before: endJst } },
     ],
   };
   const dropFilter = {
@@ -677,30 +827,38 @@ async function handleTasksClosed(request: Request, env: Env): Promise<Response>
       { property: statusPropertyName, select: { equals: droppedStatus } },
       { property: dropDatePropertyName, date: { is_not_empty: true } },
       { property: dropDatePropertyName, date: { on_or_after: startJst } },
-      { property: dropDatePropertyName, date: { on_or_before: endJst } },
+      { property: dropDatePropertyName, date: { before: endJst } },
     ],
   };
 
-  console.log(
-    `Tasks closed: target_date=${targetDate}(JST) range=${startJst}..${endJst}`,
+  const log = getLogger(env);
+  log.debug(() => `Tasks closed: target_date=${targetDate}(JST) range=${startJst}..${endJst}`);
+  log.debug(
+    () =>
+      `Notion query payload (tasks/closed/done): ${JSON.stringify({
+        page_size: 100,
+        database_id: "***",
+        filter: doneFilter,
+      })}`,
   );
-  console.log(
-    `Notion query payload (tasks/closed/done): ${JSON.stringify({
-      page_size: 100,
-      database_id: "***",
-      filter: doneFilter,
-    })}`,
-  );
-  console.log(
-    `Notion query payload (tasks/closed/drop): ${JSON.stringify({
-      page_size: 100,
-      database_id: "***",
-      filter: dropFilter,
-    })}`,
+  log.debug(
+    () =>
+      `Notion query payload (tasks/closed/drop): ${JSON.stringify({
+        page_size: 100,
+        database_id: "***",
+        filter: dropFilter,
+      })}`,
   );
 
-  const donePages = await queryDatabaseAll(env, env.TASK_DB_ID, doneFilter);
-  const dropPages = await queryDatabaseAll(env, env.TASK_DB_ID, dropFilter);
+  // Only the properties read below are transferred from Notion.
+  const filterProperties = resolveFilterProperties(env.TASK_DB_ID, [
+    TITLE_PROPERTIES.tasks,
+    "Priority",
+    doneDatePropertyName,
+    dropDatePropertyName,
+  ]);
+  const donePages = await queryDatabaseAll(env, env.TASK_DB_ID, doneFilter, filterProperties);
+  const dropPages = await queryDatabaseAll(env, env.TASK_DB_ID, dropFilter, filterProperties);
 
   const done = donePages
     .map((page: Record<string, any>) => {
@@ -738,27 +896,76 @@ async function handleTasksClosed(request: Request, env: Env): Promise<Response>
     .filter((item) => item.drop_date && item.drop_date_jst === targetDate)
     .map(({ drop_date_jst, ...item }) => item);
 
-  console.log(
-    `Tasks closed: target_date=${targetDate} done=${done.length} drop=${drop.length}`,
+  log.info(`Tasks closed: target_date=${targetDate} done=${done.length} drop=${drop.length}`);
+  // Every returned item was bucketed into targetDate above.
+  log.items(
+    "Tasks closed: item",
+    done,
+    (item) => `title="${item.title}" status=${doneStatus} done_date_jst=${targetDate}`,
   );
-  for (const item of done) {
-    const doneDateJst = item.done_date
-      ? getJstDateStringFromDateTime(item.done_date)
-      : null;
-    console.log(
-      `Tasks closed: item title="${item.title}" status=${doneStatus} done_date_jst=${doneDateJst}`,
-    );
+  log.items(
+    "Tasks closed: item",
+    drop,
+    (item) => `title="${item.title}" status=${droppedStatus} drop_date_jst=${targetDate}`,
+  );
+
+  return { targetDate, startJst, endJst, done, drop };
+}
+
+function getClosedTaskIds(done: ClosedTask[], drop: ClosedTask[]): ClosedTaskIds {
+  return {
+    done: done.map((item) => item.page_id),
+    drop: drop.map((item) => item.page_id),
+  };
+}
+
+async function handleTasksClosed(
+  request: Request,
+  env: Env,
+  ctx: WaitUntilContext,
+): Promise<Response> {
+  if (request.method !== "GET") {
+    return methodNotAllowed();
   }
-  for (const item of drop) {
-    const dropDateJst = item.drop_date
-      ? getJstDateStringFromDateTime(item.drop_date)
-      : null;
-    console.log(
-      `Tasks closed: item title="${item.title}" status=${droppedStatus} drop_date_jst=${dropDateJst}`,
-    );
+  const authError = await requireBearerToken(request, env);
+  if (authError) {
+    return authError;
+  }
+
+  const url = new URL(request.url);
+  const dateParam = url.searchParams.get("date");
+  let targetDate = dateParam?.trim();
+  if (!targetDate) {
+    targetDate = getJstYesterdayString();
+  } else if (!isValidDateString(targetDate)) {
+    return badRequest("invalid date format");
+  }
+  const { fields, error: fieldsError } = parseFieldsParam(url, CLOSED_TASK_FIELDS);
+  if (fieldsError) {
+    return fieldsError;
   }
 
   const debugEnabled = url.searchParams.get("debug") === "1";
+  const cacheKey = debugEnabled ? null : buildEdgeCacheKey(env, "/api/tasks/closed", targetDate);
+  const renderFields = fields
+    ? (body: Record<string, any>) => ({
+        ...body,
+        done: body.done.map((item: ClosedTask) => pickFields(item, ["page_id"], fields)),
+        drop: body.drop.map((item: ClosedTask) => pickFields(item, ["page_id"], fields)),
+      })
+    : undefined;
+  if (cacheKey) {
+    const cached = await matchEdgeCache(cacheKey, renderFields);
+    if (cached) {
+      return cached;
+    }
+  }
+
+  const { startJst, endJst, done, drop } = await awaitWithSchemaChecks(
+    fetchClosedTasks(env, targetDate),
+    validateTasksDatabaseSchema(env),
+  );
+
   const debug = debugEnabled
     ? {
         target_date: targetDate,
@@ -771,20 +978,30 @@ async function handleTasksClosed(request: Request, env: Env): Promise<Response>
       }
     : undefined;
 
-  return new Response(
-    JSON.stringify({
-      date: targetDate,
-      range: {
-        start_jst: startJst,
-        end_jst: endJst,
-      },
-      done,
-      drop,
-      done_count: done.length,
-      drop_count: drop.length,
-      ...(debug ? { debug } : {}),
-    }),
-    { headers: jsonHeaders },
+  const body = {
+    date: targetDate,
+    range: {
+      start_jst: startJst,
+      end_jst: endJst,
+    },
+    done,
+    drop,
+    done_count: done.length,
+    drop_count: drop.length,
+    ...(debug ? { debug } : {}),
+  };
+  if (!cacheKey) {
+    return new Response(JSON.stringify(renderFields ? renderFields(body) : body), {
+      headers: jsonHeaders,
+    });
+  }
+  return putEdgeCache(
+    ctx,
+    cacheKey,
+    body,
+    jsonHeaders,
+    getEdgeCacheTtlSeconds(targetDate),
+    renderFields,
   );
 }
 
@@ -797,7 +1014,7 @@ async function handleDailyLogUpsert(request: Request, env: Env): Promise<Respons
     return authError;
   }
 
-  await validateDatabaseSchema(env, env.DAILY_LOG_DB_ID, DAILY_LOG_PROPERTIES);
+  const schemaCheck = validateDatabaseSchema(env, env.DAILY_LOG_DB_ID, DAILY_LOG_PROPERTIES);
 
   const payload = await parseJsonBody(request);
   if (!payload) {
@@ -812,99 +1029,306 @@ async function handleDailyLogUpsert(request: Request, env: Env): Promise<Respons
     return badRequest("invalid payload");
   }
 
-  const {
-    targetDate,
-    title,
-    summaryText,
-    summaryHtml,
-    mailId,
-    source,
-    pageId,
-    updateTaskRelations,
-    dataJson,
-  } = data;
+  const { targetDate, pageId, updateTaskRelations, dataJson } = data;
+
+  // Every schema this request depends on is checked before its first write.
+  const schemaChecks = updateTaskRelations
+    ? [
+        schemaCheck,
+        validateTasksDatabaseSchema(env),
+        validateDatabaseSchema(env, env.DAILY_LOG_DB_ID, DAILY_LOG_RELATION_PROPERTIES),
+      ]
+    : [schemaCheck];
 
   let existingPage: Record<string, any> | null = null;
   if (!pageId) {
-    const queryResponse = await notionFetch(
-      env,
-      `/databases/${env.DAILY_LOG_DB_ID}/query`,
-      {
-        method: "POST",
-        body: JSON.stringify({
-          page_size: 1,
-          filter: {
-            property: "Target Date",
-            date: { equals: targetDate },
-          },
-        }),
-      },
+    existingPage = await awaitWithSchemaChecks(
+      findDailyLogPageByTargetDate(env, targetDate),
+      ...schemaChecks,
     );
+  }
 
-    if (!queryResponse.ok) {
-      return notionErrorResponse(queryResponse, "handleDailyLogUpsert.query");
-    }
+  const properties = buildDailyLogUpsertProperties(data);
 
-    const queryData = await queryResponse.json();
-    existingPage = (queryData.results ?? [])[0] ?? null;
-  }
+  await Promise.all(schemaChecks);
 
-  const properties: Record<string, any> = {
-    [TITLE_PROPERTIES.dailyLog]: createTitleProperty(title),
-    "Target Date": createDateProperty(targetDate),
-    Date: createDateProperty(targetDate),
-    "Activity Summary": createRichTextProperty(summaryText),
-    "Mail ID": createRichTextProperty(mailId),
-    Source: createSelectProperty(source),
+  const upsertError = (details: NotionErrorDetails): Response => {
+    const requestIdLog = details.requestId ? ` request_id=${details.requestId}` : "";
+    const codeLog = details.code ? ` code=${details.code}` : "";
+    const messageLog = details.notionMessage ?? details.message;
+    const log = getLogger(env);
+    log.error(
+      `Notion API error in handleDailyLogUpsert.upsert: status=${details.status}${requestIdLog}${codeLog} message=${messageLog}`,
+    );
+    log.error(`DailyLog upsert properties: ${Object.keys(properties).join(", ")}`);
+    return notionErrorResponseFromDetails(details);
   };
 
-  let resultResponse: Response;
-  if (pageId || existingPage) {
-    const resolvedPageId = pageId ?? existingPage?.id;
-    resultResponse = await notionFetch(env, `/pages/${resolvedPageId}`, {
-      method: "PATCH",
-      body: JSON.stringify({ properties }),
-    });
+  // An existing page gets its properties and (optionally) relation changes
+  // in one PATCH; a new page is created with the properties first.
+  const writeBatch = createPageWriteBatch(env);
+  let finalPageId: string = pageId ?? existingPage?.id;
+  if (finalPageId) {
+    writeBatch.update(finalPageId, properties);
   } else {
-    resultResponse = await notionFetch(env, "/pages", {
+    const createResponse = await notionFetch(env, "/pages", {
       method: "POST",
       body: JSON.stringify({
         parent: { database_id: env.DAILY_LOG_DB_ID },
         properties,
       }),
     });
+    if (!createResponse.ok) {
+      return upsertError(await getNotionErrorDetails(createResponse));
+    }
+    finalPageId = (await createResponse.json()).id;
   }
-
-  if (!resultResponse.ok) {
-    const details = await getNotionErrorDetails(resultResponse);
-    const requestIdLog = details.requestId ? ` request_id=${details.requestId}` : "";
-    const codeLog = details.code ? ` code=${details.code}` : "";
-    const messageLog = details.notionMessage ?? details.message;
-    console.error(
-      `Notion API error in handleDailyLogUpsert.upsert: status=${details.status}${requestIdLog}${codeLog} message=${messageLog}`,
-    );
-    console.error(
-      `DailyLog upsert properties: ${Object.keys(properties).join(", ")}`,
-    );
-    return notionErrorResponseFromDetails(details);
-  }
-
-  const resolvedPageId = pageId ?? (existingPage ? existingPage.id : undefined);
-  const finalPageId = resolvedPageId ?? (await resultResponse.json()).id;
   void dataJson;
 
   if (updateTaskRelations) {
-    await validateTasksDatabaseSchema(env);
-    await validateDatabaseSchema(env, env.DAILY_LOG_DB_ID, DAILY_LOG_RELATION_PROPERTIES);
-
-    await updateDailyLogTaskRelations(env, targetDate);
+    // Through fetchClosedTasks so the queries coalesce with /api/tasks/closed.
+    const closed = await fetchClosedTasks(env, targetDate);
+    await updateDailyLogTaskRelations(env, targetDate, {
+      pageId: finalPageId,
+      writeBatch,
+      closedTaskIds: getClosedTaskIds(
+        dedupeClosedTasks(closed.done),
+        dedupeClosedTasks(closed.drop),
+      ),
+    });
+  }
+  try {
+    await writeBatch.flush();
+  } catch (error) {
+    if (error instanceof NotionApiError) {
+      return upsertError(error);
+    }
+    throw error;
   }
 
+  await purgeEdgeCache(env, "/api/daily_log", [targetDate]);
+
   return new Response(JSON.stringify({ ok: true, page_id: finalPageId }), {
     headers: jsonHeaders,
   });
 }
 
+function buildDailyLogUpsertProperties(data: {
+  targetDate: string;
+  title: string;
+  summaryText: string;
+  mailId: string;
+  source: string;
+}): Record<string, any> {
+  return {
+    [TITLE_PROPERTIES.dailyLog]: createTitleProperty(data.title),
+    "Target Date": createDateProperty(data.targetDate),
+    Date: createDateProperty(data.targetDate),
+    "Activity Summary": createRichTextProperty(data.summaryText),
+    "Mail ID": createRichTextProperty(data.mailId),
+    Source: createSelectProperty(data.source),
+  };
+}
+
+// Leaves room under the Workers subrequest limit for the schema check and the
+// paginated range query.
+const MAX_BULK_UPSERT_ITEMS = 40;
+const BULK_UPSERT_MAX_ATTEMPTS = 3;
+
+type DailyLogUpsertData = NonNullable<ReturnType<typeof validateDailyLogPayload>["data"]>;
+
+type BulkUpsertItemResult = {
+  index: number;
+  target_date: string | null;
+  ok: boolean;
+  page_id?: string;
+  created?: boolean;
+  status?: number;
+  error?: string;
+  code?: string | null;
+  request_id?: string | null;
+};
+
+async function getBadRequestMessage(response: Response): Promise<string> {
+  const body = await response.json();
+  return typeof body?.error === "string" ? body.error : "invalid payload";
+}
+
+async function writeBulkDailyLogItem(
+  env: Env,
+  scheduler: RateLimitedScheduler,
+  index: number,
+  data: DailyLogUpsertData,
+  existingPageId: string | undefined,
+): Promise<BulkUpsertItemResult> {
+  const pageId = data.pageId ?? existingPageId;
+  const properties = buildDailyLogUpsertProperties(data);
+  const body = pageId
+    ? JSON.stringify({ properties })
+    : JSON.stringify({ parent: { database_id: env.DAILY_LOG_DB_ID }, properties });
+
+  for (let attempt = 1; ; attempt += 1) {
+    const response = await scheduler.schedule(() =>
+      notionFetch(env, pageId ? `/pages/${pageId}` : "/pages", {
+        method: pageId ? "PATCH" : "POST",
+        body,
+      }),
+    );
+    if (response.status === 429 && attempt < BULK_UPSERT_MAX_ATTEMPTS) {
+      const retryAfterSeconds = Number(response.headers.get("retry-after")) || 1;
+      await response.text();
+      scheduler.backoff(retryAfterSeconds * 1000);
+      continue;
+    }
+    if (!response.ok) {
+      const details = await getNotionErrorDetails(response);
+      const requestIdLog = details.requestId ? ` request_id=${details.requestId}` : "";
+      getLogger(env).error(
+        `Notion API error in handleDailyLogUpsertBulk.upsert: target_date=${data.targetDate} status=${details.status}${requestIdLog} message=${details.notionMessage ?? details.message}`,
+      );
+      return {
+        index,
+        target_date: data.targetDate,
+        ok: false,
+        status: details.status >= 400 ? details.status : 500,
+        error: "notion_error",
+        code: details.code ?? null,
+        request_id: details.requestId ?? null,
+      };
+    }
+    const finalPageId = pageId ?? (await response.json()).id;
+    return {
+      index,
+      target_date: data.targetDate,
+      ok: true,
+      page_id: finalPageId,
+      created: !pageId,
+    };
+  }
+}
+
+async function handleDailyLogUpsertBulk(request: Request, env: Env): Promise<Response> {
+  if (request.method !== "POST") {
+    return methodNotAllowed("use POST /execute/api/daily_log/upsert_bulk");
+  }
+  const authError = await requireBearerToken(request, env);
+  if (authError) {
+    return authError;
+  }
+
+  const schemaCheck = validateDatabaseSchema(env, env.DAILY_LOG_DB_ID, DAILY_LOG_PROPERTIES);
+
+  const payload = await parseJsonBody(request);
+  if (!payload) {
+    return badRequest("invalid json body");
+  }
+  const items = payload.items;
+  if (!Array.isArray(items) || !items.length) {
+    return badRequest("items must be a non-empty array");
+  }
+  if (items.length > MAX_BULK_UPSERT_ITEMS) {
+    return badRequest(`too many items (max ${MAX_BULK_UPSERT_ITEMS})`);
+  }
+
+  // Items are validated one by one; an invalid item fails on its own.
+  const results: BulkUpsertItemResult[] = [];
+  const accepted: { index: number; data: DailyLogUpsertData }[] = [];
+  const seenDates = new Set<string>();
+  for (const [index, item] of items.entries()) {
+    const rejectItem = (message: string, targetDate: string | null = null) => {
+      results[index] = { index, target_date: targetDate, ok: false, status: 400, error: message };
+    };
+    if (!item || typeof item !== "object" || Array.isArray(item)) {
+      rejectItem("item must be an object");
+      continue;
+    }
+    const { data, error } = validateDailyLogPayload(item);
+    if (error || !data) {
+      rejectItem(error ? await getBadRequestMessage(error) : "invalid payload");
+      continue;
+    }
+    // Relation updates cost several subrequests per day; use the single upsert.
+    if (item.update_task_relations === true) {
+      rejectItem("update_task_relations is not supported by bulk upsert", data.targetDate);
+      continue;
+    }
+    if (seenDates.has(data.targetDate)) {
+      rejectItem("duplicate target_date in items", data.targetDate);
+      continue;
+    }
+    seenDates.add(data.targetDate);
+    accepted.push({ index, data });
+  }
+
+  // One range query resolves the existing page for every date without a page_id.
+  const lookupDates = accepted
+    .filter(({ data }) => !data.pageId)
+    .map(({ data }) => data.targetDate)
+    .sort();
+  const existingPageIds = new Map<string, string>();
+  if (lookupDates.length) {
+    const pages = await awaitWithSchemaChecks(
+      queryDatabaseAll(
+        env,
+        env.DAILY_LOG_DB_ID,
+        {
+          and: [
+            { property: "Target Date", date: { on_or_after: lookupDates[0] } },
+            {
+              property: "Target Date",
+              date: { on_or_before: lookupDates[lookupDates.length - 1] },
+            },
+          ],
+        },
+        resolveFilterProperties(env.DAILY_LOG_DB_ID, ["Target Date"]),
+      ),
+      schemaCheck,
+    );
+    for (const page of pages) {
+      const targetDate = page.properties?.["Target Date"]?.date?.start?.slice(0, 10);
+      if (targetDate && !existingPageIds.has(targetDate)) {
+        existingPageIds.set(targetDate, page.id);
+      }
+    }
+  } else if (accepted.length) {
+    await schemaCheck;
+  }
+
+  const scheduler = createRateLimitedScheduler();
+  await Promise.all(
+    accepted.map(async ({ index, data }) => {
+      results[index] = await writeBulkDailyLogItem(
+        env,
+        scheduler,
+        index,
+        data,
+        existingPageIds.get(data.targetDate),
+      );
+    }),
+  );
+
+  const upsertedDates = results
+    .filter((item) => item.ok)
+    .map((item) => item.target_date as string);
+  await purgeEdgeCache(env, "/api/daily_log", upsertedDates);
+
+  const failed = results.length - upsertedDates.length;
+  getLogger(env).info(
+    `DailyLog bulk upsert: items=${results.length} upserted=${upsertedDates.length} failed=${failed}`,
+  );
+
+  return new Response(
+    JSON.stringify({
+      ok: failed === 0,
+      count: results.length,
+      upserted: upsertedDates.length,
+      failed,
+      results,
+    }),
+    { headers: jsonHeaders },
+  );
+}
+
 async function handleDailyLogEnsure(request: Request, env: Env): Promise<Response> {
   if (request.method !== "POST") {
     return methodNotAllowed("use POST /execute/api/daily_log/ensure");
@@ -914,7 +1338,7 @@ async function handleDailyLogEnsure(request: Request, env: Env): Promise<Respons
     return authError;
   }
 
-  await validateDatabaseSchema(env, env.DAILY_LOG_DB_ID, DAILY_LOG_PROPERTIES);
+  const schemaCheck = validateDatabaseSchema(env, env.DAILY_LOG_DB_ID, DAILY_LOG_PROPERTIES);
 
   const payload = await parseJsonBody(request);
   if (!payload) {
@@ -929,33 +1353,47 @@ async function handleDailyLogEnsure(request: Request, env: Env): Promise<Respons
     return badRequest("invalid payload");
   }
 
-  const { targetDate, title, source, mailId } = data;
+  const { pageId, created } = await ensureDailyLogPageForTargetDate(env, data, [schemaCheck]);
+  if (created) {
+    await purgeEdgeCache(env, "/api/daily_log", [data.targetDate]);
+  }
+  return new Response(JSON.stringify({ ok: true, page_id: pageId }), {
+    headers: jsonHeaders,
+  });
+}
 
-  const queryResponse = await notionFetch(
+async function findDailyLogPageByTargetDate(
+  env: Env,
+  targetDate: string,
+  filterProperties: string[] = [],
+): Promise<Record<string, any> | null> {
+  const queryData = await queryDatabase(
     env,
-    `/databases/${env.DAILY_LOG_DB_ID}/query`,
+    env.DAILY_LOG_DB_ID,
     {
-      method: "POST",
-      body: JSON.stringify({
-        page_size: 1,
-        filter: {
-          property: "Target Date",
-          date: { equals: targetDate },
-        },
-      }),
+      page_size: 1,
+      filter: {
+        property: "Target Date",
+        date: { equals: targetDate },
+      },
     },
+    filterProperties,
   );
+  return (queryData.results ?? [])[0] ?? null;
+}
 
-  if (!queryResponse.ok) {
-    return notionErrorResponse(queryResponse, "handleDailyLogEnsure.query");
-  }
-
-  const queryData = await queryResponse.json();
-  const existingPage = (queryData.results ?? [])[0];
+async function ensureDailyLogPageForTargetDate(
+  env: Env,
+  params: { targetDate: string; title: string; source: string; mailId: string },
+  schemaChecks: Promise<void>[] = [],
+): Promise<{ pageId: string; created: boolean }> {
+  const { targetDate, title, source, mailId } = params;
+  const existingPage = await awaitWithSchemaChecks(
+    findDailyLogPageByTargetDate(env, targetDate),
+    ...schemaChecks,
+  );
   if (existingPage) {
-    return new Response(JSON.stringify({ ok: true, page_id: existingPage.id }), {
-      headers: jsonHeaders,
-    });
+    return { pageId: existingPage.id, created: false };
   }
 
   const properties: Record<string, any> = {
@@ -977,16 +1415,137 @@ async function handleDailyLogEnsure(request: Request, env: Env): Promise<Respons
   });
 
   if (!resultResponse.ok) {
-    return notionErrorResponse(resultResponse, "handleDailyLogEnsure.create");
+    const details = await getNotionErrorDetails(resultResponse);
+    throw new NotionApiError(details);
   }
 
   const pageId = (await resultResponse.json()).id;
-  return new Response(JSON.stringify({ ok: true, page_id: pageId }), {
-    headers: jsonHeaders,
+  return { pageId, created: true };
+}
+
+async function handleDailyLogIngest(request: Request, env: Env): Promise<Response> {
+  if (request.method !== "POST") {
+    return methodNotAllowed("use POST /execute/api/daily_log/ingest");
+  }
+  const authError = await requireBearerToken(request, env);
+  if (authError) {
+    return authError;
+  }
+
+  const dailyLogSchemaCheck = validateDatabaseSchema(
+    env,
+    env.DAILY_LOG_DB_ID,
+    DAILY_LOG_PROPERTIES,
+  );
+  const tasksSchemaCheck = validateTasksDatabaseSchema(env);
+
+  const payload = await parseJsonBody(request);
+  if (!payload) {
+    return badRequest("invalid json body");
+  }
+
+  const { data, error } = validateDailyLogEnsurePayload(payload);
+  if (error) {
+    return error;
+  }
+  if (!data) {
+    return badRequest("invalid payload");
+  }
+  const updateTaskRelations =
+    payload.update_task_relations === undefined
+      ? true
+      : Boolean(payload.update_task_relations);
+
+  const { targetDate, title, source, mailId } = data;
+  const schemaChecks = updateTaskRelations
+    ? [
+        dailyLogSchemaCheck,
+        tasksSchemaCheck,
+        validateDatabaseSchema(env, env.DAILY_LOG_DB_ID, DAILY_LOG_RELATION_PROPERTIES),
+      ]
+    : [dailyLogSchemaCheck, tasksSchemaCheck];
+
+  // Ensure and the closed-tasks query are independent reads, so run them together.
+  // allSettled keeps the ensure guarantee (page exists) even if the tasks query fails.
+  // Ensure only creates the page once every schema check has passed.
+  const [ensureOutcome, closedOutcome] = await Promise.allSettled([
+    ensureDailyLogPageForTargetDate(env, data, schemaChecks),
+    awaitWithSchemaChecks(fetchClosedTasks(env, targetDate), tasksSchemaCheck),
+  ]);
+  if (ensureOutcome.status === "rejected") {
+    throw ensureOutcome.reason;
+  }
+  if (closedOutcome.status === "rejected") {
+    throw closedOutcome.reason;
+  }
+  const { pageId, created } = ensureOutcome.value;
+  const { startJst, endJst } = closedOutcome.value;
+  const done = dedupeClosedTasks(closedOutcome.value.done);
+  const drop = dedupeClosedTasks(closedOutcome.value.drop);
+
+  const summaryText = buildDailySummaryText({
+    dateStr: targetDate,
+    runId: mailId,
+    done,
+    drop,
   });
+
+  const properties: Record<string, any> = {
+    [TITLE_PROPERTIES.dailyLog]: createTitleProperty(title),
+    "Target Date": createDateProperty(targetDate),
+    Date: createDateProperty(targetDate),
+    "Activity Summary": createRichTextProperty(summaryText.trim()),
+    "Mail ID": createRichTextProperty(mailId),
+    Source: createSelectProperty(source),
+  };
+
+  // The summary properties and the relation changes go out as one PATCH.
+  const writeBatch = createPageWriteBatch(env);
+  writeBatch.update(pageId, properties);
+
+  let relations: DailyLogTaskRelationResult | null = null;
+  if (updateTaskRelations) {
+    // Reuse the closed tasks fetched above instead of querying them again.
+    relations = await updateDailyLogTaskRelations(env, targetDate, {
+      pageId,
+      writeBatch,
+      closedTaskIds: getClosedTaskIds(done, drop),
+    });
+  }
+  await writeBatch.flush();
+
+  await purgeEdgeCache(env, "/api/daily_log", [targetDate]);
+
+  getLogger(env).info(
+    `DailyLog ingest: target_date=${targetDate} page=${pageId} created=${created} done=${done.length} drop=${drop.length}`,
+  );
+
+  return new Response(
+    JSON.stringify({
+      ok: true,
+      page_id: pageId,
+      created,
+      date: targetDate,
+      range: {
+        start_jst: startJst,
+        end_jst: endJst,
+      },
+      done,
+      drop,
+      done_count: done.length,
+      drop_count: drop.length,
+      summary_text: summaryText,
+      relations,
+    }),
+    { headers: jsonHeaders },
+  );
 }
 
-async function handleDailyLogRead(request: Request, env: Env): Promise<Response> {
+async function handleDailyLogRead(
+  request: Request,
+  env: Env,
+  ctx: WaitUntilContext,
+): Promise<Response> {
   if (request.method !== "GET") {
     return methodNotAllowed();
   }
@@ -995,8 +1554,6 @@ async function handleDailyLogRead(request: Request, env: Env): Promise<Response>
     return authError;
   }
 
-  await validateDatabaseSchema(env, env.DAILY_LOG_DB_ID, DAILY_LOG_PROPERTIES);
-
   const url = new URL(request.url);
   const targetDate = url.searchParams.get("date")?.trim() ?? "";
   if (!targetDate) {
@@ -1005,34 +1562,83 @@ async function handleDailyLogRead(request: Request, env: Env): Promise<Response>
   if (!isValidDateString(targetDate)) {
     return badRequest("invalid date format");
   }
-
-  const queryResponse = await notionFetch(
-    env,
-    `/databases/${env.DAILY_LOG_DB_ID}/query`,
-    {
-      method: "POST",
-      body: JSON.stringify({
-        page_size: 1,
-        filter: {
-          property: "Target Date",
-          date: { equals: targetDate },
-        },
-      }),
-    },
+  const { fields, error: fieldsError } = parseFieldsParam(
+    url,
+    Object.keys(DAILY_LOG_READ_FIELDS),
   );
-
-  if (!queryResponse.ok) {
-    return notionErrorResponse(queryResponse, "handleDailyLogRead.query");
+  if (fieldsError) {
+    return fieldsError;
   }
 
-  const queryData = await queryResponse.json();
-  const page = (queryData.results ?? [])[0];
-  if (!page) {
-    return new Response(JSON.stringify({ found: false, target_date: targetDate }), {
-      headers: jsonHeaders,
-    });
+  const cacheKey =
+    url.searchParams.get("debug") === "1"
+      ? null
+      : buildEdgeCacheKey(env, "/api/daily_log", targetDate);
+  const renderFields = fields
+    ? (body: Record<string, any>) => pickFields(body, DAILY_LOG_ALWAYS_FIELDS, fields)
+    : undefined;
+  if (cacheKey) {
+    const cached = await matchEdgeCache(cacheKey, renderFields);
+    if (cached) {
+      return cached;
+    }
   }
 
+  // A cached entry serves every fields= projection, so it is read in full;
+  // only uncached (debug) reads narrow the Notion query to the fields asked for.
+  const queriedFields = cacheKey ? null : fields;
+  const page = await awaitWithSchemaChecks(
+    findDailyLogPageByTargetDate(
+      env,
+      targetDate,
+      getDailyLogFilterProperties(env.DAILY_LOG_DB_ID, queriedFields),
+    ),
+    validateDatabaseSchema(env, env.DAILY_LOG_DB_ID, DAILY_LOG_PROPERTIES),
+  );
+  const body = page
+    ? serializeDailyLogPage(page, targetDate, queriedFields)
+    : { found: false, target_date: targetDate };
+  if (!cacheKey) {
+    return new Response(JSON.stringify(body), { headers: jsonHeaders });
+  }
+  // A missing page may be created by a write in another data center, so
+  // not-found answers never get the long TTL.
+  const ttlSeconds = page ? getEdgeCacheTtlSeconds(targetDate) : RECENT_DATE_TTL_SECONDS;
+  return putEdgeCache(ctx, cacheKey, body, jsonHeaders, ttlSeconds, renderFields);
+}
+
+const DAILY_LOG_READ_FIELDS: Record<string, string> = {
+  title: TITLE_PROPERTIES.dailyLog,
+  summary_text: "Activity Summary",
+  summary_html: "Diary",
+  mail_id: "Mail ID",
+  source: "Source",
+  diary: "Diary",
+  expenses_total: "Expenses total",
+  location_summary: "Location summary",
+  mood: "Mood",
+  weight: "Weight",
+};
+
+const DAILY_LOG_ALWAYS_FIELDS = ["found", "target_date", "page_id", "last_edited_time"];
+
+function getDailyLogFilterProperties(
+  dbId: string,
+  fields: string[] | null,
+  extraPropertyNames: string[] = [],
+): string[] {
+  const selected = fields ?? Object.keys(DAILY_LOG_READ_FIELDS);
+  return resolveFilterProperties(dbId, [
+    ...selected.map((field) => DAILY_LOG_READ_FIELDS[field]),
+    ...extraPropertyNames,
+  ]);
+}
+
+function serializeDailyLogPage(
+  page: Record<string, any>,
+  targetDate: string,
+  fields: string[] | null = null,
+): Record<string, any> {
   const properties = page.properties ?? {};
   const summaryText = getPlainTextFromRichText(properties["Activity Summary"]);
   const summaryHtml = getPlainTextFromRichText(properties.Diary);
@@ -1048,22 +1654,93 @@ async function handleDailyLogRead(request: Request, env: Env): Promise<Response>
   const mailId = getPlainTextFromRichText(properties["Mail ID"]);
   const source = properties.Source?.select?.name ?? null;
 
+  const serialized = {
+    found: true,
+    target_date: targetDate,
+    page_id: page.id,
+    last_edited_time: page.last_edited_time ?? null,
+    title: getPageTitleFromProperty(page, TITLE_PROPERTIES.dailyLog),
+    summary_text: summaryText,
+    summary_html: summaryHtml,
+    mail_id: mailId,
+    source,
+    diary,
+    expenses_total: expensesTotal,
+    location_summary: locationSummary,
+    mood,
+    weight,
+  };
+  return pickFields(serialized, DAILY_LOG_ALWAYS_FIELDS, fields);
+}
+
+async function handleDailyLogRange(request: Request, env: Env): Promise<Response> {
+  if (request.method !== "GET") {
+    return methodNotAllowed();
+  }
+  const authError = await requireBearerToken(request, env);
+  if (authError) {
+    return authError;
+  }
+
+  const schemaCheck = validateDatabaseSchema(env, env.DAILY_LOG_DB_ID, DAILY_LOG_PROPERTIES);
+
+  const url = new URL(request.url);
+  const start = url.searchParams.get("start")?.trim() ?? "";
+  const end = url.searchParams.get("end")?.trim() ?? "";
+  if (!start || !end) {
+    return badRequest("missing start or end");
+  }
+  if (!isValidDateString(start) || !isValidDateString(end)) {
+    return badRequest("invalid date format");
+  }
+  if (start > end) {
+    return badRequest("start must be on or before end");
+  }
+  // Optional ISO timestamp: only pages edited at or after it are returned
+  // (incremental archive builds).
+  const editedSince = url.searchParams.get("edited_since")?.trim() ?? "";
+  if (editedSince && Number.isNaN(Date.parse(editedSince))) {
+    return badRequest("invalid edited_since");
+  }
+  const { fields, error: fieldsError } = parseFieldsParam(
+    url,
+    Object.keys(DAILY_LOG_READ_FIELDS),
+  );
+  if (fieldsError) {
+    return fieldsError;
+  }
+
+  const pages = await awaitWithSchemaChecks(
+    queryDatabaseAll(
+      env,
+      env.DAILY_LOG_DB_ID,
+      {
+        and: [
+          { property: "Target Date", date: { on_or_after: start } },
+          { property: "Target Date", date: { on_or_before: end } },
+          ...(editedSince
+            ? [{ timestamp: "last_edited_time", last_edited_time: { on_or_after: editedSince } }]
+            : []),
+        ],
+      },
+      getDailyLogFilterProperties(env.DAILY_LOG_DB_ID, fields, ["Target Date"]),
+    ),
+    schemaCheck,
+  );
+
+  // Keep the first page per Target Date, matching the single-date read.
+  const byDate = new Map<string, Record<string, any>>();
+  for (const page of pages) {
+    const targetDate = page.properties?.["Target Date"]?.date?.start?.slice(0, 10);
+    if (!targetDate || byDate.has(targetDate)) {
+      continue;
+    }
+    byDate.set(targetDate, serializeDailyLogPage(page, targetDate, fields));
+  }
+  const items = [...byDate.keys()].sort().map((date) => byDate.get(date));
+
   return new Response(
-    JSON.stringify({
-      found: true,
-      target_date: targetDate,
-      page_id: page.id,
-      title: getPageTitleFromProperty(page, TITLE_PROPERTIES.dailyLog),
-      summary_text: summaryText,
-      summary_html: summaryHtml,
-      mail_id: mailId,
-      source,
-      diary,
-      expenses_total: expensesTotal,
-      location_summary: locationSummary,
-      mood,
-      weight,
-    }),
+    JSON.stringify({ start, end, ...(editedSince ? { edited_since: editedSince } : {}), items }),
     { headers: jsonHeaders },
   );
 }
@@ -1096,13 +1773,15 @@ async function handleTaskPromoteExecute(request: Request, env: Env): Promise<Res
   }
 
   const { doStatus } = getTaskStatusConfig(env);
-  await validateTasksDatabaseSchema(env);
+  const schemaCheck = validateTasksDatabaseSchema(env);
 
   const formData = await request.formData();
   const pageId = formData.get("id");
   if (!pageId || typeof pageId !== "string") {
     return badRequest("missing id");
   }
+  // The PATCH below is the first and only Notion call, so it has to wait.
+  await schemaCheck;
 
   const jstDate = getJstDateString();
   const properties = {
@@ -1119,6 +1798,17 @@ async function handleTaskPromoteExecute(request: Request, env: Env): Promise<Res
     return notionErrorResponse(response, "handleTaskPromoteExecute");
   }
 
+  // Promoting moves the task out of Done/Drop, so the closed list for its
+  // close dates is now stale.
+  const page = await response.json();
+  const { doneDatePropertyName, dropDatePropertyName } = getTaskPropertyNames(env);
+  const closedDates = [doneDatePropertyName, dropDatePropertyName]
+    .map((name) => page.properties?.[name]?.date?.start)
+    .filter((value): value is string => typeof value === "string")
+    .map((value) => getJstDateStringFromDateTime(value))
+    .filter((value): value is string => Boolean(value));
+  await purgeEdgeCache(env, "/api/tasks/closed", closedDates);
+
   return createHtmlPage("Promoted", "<p>Task promoted to Do.</p>");
 }
 
@@ -1182,6 +1872,8 @@ async function handleDailyLogExecute(request: Request, env: Env): Promise<Respon
 
   const proxyHeaders = new Headers(request.headers);
   proxyHeaders.set("content-type", "application/json; charset=utf-8");
+  // The payload is re-encoded as plain JSON below.
+  proxyHeaders.delete("content-encoding");
 
   const proxyRequest = new Request(request.url, {
     method: "POST",
@@ -1192,86 +1884,144 @@ async function handleDailyLogExecute(request: Request, env: Env): Promise<Respon
   return handleDailyLogUpsert(proxyRequest, env);
 }
 
-export default {
-  async fetch(request: Request, env: Env): Promise<Response> {
-    const url = new URL(request.url);
-    const path = normalizePath(url.pathname);
+function acceptsGzip(request: Request): boolean {
+  return (request.headers.get("accept-encoding") ?? "")
+    .split(",")
+    .some((value) => {
+      const [coding, ...params] = value.trim().toLowerCase().split(";");
+      return coding.trim() === "gzip" && !params.some((param) => /^\s*q=0(\.0*)?\s*$/.test(param));
+    });
+}
 
-    try {
-      if (path === "/api/inbox") {
-        return await handleInbox(request, env);
-      }
-      if (path === "/api/tasks") {
-        return await handleTasks(request, env);
-      }
-      if (path === "/api/tasks/closed") {
-        return await handleTasksClosed(request, env);
-      }
-      if (path === "/api/daily_log") {
-        return await handleDailyLogRead(request, env);
-      }
-      if (path === "/api/daily_log/upsert") {
-        return new Response(
-          JSON.stringify({
-            error: "use /execute/api/daily_log/upsert for updates",
-          }),
-          { status: 405, headers: jsonHeaders },
-        );
-      }
-      if (path === "/confirm/daily_log/upsert" && request.method === "GET") {
-        return await handleDailyLogConfirm(request);
-      }
-      if (path === "/execute/api/daily_log/upsert") {
-        return await handleDailyLogExecute(request, env);
-      }
-      if (path === "/execute/api/daily_log/ensure") {
-        return await handleDailyLogEnsure(request, env);
-      }
-      if (path === "/confirm/tasks/promote" && request.method === "GET") {
-        return await handleTaskPromoteConfirm(request);
-      }
-      if (path === "/execute/tasks/promote") {
-        return await handleTaskPromoteExecute(request, env);
-      }
-      if (path === "/health") {
-        return healthCheck();
-      }
+// JSON responses are marked gzip when the client accepts it; with the default
+// encodeBody ("automatic") the Workers runtime compresses the body on the way
+// out. Runs after the edge cache, which keeps storing identity bodies.
+function withResponseCompression(request: Request, response: Response): Response {
+  const contentType = response.headers.get("content-type") ?? "";
+  if (
+    !response.body ||
+    response.headers.has("content-encoding") ||
+    !contentType.startsWith("application/json") ||
+    !acceptsGzip(request)
+  ) {
+    return response;
+  }
+  const headers = new Headers(response.headers);
+  headers.set("Content-Encoding", "gzip");
+  headers.append("Vary", "Accept-Encoding");
+  return new Response(response.body, {
+    status: response.status,
+    statusText: response.statusText,
+    headers,
+  });
+}
 
-      return notFound();
-    } catch (error) {
-      if (error instanceof NotionApiError) {
-        const bodySnippet =
-          error.body.length > 4000
-            ? `${error.body.slice(0, 4000)}...(truncated)`
-            : error.body;
-        const requestIdLog = error.requestId ? ` request_id=${error.requestId}` : "";
-        console.error(
-          `Notion API error: status=${error.status}${requestIdLog} ${error.message}`,
-        );
-        console.error(`Notion API response body: ${bodySnippet}`);
-        const status = error.status >= 400 ? error.status : 500;
-        return new Response(
-          JSON.stringify({
-            error: "notion_error",
-            status,
-            code: error.code ?? null,
-            message: error.notionMessage ?? null,
-            request_id: error.requestId ?? null,
-            body: error.body,
-          }),
-          { status, headers: jsonHeaders },
-        );
-      }
+async function routeRequest(
+  request: Request,
+  env: Env,
+  ctx: WaitUntilContext,
+  path: string,
+): Promise<Response> {
+  try {
+    if (path === "/api/inbox") {
+      return await handleInbox(request, env);
+    }
+    if (path === "/api/tasks") {
+      return await handleTasks(request, env);
+    }
+    if (path === "/api/tasks/closed") {
+      return await handleTasksClosed(request, env, ctx);
+    }
+    if (path === "/api/daily_log") {
+      return await handleDailyLogRead(request, env, ctx);
+    }
+    if (path === "/api/daily_log/range") {
+      return await handleDailyLogRange(request, env);
+    }
+    if (path === "/api/daily_log/upsert") {
+      return new Response(
+        JSON.stringify({
+          error: "use /execute/api/daily_log/upsert for updates",
+        }),
+        { status: 405, headers: jsonHeaders },
+      );
+    }
+    if (path === "/confirm/daily_log/upsert" && request.method === "GET") {
+      return await handleDailyLogConfirm(request);
+    }
+    if (path === "/execute/api/daily_log/upsert") {
+      return await handleDailyLogExecute(request, env);
+    }
+    if (path === "/execute/api/daily_log/upsert_bulk") {
+      return await handleDailyLogUpsertBulk(request, env);
+    }
+    if (path === "/execute/api/daily_log/ensure") {
+      return await handleDailyLogEnsure(request, env);
+    }
+    if (path === "/execute/api/daily_log/ingest") {
+      return await handleDailyLogIngest(request, env);
+    }
+    if (path === "/confirm/tasks/promote" && request.method === "GET") {
+      return await handleTaskPromoteConfirm(request);
+    }
+    if (path === "/execute/tasks/promote") {
+      return await handleTaskPromoteExecute(request, env);
+    }
+    if (path === "/health") {
+      return healthCheck();
+    }
 
-      console.error("Unhandled error.", error);
-      const message = error instanceof Error ? error.message : "Unknown error";
+    return notFound();
+  } catch (error) {
+    if (error instanceof NotionApiError) {
+      const bodySnippet =
+        error.body.length > 4000
+          ? `${error.body.slice(0, 4000)}...(truncated)`
+          : error.body;
+      const requestIdLog = error.requestId ? ` request_id=${error.requestId}` : "";
+      const log = getLogger(env);
+      log.error(`Notion API error: status=${error.status}${requestIdLog} ${error.message}`);
+      log.error(`Notion API response body: ${bodySnippet}`);
+      const status = error.status >= 400 ? error.status : 500;
       return new Response(
-        JSON.stringify({ error: "internal_error", message }),
-        {
-          status: 500,
-          headers: jsonHeaders,
-        },
+        JSON.stringify({
+          error: "notion_error",
+          status,
+          code: error.code ?? null,
+          message: error.notionMessage ?? null,
+          request_id: error.requestId ?? null,
+          body: error.body,
+        }),
+        { status, headers: jsonHeaders },
       );
     }
+
+    getLogger(env).error("Unhandled error.", error);
+    const message = error instanceof Error ? error.message : "Unknown error";
+    return new Response(
+      JSON.stringify({ error: "internal_error", message }),
+      {
+        status: 500,
+        headers: jsonHeaders,
+      },
+    );
+  }
+}
+
+export default {
+  async fetch(request: Request, baseEnv: Env, ctx: WaitUntilContext): Promise<Response> {
+    const url = new URL(request.url);
+    const path = normalizePath(url.pathname);
+    // One logger per request: its level follows LOG_LEVEL (or debug=1) and it
+    // counts Notion calls for the summary line instead of logging each one.
+    const log = createRequestLogger(baseEnv, url);
+    const env: Env = { ...baseEnv, logger: log };
+    const startedAt = Date.now();
+    const response = await routeRequest(request, env, ctx, path);
+    log.info(
+      () =>
+        `Request: ${request.method} ${path} status=${response.status} ms=${Date.now() - startedAt} ${formatCounters(log.counters())}`.trimEnd(),
+    );
+    return withResponseCompression(request, response);
   },
 };
@@ -0,0 +1,116 @@
+export type LogLevel = "debug" | "info" | "warn" | "error" | "silent";
+
+// A function message is only evaluated when its level is enabled, so callers
+// can defer JSON.stringify and string building off the hot path.
+export type LogMessage = string | (() => string);
+
+export type Logger = {
+  level: LogLevel;
+  enabled(level: LogLevel): boolean;
+  debug(message: LogMessage): void;
+  info(message: LogMessage): void;
+  warn(message: LogMessage, error?: unknown): void;
+  error(message: LogMessage, error?: unknown): void;
+  // Per-item logs: at debug level the first sampleSize items plus a count of
+  // the rest; otherwise nothing (callers log the totals at info).
+  items<T>(label: string, items: T[], format: (item: T) => string, sampleSize?: number): void;
+  count(name: string, amount?: number): void;
+  counters(): Record<string, number>;
+};
+
+export type LoggerEnv = {
+  LOG_LEVEL?: string;
+  logger?: Logger;
+};
+
+export const DEFAULT_LOG_LEVEL: LogLevel = "info";
+export const DEFAULT_LOG_SAMPLE_SIZE = 5;
+
+const LOG_LEVEL_RANK: Record<LogLevel, number> = {
+  debug: 10,
+  info: 20,
+  warn: 30,
+  error: 40,
+  silent: 100,
+};
+
+export function parseLogLevel(value: string | undefined | null): LogLevel {
+  const normalized = (value ?? "").trim().toLowerCase();
+  return normalized in LOG_LEVEL_RANK ? (normalized as LogLevel) : DEFAULT_LOG_LEVEL;
+}
+
+function resolveMessage(message: LogMessage): string {
+  return typeof message === "function" ? message() : message;
+}
+
+export function createLogger(level: LogLevel = DEFAULT_LOG_LEVEL): Logger {
+  const threshold = LOG_LEVEL_RANK[level];
+  const counts: Record<string, number> = {};
+  const enabled = (candidate: LogLevel) => LOG_LEVEL_RANK[candidate] >= threshold;
+  const logger: Logger = {
+    level,
+    enabled,
+    debug(message) {
+      if (enabled("debug")) {
+        console.log(resolveMessage(message));
+      }
+    },
+    info(message) {
+      if (enabled("info")) {
+        console.log(resolveMessage(message));
+      }
+    },
+    warn(message, error) {
+      if (enabled("warn")) {
+        console.warn(resolveMessage(message), ...(error === undefined ? [] : [error]));
+      }
+    },
+    error(message, error) {
+      if (enabled("error")) {
+        console.error(resolveMessage(message), ...(error === undefined ? [] : [error]));
+      }
+    },
+    items(label, items, format, sampleSize = DEFAULT_LOG_SAMPLE_SIZE) {
+      if (!enabled("debug")) {
+        return;
+      }
+      for (const item of items.slice(0, sampleSize)) {
+        console.log(`${label} ${format(item)}`);
+      }
+      if (items.length > sampleSize) {
+        console.log(`${label} ...${items.length - sampleSize} more`);
+      }
+    },
+    count(name, amount = 1) {
+      counts[name] = (counts[name] ?? 0) + amount;
+    },
+    counters() {
+      return { ...counts };
+    },
+  };
+  return logger;
+}
+
+const defaultLoggers: Partial<Record<LogLevel, Logger>> = {};
+
+// The request's logger when one was attached (see createRequestLogger),
+// otherwise a shared logger at LOG_LEVEL.
+export function getLogger(env: LoggerEnv): Logger {
+  if (env.logger) {
+    return env.logger;
+  }
+  const level = parseLogLevel(env.LOG_LEVEL);
+  return (defaultLoggers[level] ??= createLogger(level));
+}
+
+export function createRequestLogger(env: LoggerEnv, url: URL): Logger {
+  return createLogger(
+    url.searchParams.get("debug") === "1" ? "debug" : parseLogLevel(env.LOG_LEVEL),
+  );
+}
+
+export function formatCounters(counters: Record<string, number>): string {
+  return Object.entries(counters)
+    .map(([name, value]) => `${name}=${value}`)
+    .join(" ");
+}
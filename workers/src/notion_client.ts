@@ -1,4 +1,7 @@
-export type NotionEnv = {
+import { getLogger, LoggerEnv } from "./logger";
+import { createSingleFlight } from "./single_flight";
+
+export type NotionEnv = LoggerEnv & {
   NOTION_TOKEN: string;
 };
 
@@ -33,6 +36,21 @@ export class NotionApiError extends Error {
 
 const NOTION_BASE = "https://api.notion.com/v1";
 
+// Identical database queries (same database, projection, filter and cursor)
+// within one isolate share a single Notion call, and the result is reused for
+// a moment. Any write through notionFetch drops everything memoized.
+export const NOTION_QUERY_MEMO_TTL_MS = 2000;
+
+const databaseQueries = createSingleFlight<Record<string, any>>(NOTION_QUERY_MEMO_TTL_MS);
+
+export function clearNotionQueryMemo(): void {
+  databaseQueries.clear();
+}
+
+function isNotionReadRequest(method: string, path: string): boolean {
+  return method === "GET" || /^\/databases\/[^/]+\/query(\?|$)/.test(path) || path === "/search";
+}
+
 type ParsedNotionError = {
   code?: string;
   message?: string;
@@ -79,8 +97,14 @@ export async function notionFetch(
   const normalizedPath = normalizeNotionPath(path);
   const url = `${NOTION_BASE}${normalizedPath}`;
   const method = (options.method ?? "GET").toUpperCase();
-  console.log(`Notion request: ${method} ${url} path=${normalizedPath}`);
-  return fetch(url, {
+  const log = getLogger(env);
+  log.count("notion_requests");
+  log.debug(() => `Notion request: ${method} ${url} path=${normalizedPath}`);
+  const isRead = isNotionReadRequest(method, normalizedPath);
+  if (!isRead) {
+    databaseQueries.clear();
+  }
+  const response = await fetch(url, {
     ...options,
     headers: {
       Authorization: `Bearer ${env.NOTION_TOKEN}`,
@@ -89,6 +113,11 @@ export async function notionFetch(
       ...(options.headers || {}),
     },
   });
+  if (!isRead) {
+    // Queries started while the write was in flight may have missed it.
+    databaseQueries.clear();
+  }
+  return response;
 }
 
 function formatNotionErrorBody(status: number, rawText: string): string {
@@ -121,10 +150,41 @@ export async function getNotionErrorDetails(
   };
 }
 
+// Notion returns property IDs already URL-encoded, so they are appended as-is.
+export function buildDatabaseQueryPath(dbId: string, filterProperties: string[] = []): string {
+  const query = filterProperties.map((id) => `filter_properties=${id}`).join("&");
+  return query ? `/databases/${dbId}/query?${query}` : `/databases/${dbId}/query`;
+}
+
+// One page of a database query. The returned object may be shared with other
+// callers, so it must not be mutated.
+export async function queryDatabase(
+  env: NotionEnv,
+  dbId: string,
+  body: Record<string, any>,
+  filterProperties: string[] = [],
+): Promise<Record<string, any>> {
+  const path = buildDatabaseQueryPath(dbId, filterProperties);
+  const payload = JSON.stringify(body);
+  const { promise, shared } = databaseQueries.run(`${path} ${payload}`, async () => {
+    const response = await notionFetch(env, path, { method: "POST", body: payload });
+    if (!response.ok) {
+      const details = await getNotionErrorDetails(response);
+      throw new NotionApiError(details);
+    }
+    return response.json();
+  });
+  if (shared) {
+    getLogger(env).count("notion_queries_shared");
+  }
+  return promise;
+}
+
 export async function queryDatabaseAll(
   env: NotionEnv,
   dbId: string,
   filter: Record<string, any>,
+  filterProperties: string[] = [],
 ): Promise<Record<string, any>[]> {
   const results: Record<string, any>[] = [];
   let hasMore = true;
@@ -138,15 +198,7 @@ export async function queryDatabaseAll(
     if (startCursor) {
       body.start_cursor = startCursor;
     }
-    const response = await notionFetch(env, `/databases/${dbId}/query`, {
-      method: "POST",
-      body: JSON.stringify(body),
-    });
-    if (!response.ok) {
-      const details = await getNotionErrorDetails(response);
-      throw new NotionApiError(details);
-    }
-    const data = await response.json();
+    const data = await queryDatabase(env, dbId, body, filterProperties);
     results.push(...(data.results ?? []));
     hasMore = data.has_more ?? false;
     startCursor = data.next_cursor ?? undefined;
@@ -0,0 +1,79 @@
+import { getLogger } from "./logger";
+import { getNotionErrorDetails, NotionApiError, NotionEnv, notionFetch } from "./notion_client";
+
+// Collects the property changes a request makes to each page and sends one
+// PATCH per page on flush(). A later change to the same property replaces the
+// earlier one; properties are written in sorted order so the same changes
+// always produce the same payload.
+export type PageWriteBatch = {
+  update(pageId: string, properties: Record<string, any>): void;
+  // Returns the IDs of the pages written. Throws NotionApiError on the first
+  // failed PATCH; nothing stays queued either way.
+  flush(): Promise<string[]>;
+};
+
+type PendingPageWrite = {
+  pageId: string;
+  properties: Record<string, any>;
+  updates: number;
+};
+
+function normalizePageKey(pageId: string): string {
+  return pageId.replace(/-/g, "").toLowerCase();
+}
+
+export function mergePageProperties(
+  ...updates: Record<string, any>[]
+): Record<string, any> {
+  const merged: Record<string, any> = {};
+  for (const properties of updates) {
+    Object.assign(merged, properties);
+  }
+  const sorted: Record<string, any> = {};
+  for (const name of Object.keys(merged).sort()) {
+    sorted[name] = merged[name];
+  }
+  return sorted;
+}
+
+export function createPageWriteBatch(env: NotionEnv): PageWriteBatch {
+  const pending = new Map<string, PendingPageWrite>();
+
+  return {
+    update(pageId, properties) {
+      if (Object.keys(properties).length === 0) {
+        return;
+      }
+      const key = normalizePageKey(pageId);
+      const entry = pending.get(key);
+      if (entry) {
+        entry.properties = mergePageProperties(entry.properties, properties);
+        entry.updates += 1;
+      } else {
+        pending.set(key, { pageId, properties: mergePageProperties(properties), updates: 1 });
+      }
+    },
+    async flush() {
+      const entries = [...pending.values()];
+      pending.clear();
+      const log = getLogger(env);
+      const written: string[] = [];
+      for (const entry of entries) {
+        const response = await notionFetch(env, `/pages/${entry.pageId}`, {
+          method: "PATCH",
+          body: JSON.stringify({ properties: entry.properties }),
+        });
+        if (!response.ok) {
+          const details = await getNotionErrorDetails(response);
+          throw new NotionApiError(details);
+        }
+        await response.text();
+        if (entry.updates > 1) {
+          log.count("notion_writes_merged", entry.updates - 1);
+        }
+        written.push(entry.pageId);
+      }
+      return written;
+    },
+  };
+}
@@ -0,0 +1,87 @@
+// Notion allows an average of three requests per second per integration.
+export const NOTION_REQUESTS_PER_SECOND = 3;
+export const NOTION_MAX_CONCURRENT_REQUESTS = 3;
+
+export type RateLimiterOptions = {
+  requestsPerSecond?: number;
+  maxConcurrent?: number;
+};
+
+export type RateLimitedScheduler = {
+  schedule<T>(task: () => Promise<T>): Promise<T>;
+  // Stops starting new tasks for the given time (e.g. after a 429 Retry-After).
+  backoff(delayMs: number): void;
+};
+
+type QueuedTask = {
+  run: () => Promise<unknown>;
+  resolve: (value: any) => void;
+  reject: (reason: unknown) => void;
+};
+
+// Token bucket (burst = one second's worth of requests) plus a concurrency cap.
+// Tasks start in the order they were scheduled.
+export function createRateLimitedScheduler(
+  options: RateLimiterOptions = {},
+): RateLimitedScheduler {
+  const requestsPerSecond = options.requestsPerSecond ?? NOTION_REQUESTS_PER_SECOND;
+  const maxConcurrent = options.maxConcurrent ?? NOTION_MAX_CONCURRENT_REQUESTS;
+  const capacity = Math.max(1, requestsPerSecond);
+  const queue: QueuedTask[] = [];
+  let tokens = capacity;
+  let refilledAt = Date.now();
+  let pausedUntil = 0;
+  let active = 0;
+  let timer: ReturnType<typeof setTimeout> | null = null;
+
+  function refill(now: number): void {
+    tokens = Math.min(capacity, tokens + ((now - refilledAt) / 1000) * requestsPerSecond);
+    refilledAt = now;
+  }
+
+  function wake(delayMs: number): void {
+    if (timer === null) {
+      timer = setTimeout(() => {
+        timer = null;
+        pump();
+      }, Math.max(1, Math.ceil(delayMs)));
+    }
+  }
+
+  function pump(): void {
+    while (queue.length && active < maxConcurrent) {
+      const now = Date.now();
+      if (now < pausedUntil) {
+        wake(pausedUntil - now);
+        return;
+      }
+      refill(now);
+      if (tokens < 1) {
+        wake(((1 - tokens) / requestsPerSecond) * 1000);
+        return;
+      }
+      tokens -= 1;
+      active += 1;
+      const task = queue.shift() as QueuedTask;
+      task
+        .run()
+        .then(task.resolve, task.reject)
+        .finally(() => {
+          active -= 1;
+          pump();
+        });
+    }
+  }
+
+  return {
+    schedule<T>(task: () => Promise<T>): Promise<T> {
+      return new Promise<T>((resolve, reject) => {
+        queue.push({ run: task, resolve, reject });
+        pump();
+      });
+    },
+    backoff(delayMs: number): void {
+      pausedUntil = Math.max(pausedUntil, Date.now() + delayMs);
+    },
+  };
+}
@@ -0,0 +1,69 @@
+// Concurrent calls with the same key share one in-flight promise; a settled
+// value is then reused for ttlMs. Rejections are never memoized.
+export type SingleFlight<T> = {
+  run(key: string, task: () => Promise<T>): { promise: Promise<T>; shared: boolean };
+  // Forget every entry. Calls already in flight still settle for their
+  // callers, but later calls start a fresh task.
+  clear(): void;
+};
+
+type FlightEntry<T> = {
+  promise: Promise<T>;
+  // Date.now() after which the entry is stale; Infinity while in flight.
+  expiresAt: number;
+};
+
+export const SINGLE_FLIGHT_MAX_ENTRIES = 256;
+
+export function createSingleFlight<T>(
+  ttlMs: number,
+  maxEntries = SINGLE_FLIGHT_MAX_ENTRIES,
+): SingleFlight<T> {
+  const entries = new Map<string, FlightEntry<T>>();
+
+  function prune(now: number): void {
+    for (const [key, entry] of entries) {
+      if (entry.expiresAt <= now) {
+        entries.delete(key);
+      }
+    }
+    // Map iteration is insertion order, so this drops the oldest entries.
+    for (const key of entries.keys()) {
+      if (entries.size < maxEntries) {
+        break;
+      }
+      entries.delete(key);
+    }
+  }
+
+  return {
+    run(key, task) {
+      const now = Date.now();
+      const existing = entries.get(key);
+      if (existing && existing.expiresAt > now) {
+        return { promise: existing.promise, shared: true };
+      }
+      if (entries.size >= maxEntries) {
+        prune(now);
+      }
+      const entry: FlightEntry<T> = { promise: task(), expiresAt: Infinity };
+      entries.set(key, entry);
+      entry.promise.then(
+        () => {
+          if (entries.get(key) === entry) {
+            entry.expiresAt = Date.now() + ttlMs;
+          }
+        },
+        () => {
+          if (entries.get(key) === entry) {
+            entries.delete(key);
+          }
+        },
+      );
+      return { promise: entry.promise, shared: false };
+    },
+    clear() {
+      entries.clear();
+    },
+  };
+}